@@ -0,0 +1,354 @@
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+
+from file_collector import load_ignore_rules, is_ignored
+
+# Everything the build produces lives under here (ignored by git)
+BUILD_DIR = ".build"
+# The built hosting directory and the firebase.json that points at it
+BUILD_PUBLIC = os.path.join(BUILD_DIR, "hosting")
+BUILD_CONFIG = os.path.join(BUILD_DIR, "firebase.json")
+BUILD_MANIFEST = os.path.join(BUILD_DIR, "asset-manifest.json")
+# Minified outputs, keyed by a hash of the input bytes and MINIFIER_VERSION
+CACHE_DIR = os.path.join(BUILD_DIR, "cache")
+# Bump when a minifier changes, so cached outputs are rebuilt
+MINIFIER_VERSION = "2"
+
+# Assets referenced from HTML with these suffixes get a content hash in their name
+FINGERPRINT_SUFFIXES = ('.js', '.css')
+HASH_LENGTH = 10
+
+# Cache-Control headers added to the built firebase.json (before any existing ones)
+CACHE_HEADERS = [
+    {
+        "regex": r"^/.+\.[0-9a-f]{%d}\.(js|css)$" % HASH_LENGTH,
+        "headers": [{"key": "Cache-Control", "value": "public, max-age=31536000, immutable"}],
+    },
+    {
+        "source": "**/*.html",
+        "headers": [{"key": "Cache-Control", "value": "no-cache"}],
+    },
+    {
+        "source": "**/*.json",
+        "headers": [{"key": "Cache-Control", "value": "public, max-age=300"}],
+    },
+]
+
+
+# ------------------------- minifiers -------------------------
+
+_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+# Keywords after which a "/" starts a regex literal, not a division
+_REGEX_KEYWORDS = {"return", "typeof", "case", "in", "of", "delete", "void", "throw", "new",
+                   "else", "do", "instanceof", "yield", "await"}
+
+
+def _skip_quoted(src, i):
+    """Index just past the string / template literal starting at src[i]"""
+    quote = src[i]
+    i += 1
+    while i < len(src):
+        c = src[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == quote or (c == "\n" and quote != "`"):
+            return i + 1
+        i += 1
+    return i
+
+
+def _skip_regex(src, i):
+    """Index just past the regex literal (and its flags) starting at src[i]"""
+    i += 1
+    in_class = False
+    while i < len(src):
+        c = src[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "\n":
+            return i
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            i += 1
+            while i < len(src) and (src[i].isalnum() or src[i] == "_"):
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+def minify_js(src):
+    """
+    Conservative JS minifier: drops comments, indentation and blank lines.
+
+    Line breaks are kept, so automatic semicolon insertion still behaves the same;
+    strings, template literals and regex literals are copied untouched.
+    """
+    out = []
+    prev = ""  # last significant character written
+    word = ""  # identifier / keyword that ends at prev, if any
+    in_word = False  # the next identifier character continues word
+    i, n = 0, len(src)
+    while i < n:
+        c = src[i]
+        if c in "'\"`":
+            j = _skip_quoted(src, i)
+            out.append(src[i:j])
+            prev, word, i = c, "", j
+            continue
+        if c == "/" and i + 1 < n:
+            nxt = src[i + 1]
+            if nxt == "/":
+                j = src.find("\n", i)
+                i = n if j < 0 else j
+                continue
+            if nxt == "*":
+                j = src.find("*/", i + 2)
+                i = n if j < 0 else j + 2
+                if out and not out[-1].isspace():
+                    out.append(" ")
+                continue
+            if not prev or prev in _REGEX_PRECEDERS or word in _REGEX_KEYWORDS:
+                j = _skip_regex(src, i)
+                out.append(src[i:j])
+                prev, word, i = "/", "", j
+                continue
+        if c.isspace():
+            j = i
+            while j < n and src[j].isspace():
+                j += 1
+            if prev:
+                out.append("\n" if "\n" in src[i:j] else " ")
+            in_word = False
+            i = j
+            continue
+        out.append(c)
+        if c.isalnum() or c in "_$":
+            word = word + c if in_word else c
+            in_word = True
+        else:
+            word, in_word = "", False
+        prev = c
+        i += 1
+    return "".join(out).strip() + "\n"
+
+
+_CSS_TOKEN_RE = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/""", re.S)
+
+
+def minify_css(src):
+    """Drops comments and collapses whitespace outside strings"""
+    parts = []
+    last = 0
+    for m in _CSS_TOKEN_RE.finditer(src):
+        parts.append(_collapse_css(src[last:m.start()]))
+        parts.append(m.group(1) or "")
+        last = m.end()
+    parts.append(_collapse_css(src[last:]))
+    return "".join(parts).strip() + "\n"
+
+
+def _collapse_css(chunk):
+    chunk = re.sub(r"\s+", " ", chunk)
+    # no space before ':' - "a :hover" and "a:hover" are different selectors
+    chunk = re.sub(r"\s*([{};,>])\s*", r"\1", chunk)
+    chunk = re.sub(r":\s+", ":", chunk)
+    return chunk.replace(";}", "}")
+
+
+def minify_json(src):
+    return json.dumps(json.loads(src), ensure_ascii=False, separators=(',', ':'))
+
+
+MINIFIERS = {'.js': minify_js, '.css': minify_css, '.json': minify_json}
+
+
+def _minified(data, suffix, stats, cache_dir=CACHE_DIR):
+    """Minified bytes for data, served from cache_dir when the same input was built before"""
+    minifier = MINIFIERS.get(suffix)
+    if minifier is None:
+        return data
+    key = hashlib.sha256(MINIFIER_VERSION.encode() + suffix.encode() + b"\0" + data).hexdigest()
+    cache_path = os.path.join(cache_dir, key[:2], key)
+    try:
+        with open(cache_path, 'rb') as f:
+            stats["cached"] += 1
+            return f.read()
+    except OSError:
+        pass
+    try:
+        out = minifier(data.decode('utf-8')).encode('utf-8')
+    except ValueError as e:
+        # Invalid JSON / undecodable file: ship it as authored
+        print(f"Warning: not minifying ({e})")
+        out = data
+    if len(out) > len(data):
+        out = data
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, 'wb') as f:
+        f.write(out)
+    stats["minified"] += 1
+    return out
+
+
+# ------------------------- build -------------------------
+
+_REF_RE = re.compile(r"""(\b(?:src|href)\s*=\s*)(["'])([^"']+)\2""", re.I)
+
+
+def load_hosting_config(project_dir="."):
+    """Returns (firebase.json dict, hosting section); multi-site configs use the first site"""
+    with open(os.path.join(project_dir, "firebase.json"), 'r', encoding='utf-8') as f:
+        cfg = json.load(f)
+    hosting = cfg.get("hosting") or {}
+    if isinstance(hosting, list):
+        hosting = hosting[0] if hosting else {}
+    return cfg, hosting
+
+
+def _local_ref(ref, html_rel):
+    """Resolves an HTML src/href to a path relative to the public dir (None for URLs)"""
+    if re.match(r"^(?:[a-z][a-z0-9+.-]*:|//|#|data:)", ref, re.I):
+        return None
+    path = ref.split("#", 1)[0].split("?", 1)[0]
+    if not path:
+        return None
+    if path.startswith("/"):
+        return os.path.normpath(path.lstrip("/")).replace(os.sep, "/")
+    return os.path.normpath(os.path.join(os.path.dirname(html_rel), path)).replace(os.sep, "/")
+
+
+def _fingerprinted(rel, data):
+    stem, suffix = os.path.splitext(rel)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{suffix}"
+
+
+def build_assets(project_dir=".", minify=True):
+    """
+    Builds the hosting public dir into BUILD_PUBLIC for deploy.
+
+    JS/CSS/JSON are minified (outputs cached by input hash in CACHE_DIR), JS/CSS
+    referenced from HTML pages are renamed with a content hash and the pages are
+    rewritten to match, and BUILD_CONFIG is written: a hosting-only copy of
+    firebase.json pointing at the built dir, with long-lived Cache-Control
+    headers for the fingerprinted assets.
+
+    Args:
+        project_dir (str): Directory containing firebase.json
+        minify (bool): False to only fingerprint
+
+    Returns:
+        dict: build stats (files, minified, cached, fingerprinted, bytes in/out, seconds)
+    """
+    start = time.perf_counter()
+    cfg, hosting = load_hosting_config(project_dir)
+    public_dir = os.path.join(project_dir, hosting.get("public", "public"))
+    out_dir = os.path.join(project_dir, BUILD_PUBLIC)
+    stats = {"files": 0, "minified": 0, "cached": 0, "fingerprinted": 0, "bytes_in": 0, "bytes_out": 0}
+
+    # Hosting ignore rules only - .gitignore has nothing to say about what gets deployed
+    ignore_rules = [rule for rule in load_ignore_rules(project_dir, include_gitignore=False)
+                    if os.path.normpath(rule[0]) == os.path.normpath(os.path.abspath(public_dir))]
+
+    # 1. read + minify everything
+    outputs = {}
+    public_abs = os.path.abspath(public_dir)
+    for dir_path, dir_names, file_names in os.walk(public_abs):
+        dir_names[:] = sorted(d for d in dir_names
+                              if not is_ignored(os.path.join(dir_path, d), True, ignore_rules))
+        for name in sorted(file_names):
+            abs_path = os.path.join(dir_path, name)
+            if is_ignored(abs_path, False, ignore_rules):
+                continue
+            rel = os.path.relpath(abs_path, public_abs).replace(os.sep, "/")
+            with open(abs_path, 'rb') as f:
+                data = f.read()
+            stats["bytes_in"] += len(data)
+            suffix = os.path.splitext(name)[1].lower()
+            outputs[rel] = _minified(data, suffix, stats, os.path.join(project_dir, CACHE_DIR)) if minify else data
+
+    # 2. fingerprint assets referenced from HTML, then rewrite the pages
+    html_pages = [rel for rel in outputs if rel.lower().endswith((".html", ".htm"))]
+    renames = {}
+    for page in html_pages:
+        for m in _REF_RE.finditer(outputs[page].decode('utf-8', 'replace')):
+            target = _local_ref(m.group(3), page)
+            if target in outputs and target.lower().endswith(FINGERPRINT_SUFFIXES):
+                renames[target] = _fingerprinted(target, outputs[target])
+    stats["fingerprinted"] = len(renames)
+
+    for page in html_pages:
+        def rewrite(m, page=page):
+            target = _local_ref(m.group(3), page)
+            if target not in renames:
+                return m.group(0)
+            ref = m.group(3)
+            old_name = target.rsplit("/", 1)[-1]
+            new_name = renames[target].rsplit("/", 1)[-1]
+            return m.group(1) + m.group(2) + ref.replace(old_name, new_name, 1) + m.group(2)
+        outputs[page] = _REF_RE.sub(rewrite, outputs[page].decode('utf-8')).encode('utf-8')
+
+    # 3. write the built tree from scratch
+    shutil.rmtree(out_dir, ignore_errors=True)
+    for rel, data in outputs.items():
+        dest = os.path.join(out_dir, *renames.get(rel, rel).split("/"))
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with open(dest, 'wb') as f:
+            f.write(data)
+        stats["files"] += 1
+        stats["bytes_out"] += len(data)
+
+    # 4. hosting-only firebase.json next to the build (+ .firebaserc so aliases resolve)
+    built_hosting = dict(hosting)
+    built_hosting["public"] = os.path.relpath(out_dir, os.path.join(project_dir, BUILD_DIR)).replace(os.sep, "/")
+    built_hosting["headers"] = CACHE_HEADERS + list(hosting.get("headers", []))
+    with open(os.path.join(project_dir, BUILD_CONFIG), 'w', encoding='utf-8') as f:
+        json.dump({"hosting": built_hosting}, f, indent=2)
+    firebaserc = os.path.join(project_dir, ".firebaserc")
+    if os.path.exists(firebaserc):
+        shutil.copyfile(firebaserc, os.path.join(project_dir, BUILD_DIR, ".firebaserc"))
+    with open(os.path.join(project_dir, BUILD_MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(renames, f, indent=2, sort_keys=True)
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def main(argv=None):
+    """Main function to run the script"""
+    parser = argparse.ArgumentParser(
+        description=f"Build the hosting public dir into {BUILD_PUBLIC}: minify, fingerprint, cache headers")
+    parser.add_argument("project_dir", nargs="?", default=".", help="directory containing firebase.json")
+    parser.add_argument("--no-minify", action="store_true", help="only fingerprint, ship sources as authored")
+    parser.add_argument("--clean", action="store_true", help=f"delete {BUILD_DIR} (including the cache) first")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(os.path.join(args.project_dir, "firebase.json")):
+        print(f"Error: firebase.json not found in {os.path.abspath(args.project_dir)}")
+        return 1
+    if args.clean:
+        shutil.rmtree(os.path.join(args.project_dir, BUILD_DIR), ignore_errors=True)
+
+    stats = build_assets(args.project_dir, minify=not args.no_minify)
+    saved = stats["bytes_in"] - stats["bytes_out"]
+    print(f"Built {stats['files']} files into {BUILD_PUBLIC} in {stats['seconds']:.2f}s")
+    print(f"Minified {stats['minified']} (+{stats['cached']} from cache), "
+          f"fingerprinted {stats['fingerprinted']}, "
+          f"{stats['bytes_in']:,} -> {stats['bytes_out']:,} bytes ({saved:,} saved)")
+    print(f"Deploy with: firebase deploy --only hosting --config {BUILD_CONFIG}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import os
+import sys
+import json
+import hashlib
+import argparse
+
+DATA_DIR = os.path.join("public", "data")
+# Older copy of data/prompts.json still shipped from the public root; merged in and reported
+LEGACY_PROMPTS = os.path.join("public", "prompts.json")
+# One artifact for the studio UI and one bundled with the functions source for askVibeAI
+CATALOG_OUTPUTS = (os.path.join("public", "data", "catalog.json"),
+                   os.path.join("functions", "prompt_catalog.json"))
+CATALOG_VERSION = 1
+HASH_LENGTH = 10
+
+# kind -> (source file in DATA_DIR, top-level list key, per-language text fields)
+SOURCES = {
+    "personas": ("personas.json", "personas", ("title", "description", "system_prompt")),
+    "prompts": ("prompts.json", "prompts", ("title", "description", "base_prompt")),
+}
+
+
+def _short_hash(value):
+    data = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def _load_list(path, key, problems):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except OSError:
+        return None
+    except ValueError as e:
+        problems.append(f"{path}: invalid JSON ({e})")
+        return None
+    items = data.get(key) if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        problems.append(f"{path}: expected a top-level \"{key}\" list")
+        return None
+    return items
+
+
+def _validate(item, path, fields, languages, problems):
+    """Returns True if item has an id, an icon and every text field in every language"""
+    item_id = item.get("id") if isinstance(item, dict) else None
+    if not isinstance(item_id, str) or not item_id:
+        problems.append(f"{path}: entry without an id: {str(item)[:60]}")
+        return False
+    ok = True
+    if not item.get("icon"):
+        problems.append(f"{path}: {item_id}: missing icon")
+    for field in fields:
+        texts = item.get(field)
+        if not isinstance(texts, dict):
+            problems.append(f"{path}: {item_id}: missing {field}")
+            ok = False
+            continue
+        for lang in languages:
+            if not isinstance(texts.get(lang), str) or not texts[lang].strip():
+                problems.append(f"{path}: {item_id}: {field} has no '{lang}' text")
+                ok = False
+    return ok
+
+
+def build_catalog(project_dir=".", outputs=CATALOG_OUTPUTS):
+    """
+    Validates, deduplicates and indexes the persona / prompt libraries into one catalog.
+
+    The catalog keeps both lists in their authored order, an id -> position index for
+    each, a stable id per persona x prompt combination (hash of the two entries, so it
+    only changes when their texts do) and a content hash of the whole catalog.
+
+    Args:
+        project_dir (str): Project root
+        outputs (tuple): Catalog paths relative to project_dir
+
+    Returns:
+        dict: "catalog", "problems" (list of strings), "duplicates", "bytes_in", "bytes_out", "written"
+    """
+    problems = []
+    lists = {}
+    bytes_in = 0
+    for kind, (file_name, key, _) in SOURCES.items():
+        path = os.path.join(project_dir, DATA_DIR, file_name)
+        items = _load_list(path, key, problems)
+        if items is None:
+            if not os.path.exists(path):
+                problems.append(f"{path}: not found")
+            items = []
+        else:
+            bytes_in += os.path.getsize(path)
+        lists[kind] = [(path, item) for item in items]
+
+    legacy = os.path.join(project_dir, LEGACY_PROMPTS)
+    legacy_items = _load_list(legacy, SOURCES["prompts"][1], problems)
+    if legacy_items is not None:
+        bytes_in += os.path.getsize(legacy)
+        lists["prompts"] += [(legacy, item) for item in legacy_items]
+
+    # Languages every entry must cover: the ones the first persona is written in
+    languages = []
+    for _, item in lists["personas"][:1]:
+        languages = sorted(item.get("title", {}))
+
+    catalog = {"version": CATALOG_VERSION, "languages": languages}
+    duplicates = 0
+    for kind, (_, _, fields) in SOURCES.items():
+        entries, index = [], {}
+        for path, item in lists[kind]:
+            if not _validate(item, path, fields, languages, problems):
+                continue
+            if item["id"] in index:
+                if entries[index[item["id"]]] != item:
+                    problems.append(f"{path}: {item['id']}: conflicts with an earlier {kind} entry; keeping the first")
+                duplicates += 1
+                continue
+            index[item["id"]] = len(entries)
+            entries.append(item)
+        catalog[kind] = entries
+        catalog[f"{kind}_index"] = index
+
+    catalog["combos"] = {f"{persona['id']}/{prompt['id']}": _short_hash([persona, prompt])
+                         for persona in catalog["personas"] for prompt in catalog["prompts"]}
+    catalog["hash"] = _short_hash(catalog)
+
+    text = json.dumps(catalog, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    written = 0
+    for rel in outputs:
+        path = os.path.join(project_dir, rel)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                if f.read() == text:
+                    continue
+        except OSError:
+            pass
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(text)
+        written += 1
+
+    return {"catalog": catalog, "problems": problems, "duplicates": duplicates, "bytes_in": bytes_in,
+            "bytes_out": len(text.encode('utf-8')), "written": written}
+
+
+def main(argv=None):
+    """Main function to run the script"""
+    parser = argparse.ArgumentParser(
+        description="Build the persona / prompt catalog used by the studio UI and askVibeAI")
+    parser.add_argument("project_dir", nargs="?", default=".", help="project root")
+    parser.add_argument("--strict", action="store_true", help="exit with an error when the sources have problems")
+    args = parser.parse_args(argv)
+
+    result = build_catalog(args.project_dir)
+    for problem in result["problems"]:
+        print(f"Warning: {problem}")
+    catalog = result["catalog"]
+    print(f"Catalog {catalog['hash']}: {len(catalog['personas'])} personas, {len(catalog['prompts'])} prompts, "
+          f"{len(catalog['combos'])} combinations, {result['duplicates']} duplicate(s) dropped")
+    print(f"{result['bytes_in']:,} bytes of sources -> {result['bytes_out']:,} bytes, "
+          f"{result['written']} of {len(CATALOG_OUTPUTS)} output(s) updated")
+    return 1 if args.strict and result["problems"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+import os
+import re
+import sys
+import json
+import glob
+import hashlib
+import argparse
+
+LOCALES_DIR = os.path.join("public", "locales")
+# Every language is checked against the keys of these
+REFERENCE_LANGUAGES = ("en", "he")
+# Bundle name -> namespaces it carries; "all" gets every namespace of the language
+DEFAULT_PAGES = {"all": None}
+BUNDLE_SUFFIX = ".bundle.json"
+# Source hashes, key lists and problems of the last build (one file per locales dir, under the
+# project), so unchanged languages are neither re-read nor rewritten
+CACHE_DIR = os.path.join(".build", "cache")
+CACHE_VERSION = 2
+
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*[\w.]+\s*\}\}|\{[\w.]+\}|%[sd]")
+
+
+def _flatten(tree, prefix=""):
+    """Nested translation dict -> {"a.b.c": value}"""
+    flat = {}
+    for key, value in tree.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path + "."))
+        else:
+            flat[path] = value
+    return flat
+
+
+def _placeholders(value):
+    return sorted(_PLACEHOLDER_RE.findall(value)) if isinstance(value, str) else []
+
+
+def find_languages(locales_dir=LOCALES_DIR):
+    """
+    Returns:
+        dict: language -> {namespace: json file path}
+    """
+    languages = {}
+    for path in sorted(glob.glob(os.path.join(locales_dir, "*", "*.json"))):
+        lang = os.path.basename(os.path.dirname(path))
+        namespace = os.path.splitext(os.path.basename(path))[0]
+        languages.setdefault(lang, {})[namespace] = path
+    return languages
+
+
+def _source_hash(files, pages):
+    h = hashlib.sha256(f"{CACHE_VERSION}\0{json.dumps(pages, sort_keys=True)}".encode('utf-8'))
+    for namespace, path in sorted(files.items()):
+        h.update(namespace.encode('utf-8') + b"\0")
+        with open(path, 'rb') as f:
+            h.update(f.read())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def cache_path(locales_dir, project_dir="."):
+    """The build cache for one locales dir"""
+    key = hashlib.sha256(os.path.abspath(locales_dir).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(project_dir, CACHE_DIR, f"locales-{key}.json")
+
+
+def _write_if_changed(path, text):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(text)
+    return True
+
+
+def _bundle_path(locales_dir, lang, page):
+    name = lang if page == "all" else f"{lang}.{page}"
+    return os.path.join(locales_dir, name + BUNDLE_SUFFIX)
+
+
+def build_locales(locales_dir=LOCALES_DIR, pages=None, use_cache=True, project_dir="."):
+    """
+    Merges each language's namespace files into one compact bundle per page and checks key parity.
+
+    A bundle is {"namespace": {...}, ...}, written next to the language folders as
+    <lang>.bundle.json (or <lang>.<page>.bundle.json for page bundles).
+
+    Args:
+        locales_dir (str): Folder holding one sub folder per language (relative to project_dir)
+        pages (dict): Bundle name -> list of namespaces (None = all); defaults to DEFAULT_PAGES
+        use_cache (bool): Reuse the cache_path() results for languages whose sources did not change
+        project_dir (str): Project root; the cache lives in its CACHE_DIR
+
+    Returns:
+        dict: "languages", "written", "cached" and "problems" (list of human readable strings)
+    """
+    pages = pages or DEFAULT_PAGES
+    locales_dir = os.path.join(project_dir, locales_dir)
+    languages = find_languages(locales_dir)
+    cache_file = cache_path(locales_dir, project_dir)
+    cache = {}
+    if use_cache:
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get("version") != CACHE_VERSION:
+                cache = {}
+        except (OSError, ValueError):
+            cache = {}
+    entries = cache.get("languages", {})
+    stats = {"languages": len(languages), "written": 0, "cached": 0, "problems": []}
+
+    keys = {}  # lang -> {"namespace:key": placeholders}
+    for lang, files in languages.items():
+        digest = _source_hash(files, pages)
+        outputs = [_bundle_path(locales_dir, lang, page) for page in pages]
+        cached = entries.get(lang)
+        if cached and cached["hash"] == digest and all(os.path.exists(p) for p in outputs):
+            keys[lang] = cached["keys"]
+            stats["problems"] += cached["problems"]
+            stats["cached"] += 1
+            continue
+
+        problems = []
+        namespaces = {}
+        for namespace, path in sorted(files.items()):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    namespaces[namespace] = json.load(f)
+            except (OSError, ValueError) as e:
+                problems.append(f"{lang}/{namespace}.json: unreadable ({e})")
+                namespaces[namespace] = {}
+
+        for page, wanted in pages.items():
+            bundle = {ns: tree for ns, tree in namespaces.items() if wanted is None or ns in wanted}
+            for ns in wanted or ():
+                if ns not in namespaces:
+                    problems.append(f"{lang}: page '{page}' needs missing namespace '{ns}'")
+            text = json.dumps(bundle, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+            if _write_if_changed(_bundle_path(locales_dir, lang, page), text):
+                stats["written"] += 1
+
+        keys[lang] = {f"{ns}:{key}": _placeholders(value)
+                      for ns, tree in namespaces.items() for key, value in _flatten(tree).items()}
+        entries[lang] = {"hash": digest, "keys": keys[lang], "problems": problems}
+        stats["problems"] += problems
+
+    # Parity against the reference languages
+    references = [lang for lang in REFERENCE_LANGUAGES if lang in keys]
+    expected = {}
+    for ref in references:
+        for key, placeholders in keys[ref].items():
+            expected.setdefault(key, (ref, placeholders))
+    for lang in sorted(keys):
+        have = keys[lang]
+        missing = sorted(key for key in expected if key not in have)
+        if missing:
+            stats["problems"].append(f"{lang}: {len(missing)} missing key(s): {', '.join(missing[:10])}"
+                                     f"{', ...' if len(missing) > 10 else ''}")
+        if references:
+            extra = sorted(key for key in have if key not in expected)
+            if extra:
+                stats["problems"].append(f"{lang}: {len(extra)} key(s) not in {'/'.join(references)}: "
+                                         f"{', '.join(extra[:10])}{', ...' if len(extra) > 10 else ''}")
+        for key in sorted(set(have) & set(expected)):
+            ref, placeholders = expected[key]
+            if lang != ref and have[key] != placeholders:
+                stats["problems"].append(f"{lang}: {key} placeholders {have[key]} differ from {ref} {placeholders}")
+
+    if use_cache:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({"version": CACHE_VERSION, "languages": entries}, f, ensure_ascii=False)
+    return stats
+
+
+def _parse_pages(specs):
+    """["teacher=common,teacher", ...] -> {"teacher": ["common", "teacher"], ...}"""
+    pages = {}
+    for spec in specs:
+        name, _, namespaces = spec.partition("=")
+        pages[name.strip()] = [ns.strip() for ns in namespaces.split(",") if ns.strip()] or None
+    return pages
+
+
+def main(argv=None):
+    """Main function to run the script"""
+    parser = argparse.ArgumentParser(
+        description="Merge public/locales/<lang>/*.json into one bundle per language and check key parity")
+    parser.add_argument("project_dir", nargs="?", default=".", help="project root (holds .build)")
+    parser.add_argument("--locales-dir", default=LOCALES_DIR, help=f"relative to project_dir (default: {LOCALES_DIR})")
+    parser.add_argument("--page", action="append", default=[], metavar="NAME=NS1,NS2",
+                        help="also build a page bundle with just these namespaces (repeatable)")
+    parser.add_argument("--no-cache", action="store_true", help="rebuild every language")
+    parser.add_argument("--strict", action="store_true", help="exit with an error when translations have problems")
+    args = parser.parse_args(argv)
+
+    locales_dir = os.path.join(args.project_dir, args.locales_dir)
+    if not os.path.isdir(locales_dir):
+        print(f"Error: {locales_dir} not found")
+        return 1
+
+    pages = dict(DEFAULT_PAGES, **_parse_pages(args.page))
+    stats = build_locales(args.locales_dir, pages, use_cache=not args.no_cache, project_dir=args.project_dir)
+    for problem in stats["problems"]:
+        print(f"Warning: {problem}")
+    print(f"{stats['languages']} languages: {stats['written']} bundle(s) written, "
+          f"{stats['cached']} language(s) unchanged, {len(stats['problems'])} problem(s)")
+    return 1 if args.strict and stats["problems"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
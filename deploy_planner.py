@@ -0,0 +1,296 @@
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+
+from file_collector import load_ignore_rules, is_ignored
+
+# Per-alias record of what was live after each successful deploy (machine-local, ignored by git)
+DEPLOY_MANIFEST = ".deploy_manifest.json"
+MANIFEST_VERSION = 1
+# The snapshot a plan was made from; `record --snapshot` stores it, not the tree as it is after the deploy
+PLAN_SNAPSHOT = os.path.join(".build", "deploy_plan.json")
+
+FUNCTIONS_ENTRY = "index.js"
+
+# `exports.name = ...` at column 0 starts a function's section of index.js
+_EXPORT_RE = re.compile(r"^exports\.([A-Za-z_$][\w$]*)\s*=")
+# Any other top-level declaration is shared code: changing it redeploys every function
+_SHARED_RE = re.compile(r"^(?:const|let|var|function|async\s+function|class|require|module\.exports|[A-Za-z_$][\w$.]*\s*\()")
+
+
+def _sha(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _config_hash(section):
+    return _sha(json.dumps(section, sort_keys=True).encode('utf-8'))
+
+
+def hash_tree(root, ignore_rules=()):
+    """
+    Content hashes for every non-ignored file under root.
+
+    Returns:
+        dict: relative posix path -> sha256 hex digest
+    """
+    root = os.path.abspath(root)
+    hashes = {}
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = sorted(d for d in dir_names
+                              if not is_ignored(os.path.join(dir_path, d), True, ignore_rules))
+        for name in sorted(file_names):
+            abs_path = os.path.join(dir_path, name)
+            if is_ignored(abs_path, False, ignore_rules):
+                continue
+            try:
+                with open(abs_path, 'rb') as f:
+                    hashes[os.path.relpath(abs_path, root).replace(os.sep, "/")] = _sha(f.read())
+            except OSError:
+                continue
+    return hashes
+
+
+def split_exports(source):
+    """
+    Splits functions/index.js into a shared part and one part per `exports.name`.
+
+    A section runs from its `exports.name =` line to the next column-0 export or
+    top-level declaration; everything else (requires, helpers, constants) is the
+    shared part, which every function depends on.
+
+    Returns:
+        tuple: (shared hash, {export name: hash})
+    """
+    shared = []
+    sections = {}
+    current = None
+    for line in source.splitlines(keepends=True):
+        m = _EXPORT_RE.match(line)
+        if m:
+            current = m.group(1)
+            sections.setdefault(current, [])
+        elif _SHARED_RE.match(line):
+            current = None
+        (sections[current] if current else shared).append(line)
+    return (_sha("".join(shared).encode('utf-8')),
+            {name: _sha("".join(lines).encode('utf-8')) for name, lines in sections.items()})
+
+
+def snapshot(project_dir="."):
+    """
+    Current state of the hosting and functions sources, respecting firebase.json "ignore" lists.
+
+    Returns:
+        dict: {"hosting": {...}, "functions": {...}}; a target missing from firebase.json is omitted
+    """
+    with open(os.path.join(project_dir, "firebase.json"), 'r', encoding='utf-8') as f:
+        cfg = json.load(f)
+    ignore_rules = load_ignore_rules(project_dir, include_gitignore=False)
+    snap = {}
+
+    hosting = cfg.get("hosting")
+    if isinstance(hosting, list):
+        hosting = hosting[0] if hosting else None
+    if hosting:
+        snap["hosting"] = {
+            "config": _config_hash(hosting),
+            "files": hash_tree(os.path.join(project_dir, hosting.get("public", "public")), ignore_rules),
+        }
+
+    functions = cfg.get("functions")
+    if isinstance(functions, list):
+        functions = functions[0] if functions else None
+    if functions:
+        source_dir = os.path.join(project_dir, functions.get("source", "functions"))
+        files = hash_tree(source_dir, ignore_rules)
+        files.pop(FUNCTIONS_ENTRY, None)
+        try:
+            with open(os.path.join(source_dir, FUNCTIONS_ENTRY), 'r', encoding='utf-8') as f:
+                shared, exports = split_exports(f.read())
+        except OSError:
+            shared, exports = None, {}
+        snap["functions"] = {
+            "config": _config_hash(functions),
+            "files": files,
+            "shared": shared,
+            "exports": exports,
+        }
+    return snap
+
+
+def load_manifest(project_dir="."):
+    try:
+        with open(os.path.join(project_dir, DEPLOY_MANIFEST), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("version") == MANIFEST_VERSION:
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "aliases": {}}
+
+
+def save_snapshot(snap, project_dir=".", path=PLAN_SNAPSHOT):
+    """Saves snap (relative paths resolve against project_dir) for a later `record --snapshot`"""
+    path = os.path.join(project_dir, path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump({"version": MANIFEST_VERSION, "snapshot": snap}, f)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def load_snapshot(path):
+    """Snapshot saved by save_snapshot; raises ValueError if it is not one"""
+    with open(path, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+    if not isinstance(saved, dict) or saved.get("version") != MANIFEST_VERSION or "snapshot" not in saved:
+        raise ValueError(f"{path} is not a saved deploy plan snapshot")
+    return saved["snapshot"]
+
+
+def _changed_files(old, new):
+    return sorted(rel for rel in set(old) | set(new) if old.get(rel) != new.get(rel))
+
+
+def plan(project_dir=".", alias="default", snap=None):
+    """
+    Works out what has to be deployed to alias, compared to its last recorded deploy.
+
+    Args:
+        project_dir (str): Directory containing firebase.json
+        alias (str): Project alias the deploy goes to
+        snap (dict): Precomputed snapshot(), if any
+
+    Returns:
+        dict: "targets" (--only entries: "hosting", "functions" or "functions:name"),
+              "reasons" (human readable, one per target) and "snapshot"
+    """
+    snap = snap if snap is not None else snapshot(project_dir)
+    last = load_manifest(project_dir)["aliases"].get(alias, {})
+    targets, reasons = [], []
+
+    if "hosting" in snap:
+        old = last.get("hosting")
+        if not old:
+            targets.append("hosting"); reasons.append("hosting: no recorded deploy")
+        elif old["config"] != snap["hosting"]["config"]:
+            targets.append("hosting"); reasons.append("hosting: firebase.json hosting config changed")
+        else:
+            changed = _changed_files(old["files"], snap["hosting"]["files"])
+            if changed:
+                targets.append("hosting")
+                reasons.append(f"hosting: {len(changed)} file(s) changed ({', '.join(changed[:5])}"
+                               f"{', ...' if len(changed) > 5 else ''})")
+
+    if "functions" in snap:
+        new = snap["functions"]
+        old = last.get("functions")
+        if not old:
+            whole = "no recorded deploy"
+        elif old["config"] != new["config"]:
+            whole = "firebase.json functions config changed"
+        elif _changed_files(old["files"], new["files"]):
+            whole = "changed: " + ", ".join(_changed_files(old["files"], new["files"])[:5])
+        elif old["shared"] != new["shared"]:
+            whole = f"shared code in {FUNCTIONS_ENTRY} changed"
+        elif set(old["exports"]) - set(new["exports"]):
+            # Only a full functions deploy deletes functions that are gone
+            whole = "removed: " + ", ".join(sorted(set(old["exports"]) - set(new["exports"])))
+        else:
+            whole = None
+
+        if whole:
+            targets.append("functions"); reasons.append(f"functions: {whole}")
+        else:
+            for name in sorted(new["exports"]):
+                if old["exports"].get(name) != new["exports"][name]:
+                    targets.append(f"functions:{name}")
+                    reasons.append(f"functions:{name}: " + ("new" if name not in old["exports"] else "changed"))
+
+    return {"targets": targets, "reasons": reasons, "snapshot": snap}
+
+
+def record(project_dir=".", alias="default", targets=("hosting", "functions"), snap=None):
+    """
+    Records a successful deploy of targets to alias, so the next plan() diffs against it.
+
+    Partial functions deploys ("functions:name") only update those functions' hashes.
+    Pass the snapshot the deploy was planned from: a fresh one would also mark files
+    edited while the deploy ran as deployed.
+    """
+    snap = snap if snap is not None else snapshot(project_dir)
+    manifest = load_manifest(project_dir)
+    entry = manifest["aliases"].setdefault(alias, {})
+    deployed = entry.setdefault("deployed_at", {})
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    if "hosting" in targets and "hosting" in snap:
+        entry["hosting"] = snap["hosting"]
+        deployed["hosting"] = now
+    if "functions" in targets and "functions" in snap:
+        entry["functions"] = snap["functions"]
+        deployed["functions"] = now
+    else:
+        names = [t.split(":", 1)[1] for t in targets if t.startswith("functions:")]
+        if names and "functions" in entry and "functions" in snap:
+            for name in names:
+                if name in snap["functions"]["exports"]:
+                    entry["functions"]["exports"][name] = snap["functions"]["exports"][name]
+                deployed[f"functions:{name}"] = now
+
+    path = os.path.join(project_dir, DEPLOY_MANIFEST)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def main(argv=None):
+    """Main function to run the script"""
+    parser = argparse.ArgumentParser(
+        description="Plan a Firebase deploy from what changed since the last deploy to an alias")
+    parser.add_argument("action", nargs="?", choices=("plan", "record"), default="plan",
+                        help="plan: print the --only targets; record: store a successful deploy")
+    parser.add_argument("--alias", default="default", help="project alias (from .firebaserc)")
+    parser.add_argument("--only", default="hosting,functions",
+                        help="record: the --only value that was deployed")
+    parser.add_argument("--project-dir", default=".", help="directory containing firebase.json")
+    parser.add_argument("--json", action="store_true", help="plan: print targets and reasons as JSON")
+    parser.add_argument("--snapshot", metavar="PATH",
+                        help=f"record: the snapshot saved by plan (e.g. {PLAN_SNAPSHOT}) instead of "
+                             "the tree as it is now")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(os.path.join(args.project_dir, "firebase.json")):
+        print(f"Error: firebase.json not found in {os.path.abspath(args.project_dir)}")
+        return 1
+
+    if args.action == "record":
+        targets = [t.strip() for t in args.only.split(",") if t.strip()]
+        try:
+            snap = load_snapshot(args.snapshot) if args.snapshot else None
+        except (OSError, ValueError) as e:
+            print(f"Error: cannot load the plan snapshot: {e}")
+            return 1
+        record(args.project_dir, args.alias, targets, snap)
+        print(f"Recorded deploy of {','.join(targets)} to '{args.alias}'")
+        return 0
+
+    result = plan(args.project_dir, args.alias)
+    save_snapshot(result["snapshot"], args.project_dir)
+    if args.json:
+        print(json.dumps({"targets": result["targets"], "reasons": result["reasons"]}, indent=2))
+    elif not result["targets"]:
+        print(f"Nothing changed since the last deploy to '{args.alias}'")
+    else:
+        for reason in result["reasons"]:
+            print(f"  {reason}")
+        print(f"firebase deploy --only {','.join(result['targets'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
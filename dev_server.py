@@ -0,0 +1,553 @@
+import os
+import re
+import sys
+import gzip
+import time
+import asyncio
+import hashlib
+import argparse
+import mimetypes
+from collections import OrderedDict
+from urllib.parse import unquote
+
+from build_assets import load_hosting_config
+from file_collector import load_ignore_rules, is_ignored
+import firestore_emulator
+
+DEFAULT_PORT = 5080
+HOSTING_EMULATOR_PORT = 5000
+FUNCTIONS_EMULATOR_PORT = 5001
+# Browsers subscribe here (server-sent events); the script is injected into every HTML page
+RELOAD_PATH = "/__livereload"
+RELOAD_SCRIPT_PATH = "/__livereload.js"
+# Reserved Firebase Hosting URLs (/__/firebase/init.js, /__/auth/...) are proxied to the hosting emulator
+RESERVED_PREFIX = "/__/"
+WATCH_INTERVAL_S = 0.5
+SSE_KEEPALIVE_S = 15.0
+# File bodies (and their gzip variants) kept in memory, least recently used dropped first
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+GZIP_MIN_BYTES = 1024
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "application/manifest+json",
+                      "image/svg+xml", "application/xml")
+EXTRA_TYPES = {".js": "text/javascript", ".mjs": "text/javascript", ".json": "application/json",
+               ".webmanifest": "application/manifest+json", ".svg": "image/svg+xml", ".wasm": "application/wasm"}
+REASONS = {200: "OK", 301: "Moved Permanently", 302: "Found", 304: "Not Modified", 400: "Bad Request",
+           404: "Not Found", 405: "Method Not Allowed", 411: "Length Required", 502: "Bad Gateway"}
+
+RELOAD_SCRIPT = b"""(function () {
+  var source = new EventSource("/__livereload"), opened = false;
+  source.onopen = function () {
+    // reconnected after a dev server restart: the files may have changed meanwhile
+    if (opened) location.reload();
+    opened = true;
+  };
+  source.onmessage = function (e) {
+    if (e.data !== "css") return location.reload();
+    document.querySelectorAll('link[rel="stylesheet"]').forEach(function (link) {
+      var url = new URL(link.href);
+      url.searchParams.set("_lr", Date.now());
+      link.href = url.href;
+    });
+  };
+})();
+"""
+_RELOAD_TAG = f'<script src="{RELOAD_SCRIPT_PATH}"></script>'.encode('ascii')
+_BODY_END_RE = re.compile(rb"</body\s*>", re.IGNORECASE)
+
+
+def glob_to_regex(pattern):
+    """
+    Firebase Hosting "source" glob -> compiled regex over the URL path.
+
+    Supports ** (any depth, including none), *, ?, {a,b} and the extglob groups @(a|b), +(...), etc.
+    """
+    if not pattern.startswith(("/", "**")):
+        pattern = "/" + pattern
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "{":
+            end = pattern.find("}", i)
+            if end < 0:
+                out.append(re.escape(pattern[i:]))
+                break
+            out.append("(?:" + "|".join(re.escape(p) for p in pattern[i + 1:end].split(",")) + ")")
+            i = end + 1
+        elif pattern[i] in "@+!" and pattern.startswith("(", i + 1):
+            end = pattern.find(")", i)
+            out.append("(?:" + "|".join(re.escape(p) for p in pattern[i + 2:end].split("|")) + ")")
+            i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("^" + "".join(out) + "$")
+
+
+def _matcher(rule):
+    """regex for a headers / redirects / rewrites rule ("regex" or "source")"""
+    if "regex" in rule:
+        return re.compile(rule["regex"])
+    return glob_to_regex(rule.get("source", "**"))
+
+
+class HostingConfig:
+    """The parts of firebase.json's hosting section the dev server honours"""
+
+    def __init__(self, project_dir="."):
+        self.project_dir = os.path.abspath(project_dir)
+        path = os.path.join(self.project_dir, "firebase.json")
+        try:
+            self.mtime = os.stat(path).st_mtime_ns
+            _, hosting = load_hosting_config(self.project_dir)
+        except (OSError, ValueError):
+            self.mtime, hosting = None, {}
+        self.public = os.path.normpath(os.path.join(self.project_dir, hosting.get("public", "public")))
+        self.ignore_rules = [rule for rule in load_ignore_rules(self.project_dir, include_gitignore=False)
+                             if rule[0] == self.public]
+        self.headers = [(_matcher(r), [(h["key"], h["value"]) for h in r.get("headers", [])])
+                        for r in hosting.get("headers", [])]
+        self.redirects = [(_matcher(r), r) for r in hosting.get("redirects", [])]
+        self.rewrites = [(_matcher(r), r) for r in hosting.get("rewrites", [])]
+        self.clean_urls = bool(hosting.get("cleanUrls"))
+
+    def changed(self):
+        try:
+            return os.stat(os.path.join(self.project_dir, "firebase.json")).st_mtime_ns != self.mtime
+        except OSError:
+            return self.mtime is not None
+
+    def ignored(self, abs_path, is_dir=False):
+        return is_ignored(abs_path, is_dir, self.ignore_rules)
+
+    def extra_headers(self, url_path):
+        return [header for regex, headers in self.headers if regex.match(url_path) for header in headers]
+
+    def redirect(self, url_path):
+        for regex, rule in self.redirects:
+            m = regex.match(url_path)
+            if m:
+                # regex rules can reuse named groups in the destination as :name
+                groups = m.groupdict()
+                destination = re.sub(r":(\w+)", lambda g: groups.get(g.group(1)) or g.group(0), rule["destination"])
+                return rule.get("type", 301), destination
+        return None
+
+    def rewrite(self, url_path):
+        for regex, rule in self.rewrites:
+            if regex.match(url_path):
+                return rule
+        return None
+
+
+class _Entry:
+    __slots__ = ("key", "body", "gzipped", "etag", "content_type")
+
+    def __init__(self, key, body, content_type):
+        self.key, self.body, self.content_type = key, body, content_type
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self.gzipped = None
+
+    @property
+    def size(self):
+        return len(self.body) + len(self.gzipped or b"")
+
+
+class FileCache:
+    """
+    In-memory file bodies keyed by path and validated against (mtime, size) on each request,
+    so an edited file is re-read on its next request even before the watcher notices.
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, inject_reload=True):
+        self.max_bytes, self.inject_reload = max_bytes, inject_reload
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = 0
+
+    def get(self, abs_path):
+        """(_Entry, cache hit?) for the file, or (None, False) if it cannot be read"""
+        try:
+            st = os.stat(abs_path)
+        except OSError:
+            return None, False
+        key = (st.st_mtime_ns, st.st_size)
+        entry = self.entries.get(abs_path)
+        if entry is not None and entry.key == key:
+            self.entries.move_to_end(abs_path)
+            self.hits += 1
+            return entry, True
+        try:
+            with open(abs_path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None, False
+        self.misses += 1
+        content_type = content_type_for(abs_path)
+        if self.inject_reload and content_type.startswith("text/html"):
+            body = inject_reload_script(body)
+        self.drop(abs_path)
+        entry = _Entry(key, body, content_type)
+        self._store(abs_path, entry)
+        return entry, False
+
+    def gzipped(self, abs_path, entry):
+        if entry.gzipped is None:
+            entry.gzipped = gzip.compress(entry.body, compresslevel=6, mtime=0)
+            if self.entries.get(abs_path) is entry:
+                self.bytes += len(entry.gzipped)
+                self._trim()
+        return entry.gzipped
+
+    def _store(self, abs_path, entry):
+        self.entries[abs_path] = entry
+        self.bytes += entry.size
+        self._trim()
+
+    def _trim(self):
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= old.size
+
+    def drop(self, abs_path):
+        old = self.entries.pop(abs_path, None)
+        if old is not None:
+            self.bytes -= old.size
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+
+def content_type_for(path):
+    ext = os.path.splitext(path)[1].lower()
+    ctype = EXTRA_TYPES.get(ext) or mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if ctype.startswith("text/") or ctype in ("application/json", "application/manifest+json"):
+        ctype += "; charset=utf-8"
+    return ctype
+
+
+def inject_reload_script(html):
+    """Adds the live reload <script> before the last </body> (or at the end)"""
+    matches = list(_BODY_END_RE.finditer(html))
+    if not matches:
+        return html + _RELOAD_TAG
+    at = matches[-1].start()
+    return html[:at] + _RELOAD_TAG + html[at:]
+
+
+async def _read_request(reader):
+    """(method, target, headers, body) of the next request on the connection, or None at EOF"""
+    line = await reader.readline()
+    while line in (b"\r\n", b"\n"):
+        line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode('latin-1').split()
+    if len(parts) != 3:
+        raise ValueError("malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode('latin-1').partition(":")
+        headers[key.strip().lower()] = value.strip()
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise LookupError("chunked request bodies are not supported")
+    body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+    return parts[0].upper(), parts[1], headers, body
+
+
+class DevServer:
+    """
+    Static server for the hosting public dir with live reload, and a proxy to the emulators.
+
+    Resolution follows Firebase Hosting: redirects, then an existing file (or
+    index.html / cleanUrls .html), then rewrites (a file, or a function served by
+    the functions emulator), then 404.html.
+    """
+
+    def __init__(self, project_dir=".", port=DEFAULT_PORT, live_reload=True, project=None,
+                 functions_port=FUNCTIONS_EMULATOR_PORT, hosting_port=HOSTING_EMULATOR_PORT, quiet=False):
+        self.project_dir, self.port, self.live_reload, self.quiet = project_dir, port, live_reload, quiet
+        self.project = project or firestore_emulator.project_id(project_dir)
+        self.functions_port, self.hosting_port = functions_port, hosting_port
+        self.config = HostingConfig(project_dir)
+        self.cache = FileCache(inject_reload=live_reload)
+        self.listeners = set()
+        self.reloads = 0
+
+    # ---------- serving ----------
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except LookupError as e:
+                    await self._send(writer, 411, [], str(e).encode('utf-8'), keep_alive=False)
+                    return
+                if request is None:
+                    return
+                if not await self._dispatch(reader, writer, *request):
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send(self, writer, status, headers, body=b"", head_only=False, keep_alive=True):
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}", f"Content-Length: {len(body)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        lines += [f"{key}: {value}" for key, value in headers]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + (b"" if head_only else body))
+        await writer.drain()
+
+    def _log(self, method, target, status, started, note=""):
+        if not self.quiet:
+            print(f"{method} {target} -> {status} {(time.perf_counter() - started) * 1000:.1f}ms{note}", flush=True)
+
+    async def _dispatch(self, reader, writer, method, target, headers, body):
+        started = time.perf_counter()
+        keep_alive = headers.get("connection", "").lower() != "close"
+        path = target.split("?", 1)[0]
+
+        if path.startswith(RESERVED_PREFIX):
+            status = await self._proxy(writer, self.hosting_port, method, target, headers, body)
+            self._log(method, target, status, started, " (hosting emulator)")
+            return False
+        if self.live_reload and path == RELOAD_PATH:
+            await self._events(writer)
+            return False
+        if self.live_reload and path == RELOAD_SCRIPT_PATH:
+            await self._send(writer, 200, [("Content-Type", "text/javascript; charset=utf-8"),
+                                           ("Cache-Control", "no-cache")], RELOAD_SCRIPT, method == "HEAD", keep_alive)
+            return keep_alive
+
+        redirect = self.config.redirect(path)
+        if redirect:
+            status, location = redirect
+            await self._send(writer, status, [("Location", location)], b"", method == "HEAD", keep_alive)
+            self._log(method, target, status, started)
+            return keep_alive
+
+        file_path = self._resolve(path)
+        if file_path is None:
+            rule = self.config.rewrite(path)
+            if rule and "function" in rule:
+                status = await self._proxy_function(writer, rule["function"], method, target, headers, body)
+                self._log(method, target, status, started, " (functions emulator)")
+                return False
+            if rule and "destination" in rule:
+                file_path = self._resolve(rule["destination"])
+        if file_path is None:
+            not_found = os.path.join(self.config.public, "404.html")
+            status, file_path = 404, not_found if os.path.isfile(not_found) else None
+        else:
+            status = 200
+        if method not in ("GET", "HEAD"):
+            await self._send(writer, 405, [("Allow", "GET, HEAD")], b"", False, keep_alive)
+            self._log(method, target, 405, started)
+            return keep_alive
+
+        entry, hit = self.cache.get(file_path) if file_path else (None, False)
+        if entry is None:
+            await self._send(writer, 404, [("Content-Type", "text/plain; charset=utf-8")],
+                             b"Not Found", method == "HEAD", keep_alive)
+            self._log(method, target, 404, started)
+            return keep_alive
+        response_headers = [("Content-Type", entry.content_type), ("ETag", entry.etag),
+                            ("Cache-Control", "no-cache")]
+        payload = entry.body
+        compressible = entry.content_type.startswith(COMPRESSIBLE_TYPES) and len(entry.body) >= GZIP_MIN_BYTES
+        if compressible:
+            response_headers.append(("Vary", "Accept-Encoding"))
+        # firebase.json headers override the defaults above
+        extra = self.config.extra_headers(path)
+        overridden = {key.lower() for key, _ in extra}
+        response_headers = [h for h in response_headers if h[0].lower() not in overridden] + extra
+        if status == 200 and entry.etag in [t.strip() for t in headers.get("if-none-match", "").split(",")]:
+            await self._send(writer, 304, [h for h in response_headers if h[0] != "Content-Type"],
+                             b"", True, keep_alive)
+            self._log(method, target, 304, started)
+            return keep_alive
+        if compressible and "gzip" in headers.get("accept-encoding", ""):
+            payload = self.cache.gzipped(file_path, entry)
+            response_headers.append(("Content-Encoding", "gzip"))
+        await self._send(writer, status, response_headers, payload, method == "HEAD", keep_alive)
+        self._log(method, target, status, started, f" {len(payload)}B" + (" (cached)" if hit else ""))
+        return keep_alive
+
+    def _resolve(self, url_path):
+        """Existing, non-ignored file in the public dir for a URL path, or None"""
+        rel = unquote(url_path).lstrip("/")
+        abs_path = os.path.normpath(os.path.join(self.config.public, rel))
+        if abs_path != self.config.public and not abs_path.startswith(self.config.public + os.sep):
+            return None
+        candidates = [abs_path]
+        if url_path.endswith("/") or os.path.isdir(abs_path):
+            candidates = [os.path.join(abs_path, "index.html")]
+        elif self.config.clean_urls:
+            candidates.append(abs_path + ".html")
+        for candidate in candidates:
+            if os.path.isfile(candidate) and not self.config.ignored(candidate):
+                return candidate
+        return None
+
+    # ---------- proxying ----------
+
+    async def _proxy_function(self, writer, function, method, target, headers, body):
+        if isinstance(function, dict):
+            name, region = function.get("functionId"), function.get("region", "us-central1")
+        else:
+            name, region = function, "us-central1"
+        return await self._proxy(writer, self.functions_port, method,
+                                 f"/{self.project}/{region}/{name}{target}", headers, body)
+
+    async def _proxy(self, writer, port, method, target, headers, body):
+        """Forwards one request to localhost:port and streams the response back (closing the connection)"""
+        try:
+            up_reader, up_writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), 5.0)
+        except (OSError, asyncio.TimeoutError):
+            message = f"Nothing is listening on port {port} - start the emulators first.".encode('utf-8')
+            await self._send(writer, 502, [("Content-Type", "text/plain; charset=utf-8")], message,
+                             keep_alive=False)
+            return 502
+        forwarded = {k: v for k, v in headers.items() if k not in ("connection", "keep-alive", "host")}
+        forwarded.update({"host": f"127.0.0.1:{port}", "connection": "close", "content-length": str(len(body))})
+        head = f"{method} {target} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in forwarded.items()) + "\r\n"
+        status = 502
+        try:
+            up_writer.write(head.encode('latin-1') + body)
+            first = True
+            while True:
+                chunk = await up_reader.read(65536)
+                if not chunk:
+                    break
+                if first:
+                    status = int(chunk.split(b" ", 2)[1])
+                    first = False
+                writer.write(chunk)
+                await writer.drain()
+        except (ConnectionError, ValueError, IndexError):
+            pass
+        finally:
+            up_writer.close()
+        return status
+
+    # ---------- live reload ----------
+
+    async def _events(self, writer):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     b"Connection: keep-alive\r\n\r\nretry: 500\n\n")
+        queue = asyncio.Queue()
+        self.listeners.add(queue)
+        try:
+            await writer.drain()
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE_S)
+                    writer.write(f"data: {event}\n\n".encode('utf-8'))
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                await writer.drain()
+        finally:
+            self.listeners.discard(queue)
+
+    def _scan(self):
+        """{relative path: (mtime, size)} of the served (not ignored) files"""
+        files = {}
+        public = self.config.public
+        for root, dirs, names in os.walk(public):
+            dirs[:] = [d for d in dirs if not self.config.ignored(os.path.join(root, d), True)]
+            for name in names:
+                path = os.path.join(root, name)
+                if self.config.ignored(path):
+                    continue  # never served, so editing it shouldn't reload the page
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files[os.path.relpath(path, public)] = (st.st_mtime_ns, st.st_size)
+        return files
+
+    async def watch(self, interval=WATCH_INTERVAL_S):
+        """Polls the public dir (and firebase.json) and tells connected browsers what changed"""
+        known = await asyncio.to_thread(self._scan)
+        while True:
+            await asyncio.sleep(interval)
+            event = None
+            if self.config.changed():
+                self.config = HostingConfig(self.project_dir)
+                self.cache.clear()
+                known = await asyncio.to_thread(self._scan)
+                event, changed = "reload", ["firebase.json"]
+            else:
+                current = await asyncio.to_thread(self._scan)
+                changed = sorted(p for p in set(known) | set(current) if known.get(p) != current.get(p))
+                known = current
+                if changed:
+                    for rel in changed:
+                        self.cache.drop(os.path.join(self.config.public, rel))
+                    event = "css" if all(p.lower().endswith(".css") for p in changed) else "reload"
+            if event:
+                self.reloads += 1
+                shown = ", ".join(changed[:3]) + (f" (+{len(changed) - 3})" if len(changed) > 3 else "")
+                print(f"Changed: {shown} -> {event} ({len(self.listeners)} browser(s))", flush=True)
+                for queue in self.listeners:
+                    queue.put_nowait(event)
+
+    async def serve(self):
+        server = await asyncio.start_server(self.handle, "127.0.0.1", self.port)
+        print(f"Serving {self.config.public} on http://localhost:{self.port} "
+              f"(live reload {'on' if self.live_reload else 'off'}; functions -> :{self.functions_port}, "
+              f"/__/ -> :{self.hosting_port})", flush=True)
+        async with server:
+            if self.live_reload:
+                await asyncio.gather(server.serve_forever(), self.watch())
+            else:
+                await server.serve_forever()
+
+
+def main(argv=None):
+    """Main function to run the script"""
+    parser = argparse.ArgumentParser(
+        description="Fast local server for the hosting public dir (firebase.json aware, with live reload)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"default: {DEFAULT_PORT}")
+    parser.add_argument("--project-dir", default=".", help="directory containing firebase.json")
+    parser.add_argument("--project", help="project id for function rewrites (default: from .firebaserc)")
+    parser.add_argument("--functions-port", type=int, default=FUNCTIONS_EMULATOR_PORT)
+    parser.add_argument("--hosting-port", type=int, default=HOSTING_EMULATOR_PORT,
+                        help="hosting emulator, for the reserved /__/ URLs")
+    parser.add_argument("--no-reload", action="store_true", help="disable file watching and live reload")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not log every request")
+    args = parser.parse_args(argv)
+
+    server = DevServer(args.project_dir, args.port, not args.no_reload, args.project,
+                       args.functions_port, args.hosting_port, args.quiet)
+    if not os.path.isdir(server.config.public):
+        print(f"Error: public dir {server.config.public} does not exist")
+        return 1
+    try:
+        asyncio.run(server.serve())
+    except OSError as e:
+        print(f"Error: cannot listen on port {args.port} ({e})")
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
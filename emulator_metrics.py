@@ -0,0 +1,212 @@
+import re
+import csv
+import sys
+import math
+import argparse
+from collections import deque
+
+# Durations kept per function for the rolling percentiles
+WINDOW = 1000
+# Histogram bucket upper bounds in ms (the last bucket is open-ended)
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+_BEGIN_RE = re.compile(r'functions: Beginning execution of "([^"]+)"')
+_FINISH_RE = re.compile(r'functions: Finished "([^"]+)" in ~?([\d.]+)\s*(ms|s)\b')
+_TIMEOUT_RE = re.compile(r"function timed out|timed out after", re.IGNORECASE)
+_MEMORY_RE = re.compile(r"memory limit|out of memory|heap out of memory|exceeded memory", re.IGNORECASE)
+_ERROR_RE = re.compile(r'"severity"\s*:\s*"(ERROR|CRITICAL)"|\bUnhandled error\b|\bError:|❌', re.IGNORECASE)
+_REGION_RE = re.compile(r"^[a-z]+-[a-z]+\d+-")
+# The only other places the emulator names a function: a region-qualified quoted
+# name in its own "functions:" messages, and the "[name]" prefix on function logs
+_QUALIFIED_RE = re.compile(r'functions: .*"([a-z]+-[a-z]+\d+-[A-Za-z_$][\w$]*)"')
+_PREFIX_RE = re.compile(r"^[^\w\[]*\[((?:[a-z]+-[a-z]+\d+-)?[A-Za-z_$][\w$]*)\]")
+
+CSV_FIELDS = ("function", "count", "errors", "error_rate", "timeouts", "memory_warnings", "running",
+              "p50_ms", "p95_ms", "p99_ms", "max_ms", "mean_ms") + tuple(f"le_{b}ms" for b in BUCKETS_MS) + ("gt_max",)
+
+
+def function_name(qualified):
+    """"us-central1-askVibeAI" -> "askVibeAI\""""
+    return _REGION_RE.sub("", qualified)
+
+
+def parse_line(line):
+    """
+    Turns one emulator output line into a typed event, or None.
+
+    Returns:
+        tuple: ("begin", fn) / ("finish", fn, ms) / ("timeout", fn or None) /
+               ("memory", fn or None) / ("error", fn or None)
+    """
+    line = _ANSI_RE.sub("", line)
+    m = _FINISH_RE.search(line)
+    if m:
+        ms = float(m.group(2)) * (1000.0 if m.group(3) == "s" else 1.0)
+        return ("finish", function_name(m.group(1)), ms)
+    m = _BEGIN_RE.search(line)
+    if m:
+        return ("begin", function_name(m.group(1)))
+    named = _QUALIFIED_RE.search(line) or _PREFIX_RE.search(line)
+    fn = function_name(named.group(1)) if named else None
+    if _TIMEOUT_RE.search(line):
+        return ("timeout", fn)
+    if _MEMORY_RE.search(line):
+        return ("memory", fn)
+    if _ERROR_RE.search(line):
+        return ("error", fn)
+    return None
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values), max(1, math.ceil(pct / 100.0 * len(sorted_values)))) - 1]
+
+
+class FunctionMetrics:
+    """Counters, a bucketed histogram and a rolling window of durations for one function"""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.memory = 0
+        self.running = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.window = deque(maxlen=WINDOW)
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self._failed_open = 0  # errors seen for invocations that have not finished yet
+
+    def add(self, ms):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.window.append(ms)
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def row(self):
+        window = sorted(self.window)
+        row = {
+            "function": self.name,
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.count, 4) if self.count else 0.0,
+            "timeouts": self.timeouts,
+            "memory_warnings": self.memory,
+            "running": self.running,
+            "p50_ms": _percentile(window, 50),
+            "p95_ms": _percentile(window, 95),
+            "p99_ms": _percentile(window, 99),
+            "max_ms": self.max_ms if self.count else None,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+        }
+        for bound, n in zip(BUCKETS_MS, self.buckets):
+            row[f"le_{bound}ms"] = n
+        row["gt_max"] = self.buckets[-1]
+        return row
+
+
+class EmulatorMetrics:
+    """
+    Streaming aggregation of functions emulator output.
+
+    Feed it output as it arrives; error/timeout/memory lines that do not name a
+    function that has run are charged to the function that is running, when
+    exactly one is.
+    """
+
+    def __init__(self):
+        self.functions = {}
+        self.unattributed = 0
+        self.version = 0  # bumped on every change, so a UI can skip redraws
+
+    def _fn(self, name):
+        if name not in self.functions:
+            self.functions[name] = FunctionMetrics(name)
+        return self.functions[name]
+
+    def _running_one(self):
+        running = [fn for fn in self.functions.values() if fn.running > 0]
+        return running[0] if len(running) == 1 else None
+
+    def feed(self, text):
+        for line in text.splitlines():
+            event = parse_line(line)
+            if event is None:
+                continue
+            self.version += 1
+            kind = event[0]
+            if kind == "begin":
+                self._fn(event[1]).running += 1
+            elif kind == "finish":
+                fn = self._fn(event[1])
+                fn.running = max(0, fn.running - 1)
+                fn.add(event[2])
+                if fn._failed_open:
+                    fn._failed_open -= 1
+                    fn.errors += 1
+            else:
+                fn = self.functions.get(event[1]) or self._running_one()
+                if fn is None:
+                    self.unattributed += 1
+                elif kind == "memory":
+                    fn.memory += 1
+                else:
+                    if kind == "timeout":
+                        fn.timeouts += 1
+                    if fn.running == 0:
+                        fn.errors += 1
+                    else:
+                        # charged when the invocation finishes; one per invocation, however many lines it logs
+                        fn._failed_open = min(fn._failed_open + 1, fn.running)
+
+    def rows(self):
+        return [self.functions[name].row() for name in sorted(self.functions)]
+
+    def write_csv(self, path):
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+
+def main(argv=None):
+    """Main function to run the script"""
+    parser = argparse.ArgumentParser(
+        description="Per-function latency / error metrics from a saved functions emulator log")
+    parser.add_argument("log", help="emulator output (e.g. .dev_logs/startDev.log), '-' for stdin")
+    parser.add_argument("--csv", help="write the metrics table to this CSV file")
+    args = parser.parse_args(argv)
+
+    metrics = EmulatorMetrics()
+    stream = sys.stdin if args.log == "-" else open(args.log, 'r', encoding='utf-8', errors='replace')
+    carry = ""
+    with stream:
+        for chunk in iter(lambda: stream.read(1 << 16), ""):
+            # keep a partial last line for the next chunk
+            head, sep, tail = chunk.rpartition("\n")
+            metrics.feed(carry + head + sep)
+            carry = tail
+        metrics.feed(carry)
+
+    print(f"{'function':<24}{'count':>7}{'errors':>8}{'p50':>10}{'p95':>10}{'max':>10}")
+    for row in metrics.rows():
+        fmt = lambda v: "-" if v is None else f"{v:.0f}ms"
+        print(f"{row['function']:<24}{row['count']:>7}{row['errors']:>8}"
+              f"{fmt(row['p50_ms']):>10}{fmt(row['p95_ms']):>10}{fmt(row['max_ms']):>10}")
+    if args.csv:
+        metrics.write_csv(args.csv)
+        print(f"Saved to {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,115 +1,867 @@
 import os
-import glob
+import io
+import re
+import sys
+import codecs
+import json
+import time
+import fnmatch
+import hashlib
+import tarfile
+import zipfile
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def collect_files_to_txt(source_directory, output_file="collected_files.txt"):
+# File extensions to collect
+FILE_EXTENSIONS = ['*.html', '*.js', '*.json', '*.md']
+
+# Specific folders to search in
+TARGET_FOLDERS = ['public', 'functions', 'docs']
+
+# Never descended into, whatever the ignore files say
+ALWAYS_IGNORED = {'node_modules', '.git'}
+
+MANIFEST_VERSION = 2
+
+# Reader threads prefetching (stat + hash + character count) ahead of the writer
+DEFAULT_JOBS = 8
+# Files and cached sections are streamed in chunks of this many bytes/characters
+CHUNK_SIZE = 256 * 1024
+
+# --pack: rough token estimate used to fit the output into an LLM context window
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = 100_000
+# Budget kept free for the summary block; its file lists are cut to whatever is left
+PACK_SUMMARY_RESERVE = 200
+# Entry points, packed first and in this order (paths relative to the source directory)
+PACK_ENTRY_POINTS = [
+    'functions/index.js',
+    'public/js/studio.js',
+    'public/index.html',
+    'public/js/firebase-config.js',
+    'firebase.json',
+]
+# Lock files and minified bundles: packed last, only if the budget allows
+PACK_LOW_PRIORITY = ['package-lock.json', 'yarn.lock', '*.min.*', '*.map']
+# Rank of the remaining files by type (lower is packed first)
+PACK_TYPE_RANK = {'.js': 1, '.html': 1, '.json': 2, '.md': 3}
+
+
+def manifest_path_for(output_file):
+    """The manifest lives next to the output file"""
+    return output_file + ".manifest.json"
+
+
+def _encode(text):
+    """Encode like a text-mode file would (platform newlines, UTF-8)"""
+    return text.replace("\n", os.linesep).encode('utf-8')
+
+
+def _scan_file(file_path, entry=None):
+    """
+    Prefetch step run on the reader pool: stat, content hash and character count.
+
+    Streams the file in chunks, so nothing is held in memory. When stat matches
+    the manifest entry the file is not read at all. SIZE counts characters after
+    newline translation, exactly like reading the file in text mode would.
+    """
+    st = os.stat(file_path)
+    info = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+    if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+        info.update(sha1=entry["sha1"], chars=None)
+        return info
+
+    sha1 = hashlib.sha1()
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+    chars = 0
+    with open(file_path, 'rb') as infile:
+        while True:
+            chunk = infile.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            sha1.update(chunk)
+            chars += len(decoder.decode(chunk))
+    chars += len(decoder.decode(b"", final=True))
+    info.update(sha1=sha1.hexdigest(), chars=chars)
+    return info
+
+
+def _copy_chunks(src, dst, length):
+    """Copies length bytes from src's current position to dst without loading them at once"""
+    while length > 0:
+        chunk = src.read(min(CHUNK_SIZE, length))
+        if not chunk:
+            break
+        dst.write(chunk)
+        length -= len(chunk)
+
+
+def _stream_text(file_path, outfile):
+    """Streams a file's text into the (binary) output the way a text-mode copy would"""
+    with open(file_path, 'r', encoding='utf-8') as infile:
+        while True:
+            chunk = infile.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            outfile.write(_encode(chunk))
+
+
+def _compile_ignore_pattern(pattern):
     """
-    Collects all HTML, JS, JSON, MD files from specific folders (public, function, docs) and their subdirectories
-    
+    Compiles a .gitignore / firebase.json style pattern.
+
+    Returns (regex, anchored, dir_only): anchored patterns (containing '/') match
+    the path relative to the rule's base directory, the others match the name.
+    """
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    anchored = "/" in pattern
+    prefix = ""
+    if pattern.startswith("**/"):
+        pattern = pattern[3:]
+        prefix = "(?:.*/)?"
+    regex = re.compile(prefix + fnmatch.translate(pattern.lstrip("/")))
+    return regex, anchored, dir_only
+
+
+def load_ignore_rules(source_directory, include_gitignore=True):
+    """
+    Loads ignore rules from .gitignore and the hosting/functions "ignore" lists in firebase.json
+
+    Args:
+        source_directory (str): Project root (where .gitignore and firebase.json live)
+        include_gitignore (bool): False to only use the firebase.json ignore lists
+
+    Returns:
+        list: (base_dir, compiled patterns) pairs, base_dir being an absolute path
+    """
+    source_directory = os.path.abspath(source_directory)
+    rules = []
+
+    patterns = []
+    if include_gitignore:
+        try:
+            with open(os.path.join(source_directory, ".gitignore"), 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    # Negated patterns ("!keep.me") are not supported and skipped
+                    if line and not line.startswith(("#", "!")):
+                        patterns.append(line)
+        except OSError:
+            pass
+    if patterns:
+        rules.append((source_directory, patterns))
+
+    try:
+        with open(os.path.join(source_directory, "firebase.json"), 'r', encoding='utf-8') as f:
+            cfg = json.load(f)
+    except (OSError, ValueError):
+        cfg = {}
+    for key, default_base in (("hosting", "public"), ("functions", "functions")):
+        entries = cfg.get(key) or []
+        for entry in entries if isinstance(entries, list) else [entries]:
+            base = entry.get("public" if key == "hosting" else "source", default_base)
+            if entry.get("ignore"):
+                rules.append((os.path.join(source_directory, base), entry["ignore"]))
+
+    return [(os.path.normpath(base), [_compile_ignore_pattern(p) for p in pats]) for base, pats in rules]
+
+
+def is_ignored(abs_path, is_dir, ignore_rules):
+    """Checks an absolute path against the rules returned by load_ignore_rules"""
+    name = os.path.basename(abs_path)
+    for base, patterns in ignore_rules:
+        if not abs_path.startswith(base + os.sep):
+            continue
+        rel = abs_path[len(base) + 1:].replace(os.sep, "/")
+        for regex, anchored, dir_only in patterns:
+            if dir_only and not is_dir:
+                continue
+            if anchored:
+                if regex.match(rel) or (is_dir and regex.match(rel + "/")):
+                    return True
+            elif regex.match(name):
+                return True
+    return False
+
+
+def walk_folder(folder_path, file_extensions, ignore_rules=()):
+    """
+    Single os.scandir walk of a folder matching all extensions at once.
+
+    Like glob, hidden files and directories are skipped; ignored directories are
+    pruned without being descended into.
+
+    Returns:
+        tuple: (paths ordered per extension then sorted, walk stats dict)
+    """
+    start = time.perf_counter()
+    suffixes = [os.path.normcase(ext.lstrip("*")) for ext in file_extensions]
+    matches = {suffix: [] for suffix in suffixes}
+    stats = {"dirs": 0, "files": 0, "matched": 0, "ignored": 0}
+
+    stack = [(folder_path, os.path.abspath(folder_path))]
+    while stack:
+        dir_path, abs_dir = stack.pop()
+        stats["dirs"] += 1
+        try:
+            entries = os.scandir(dir_path)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(".") or name in ALWAYS_IGNORED:
+                    stats["ignored"] += 1
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                abs_path = os.path.join(abs_dir, name)
+                if ignore_rules and is_ignored(abs_path, is_dir, ignore_rules):
+                    stats["ignored"] += 1
+                    continue
+                if is_dir:
+                    stack.append((entry.path, abs_path))
+                    continue
+                stats["files"] += 1
+                suffix = os.path.normcase(os.path.splitext(name)[1])
+                if suffix in matches:
+                    matches[suffix].append(entry.path)
+                    stats["matched"] += 1
+
+    stats["seconds"] = time.perf_counter() - start
+    return [path for suffix in suffixes for path in sorted(matches[suffix])], stats
+
+
+def _matches_any(rel_path, patterns):
+    return any(fnmatch.fnmatch(rel_path, pattern) for pattern in patterns)
+
+
+def _iter_candidate_files(source_directory, target_folders, file_extensions, verbose=True,
+                          include=None, exclude=None):
+    """
+    Yields (folder_name, file_path) in output order: per folder, per extension, sorted.
+
+    A (folder_name, None) marker precedes the files of every folder that exists.
+    include / exclude are glob patterns on the path relative to source_directory
+    (with '/' separators), e.g. 'public/js/*' or '*.min.js'.
+    """
+    ignore_rules = load_ignore_rules(source_directory)
+    source_abs = os.path.abspath(source_directory)
+    for folder_name in target_folders:
+        folder_path = os.path.join(source_directory, folder_name)
+
+        # Check if folder exists
+        if not os.path.exists(folder_path) or not os.path.isdir(folder_path):
+            if verbose:
+                print(f"Warning: Folder '{folder_name}' not found in {source_directory}")
+            continue
+
+        files, stats = walk_folder(folder_path, file_extensions, ignore_rules)
+        if verbose:
+            print(f"Searching in folder: {folder_path} "
+                  f"({stats['dirs']} dirs, {stats['files']} files, {stats['matched']} matched, "
+                  f"{stats['ignored']} ignored, walked in {stats['seconds'] * 1000:.1f} ms)")
+        yield folder_name, None
+
+        for file_path in files:
+            if include or exclude:
+                rel = os.path.relpath(os.path.abspath(file_path), source_abs).replace(os.sep, '/')
+                if (include and not _matches_any(rel, include)) or (exclude and _matches_any(rel, exclude)):
+                    continue
+            yield folder_name, file_path
+
+
+def _render_header(file_path, folder_name, chars, extra=""):
+    """Header with full path; the file content and a blank line follow it"""
+    return ("\n" + "=" * 120 + "\n"
+            f"FILE: {os.path.abspath(file_path)}\n"
+            f"TYPE: {Path(file_path).suffix}\n"
+            f"SIZE: {chars} characters\n"
+            f"FOLDER: {folder_name}\n"
+            + extra
+            + "=" * 120 + "\n\n")
+
+
+def _render_error(file_path, folder_name, error):
+    return ("\n" + "=" * 120 + "\n"
+            f"FILE: {os.path.abspath(file_path)}\n"
+            f"ERROR reading file: {str(error)}\n"
+            f"FOLDER: {folder_name}\n"
+            + "=" * 120 + "\n\n")
+
+
+def load_manifest(output_file, options):
+    """
+    Loads the cache manifest of a previous run.
+
+    The manifest is only trusted when it was written with the same options and
+    the output file is still exactly the one it describes (same size and mtime),
+    since cached sections are copied out of that file by byte offset.
+    """
+    try:
+        with open(manifest_path_for(output_file), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        st = os.stat(output_file)
+    except (OSError, ValueError):
+        return {}
+    if (manifest.get("version") != MANIFEST_VERSION or manifest.get("options") != options
+            or manifest.get("output_size") != st.st_size
+            or manifest.get("output_mtime_ns") != st.st_mtime_ns):
+        return {}
+    return manifest.get("files", {})
+
+
+def collect_files_to_txt(source_directory, output_file="collected_files.txt", use_cache=True, jobs=DEFAULT_JOBS,
+                         target_folders=None, file_extensions=None, include=None, exclude=None):
+    """
+    Collects all HTML, JS, JSON, MD files from specific folders (public, functions, docs) and their subdirectories,
+    skipping node_modules, .git and whatever .gitignore / firebase.json ignore
+
+    Unchanged files (same mtime and size, or same content hash) are not re-rendered:
+    their sections are copied from the previous output using the manifest written
+    next to it (<output_file>.manifest.json). Files are prefetched by a pool of
+    reader threads and streamed into the output in deterministic order.
+
     Args:
         source_directory (str): Path to the source directory
         output_file (str): Name of the output file
+        use_cache (bool): Reuse sections of the previous run where possible
+        jobs (int): Number of reader threads
+        target_folders (list): Folders to search (default TARGET_FOLDERS)
+        file_extensions (list): Patterns such as '*.js' (default FILE_EXTENSIONS)
+        include (list): Only collect paths matching one of these globs
+        exclude (list): Skip paths matching one of these globs
+
+    Returns:
+        dict: counts of files added / reused from cache / re-read
     """
-    
-    # File extensions to collect
-    file_extensions = ['*.html', '*.js', '*.json', '*.md']
-    
-    # Specific folders to search in
-    target_folders = ['public', 'function', 'docs']
-    
-    # Open output file for writing
-    with open(output_file, 'w', encoding='utf-8') as outfile:
-        outfile.write("=" * 80 + "\n")
-        outfile.write("COLLECTED FILES\n")
-        outfile.write(f"From directory: {os.path.abspath(source_directory)}\n")
-        outfile.write(f"Target folders: {', '.join(target_folders)}\n")
-        outfile.write("=" * 80 + "\n\n")
-        
-        files_found = 0
-        folders_found = []
-        
-        # Search in each target folder
-        for folder_name in target_folders:
-            folder_path = os.path.join(source_directory, folder_name)
-            
-            # Check if folder exists
-            if not os.path.exists(folder_path) or not os.path.isdir(folder_path):
-                print(f"Warning: Folder '{folder_name}' not found in {source_directory}")
-                continue
-            
-            folders_found.append(folder_name)
-            print(f"Searching in folder: {folder_path}")
-            
-            # Collect files by extension from this folder
-            for extension in file_extensions:
-                # Recursive search in this folder and its subdirectories
-                pattern = os.path.join(folder_path, "**", extension)
-                files = glob.glob(pattern, recursive=True)
-                
-                for file_path in sorted(files):
+
+    file_extensions = list(file_extensions or FILE_EXTENSIONS)
+    target_folders = list(target_folders or TARGET_FOLDERS)
+    options = {
+        "source": os.path.abspath(source_directory),
+        "folders": target_folders,
+        "extensions": file_extensions,
+        "include": list(include or []),
+        "exclude": list(exclude or []),
+    }
+
+    cached = load_manifest(output_file, options) if use_cache else {}
+    new_manifest = {}
+    stats = {"files": 0, "reused": 0, "read": 0, "errors": 0}
+
+    # Write to a temp file (cached sections are copied out of the old output)
+    tmp_file = output_file + ".tmp"
+    old_output = open(output_file, 'rb') if cached else None
+    try:
+        with open(tmp_file, 'wb') as outfile:
+            outfile.write(_encode("=" * 80 + "\n"))
+            outfile.write(_encode("COLLECTED FILES\n"))
+            outfile.write(_encode(f"From directory: {os.path.abspath(source_directory)}\n"))
+            outfile.write(_encode(f"Target folders: {', '.join(target_folders)}\n"))
+            outfile.write(_encode("=" * 80 + "\n\n"))
+
+            folders_found = []
+            candidates = []
+            for folder_name, file_path in _iter_candidate_files(source_directory, target_folders, file_extensions,
+                                                                include=include, exclude=exclude):
+                if file_path is None:
+                    folders_found.append(folder_name)
+                else:
+                    candidates.append((folder_name, file_path, os.path.abspath(file_path)))
+
+            with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+                # Bounded look-ahead: the pool stays a few files ahead of the writer
+                window = deque()
+                pending = iter(candidates)
+                for folder_name, file_path, abs_path in pending:
+                    window.append((folder_name, file_path, abs_path,
+                                   pool.submit(_scan_file, file_path, cached.get(abs_path))))
+                    if len(window) >= jobs * 4:
+                        break
+
+                while window:
+                    folder_name, file_path, abs_path, future = window.popleft()
+                    for next_folder, next_path, next_abs in pending:
+                        window.append((next_folder, next_path, next_abs,
+                                       pool.submit(_scan_file, next_path, cached.get(next_abs))))
+                        break
+
+                    entry = cached.get(abs_path)
                     try:
-                        # Read file content
-                        with open(file_path, 'r', encoding='utf-8') as infile:
-                            content = infile.read()
-                        
-                        # Create header with full path
-                        outfile.write("\n" + "=" * 120 + "\n")
-                        outfile.write(f"FILE: {os.path.abspath(file_path)}\n")
-                        outfile.write(f"TYPE: {Path(file_path).suffix}\n")
-                        outfile.write(f"SIZE: {len(content)} characters\n")
-                        outfile.write(f"FOLDER: {folder_name}\n")
-                        outfile.write("=" * 120 + "\n\n")
-                        
-                        # Write file content
-                        outfile.write(content)
-                        outfile.write("\n\n")
-                        
-                        files_found += 1
-                        print(f"Added: {file_path}")
-                        
+                        info = future.result()
                     except Exception as e:
                         # Handle errors (unreadable files, encoding issues, etc.)
-                        outfile.write("\n" + "=" * 120 + "\n")
-                        outfile.write(f"FILE: {os.path.abspath(file_path)}\n")
-                        outfile.write(f"ERROR reading file: {str(e)}\n")
-                        outfile.write(f"FOLDER: {folder_name}\n")
-                        outfile.write("=" * 120 + "\n\n")
+                        outfile.write(_encode(_render_error(file_path, folder_name, e)))
+                        stats["errors"] += 1
                         print(f"Error with file {file_path}: {str(e)}")
-        
-        # Summary at the end
-        outfile.write("\n" + "=" * 80 + "\n")
-        outfile.write(f"SUMMARY: {files_found} files added\n")
-        outfile.write(f"Folders searched: {', '.join(folders_found)}\n")
-        outfile.write("=" * 80 + "\n")
-    
+                        continue
+
+                    offset = outfile.tell()
+                    try:
+                        if entry and entry["sha1"] == info["sha1"]:
+                            old_output.seek(entry["offset"])
+                            _copy_chunks(old_output, outfile, entry["length"])
+                            stats["reused"] += 1
+                        else:
+                            outfile.write(_encode(_render_header(file_path, folder_name, info["chars"])))
+                            _stream_text(file_path, outfile)
+                            outfile.write(_encode("\n\n"))
+                            stats["read"] += 1
+                    except Exception as e:
+                        print(f"Error with file {file_path}: {str(e)}")
+                        stats["errors"] += 1
+                        continue
+
+                    new_manifest[abs_path] = {
+                        "mtime_ns": info["mtime_ns"],
+                        "size": info["size"],
+                        "sha1": info["sha1"],
+                        "offset": offset,
+                        "length": outfile.tell() - offset,
+                    }
+                    stats["files"] += 1
+                    print(f"Added: {file_path}")
+
+            # Summary at the end
+            outfile.write(_encode("\n" + "=" * 80 + "\n"))
+            outfile.write(_encode(f"SUMMARY: {stats['files']} files added\n"))
+            outfile.write(_encode(f"Folders searched: {', '.join(folders_found)}\n"))
+            outfile.write(_encode("=" * 80 + "\n"))
+    finally:
+        if old_output:
+            old_output.close()
+
+    os.replace(tmp_file, output_file)
+    st = os.stat(output_file)
+    with open(manifest_path_for(output_file), 'w', encoding='utf-8') as f:
+        json.dump({
+            "version": MANIFEST_VERSION,
+            "options": options,
+            "output_size": st.st_size,
+            "output_mtime_ns": st.st_mtime_ns,
+            "files": new_manifest,
+        }, f, indent=1)
+
     print(f"\nCompleted! Created file: {output_file}")
-    print(f"Total files: {files_found}")
+    print(f"Total files: {stats['files']} ({stats['reused']} from cache, {stats['read']} re-read)")
     print(f"Folders found: {', '.join(folders_found) if folders_found else 'None'}")
+    return stats
+
+
+def estimate_tokens(text):
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+# Strings are matched first so comment markers inside them ("https://...") are kept
+_JS_COMMENT_RE = re.compile(r"""("(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)|/\*.*?\*/|//[^\n]*""", re.S)
+_HTML_COMMENT_RE = re.compile(r"<!--(?!\[if).*?-->", re.S)
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+
+def strip_content(text, suffix):
+    """Drops comments and redundant whitespace; content that can't be parsed is only trimmed"""
+    if suffix == '.json':
+        try:
+            return json.dumps(json.loads(text), ensure_ascii=False, separators=(',', ':'))
+        except ValueError:
+            pass
+    elif suffix == '.js':
+        text = _JS_COMMENT_RE.sub(lambda m: m.group(1) or "", text)
+    elif suffix == '.html':
+        text = _HTML_COMMENT_RE.sub("", text)
+    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    return _BLANK_LINES_RE.sub("\n\n", text).strip("\n")
+
+
+def pack_rank(rel_path):
+    """Sort key for --pack: entry points, then code, data, docs, and lock/minified files last"""
+    name = rel_path.rsplit('/', 1)[-1]
+    if rel_path in PACK_ENTRY_POINTS:
+        return (0, PACK_ENTRY_POINTS.index(rel_path), rel_path)
+    if any(fnmatch.fnmatch(name, pattern) for pattern in PACK_LOW_PRIORITY):
+        return (9, 0, rel_path)
+    return (PACK_TYPE_RANK.get(Path(name).suffix, 5), rel_path.count('/'), rel_path)
+
+
+def _dedup_key(text, suffix):
+    """Whitespace-insensitive form used to spot identical files (JSON is compared canonically)"""
+    if suffix == '.json':
+        try:
+            return json.dumps(json.loads(text), ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        except ValueError:
+            pass
+    return "\n".join(line.rstrip() for line in text.strip().splitlines())
+
+
+def _load_for_pack(file_path, strip):
+    """One read per file: content (optionally stripped) and the hash duplicates are found by"""
+    with open(file_path, 'r', encoding='utf-8') as infile:
+        content = infile.read()
+    sha1 = hashlib.sha1(_dedup_key(content, Path(file_path).suffix).encode('utf-8')).hexdigest()
+    if strip:
+        content = strip_content(content, Path(file_path).suffix)
+    return content, sha1
+
+
+def pack_files_to_txt(source_directory, output_file="collected_files.txt",
+                      token_budget=DEFAULT_TOKEN_BUDGET, strip=False, jobs=DEFAULT_JOBS,
+                      target_folders=None, file_extensions=None, include=None, exclude=None):
+    """
+    LLM-ready variant of collect_files_to_txt: the output fits in token_budget tokens.
+
+    Files are ranked (entry points first, lock files and minified bundles last),
+    identical files are emitted once, and files are added in rank order while they
+    still fit. Each file is read exactly once. Sections keep the usual header
+    plus an estimated TOKENS line.
+
+    Args:
+        source_directory (str): Path to the source directory
+        output_file (str): Name of the output file
+        token_budget (int): Maximum estimated tokens of the whole output
+        strip (bool): Remove comments / redundant whitespace (JSON is minified)
+        jobs (int): Number of reader threads
+        target_folders, file_extensions, include, exclude: as for collect_files_to_txt
+
+    Returns:
+        dict: packed / duplicate / omitted / error counts and the estimated tokens
+    """
+    source_abs = os.path.abspath(source_directory)
+    target_folders = list(target_folders or TARGET_FOLDERS)
+    folders_found = []
+    candidates = []
+    for folder_name, file_path in _iter_candidate_files(source_directory, target_folders,
+                                                        file_extensions or FILE_EXTENSIONS,
+                                                        include=include, exclude=exclude):
+        if file_path is None:
+            folders_found.append(folder_name)
+            continue
+        rel = os.path.relpath(os.path.abspath(file_path), source_abs).replace(os.sep, '/')
+        candidates.append((pack_rank(rel), rel, folder_name, file_path))
+    candidates.sort()
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        loaded = list(pool.map(lambda c: _try(_load_for_pack, c[3], strip), candidates))
+
+    banner = ("=" * 80 + "\n"
+              "COLLECTED FILES (packed)\n"
+              f"From directory: {source_abs}\n"
+              f"Target folders: {', '.join(target_folders)}\n"
+              f"Token budget: {token_budget}\n"
+              + "=" * 80 + "\n\n")
+    used = estimate_tokens(banner)
+    sections, duplicates, omitted, errors = [], [], [], []
+    seen = {}
+    for (_, rel, folder_name, file_path), (result, error) in zip(candidates, loaded):
+        if error:
+            errors.append(f"{rel} ({error})")
+            continue
+        content, sha1 = result
+        if sha1 in seen:
+            duplicates.append(f"{rel} = {seen[sha1]}")
+            continue
+        tokens = estimate_tokens(content)
+        section = (_render_header(file_path, folder_name, len(content), f"TOKENS: ~{tokens}\n")
+                   + content + "\n\n")
+        section_tokens = estimate_tokens(section)
+        if used + section_tokens + PACK_SUMMARY_RESERVE > token_budget:
+            omitted.append(f"{rel} (~{tokens} tokens)")
+            continue
+        seen[sha1] = rel
+        used += section_tokens
+        sections.append(section)
+        print(f"Packed: {rel} (~{tokens} tokens)")
+
+    summary, used = _pack_summary(len(sections), used, token_budget, folders_found,
+                                  (("Duplicates skipped", duplicates), ("Omitted (over budget)", omitted),
+                                   ("Errors", errors)))
+
+    with open(output_file, 'w', encoding='utf-8') as outfile:
+        outfile.write(banner)
+        outfile.writelines(sections)
+        outfile.write(summary)
+
+    print(f"\nCompleted! Created file: {output_file}")
+    print(f"Packed {len(sections)} files, ~{used} of {token_budget} tokens "
+          f"({len(duplicates)} duplicates, {len(omitted)} omitted, {len(errors)} errors)")
+    return {"files": len(sections), "duplicates": len(duplicates), "omitted": len(omitted),
+            "errors": len(errors), "tokens": used}
+
+
+def _pack_summary(files, used, token_budget, folders_found, groups):
+    """
+    The closing summary of a pack, listing as many of each group's items as still fit the budget.
+
+    Args:
+        files (int): Number of packed files
+        used (int): Estimated tokens of everything written before the summary
+        token_budget (int): Budget of the whole output
+        folders_found (list): Folders that were searched
+        groups: (title, items) pairs; items that don't fit become "... and N more"
 
-def main():
+    Returns:
+        tuple: (summary text, estimated tokens of the whole output including it)
+    """
+    rule = "=" * 80 + "\n"
+    # the real total has no more digits than the budget, so this never underestimates
+    head = "\n" + rule + "SUMMARY: {files} files packed, ~{total} tokens of {budget}\n"
+    head += f"Folders searched: {', '.join(folders_found)}\n"
+    room = (token_budget - used) * CHARS_PER_TOKEN
+    length = len(head.format(files=files, total=token_budget, budget=token_budget)) + len(rule)
+    body = []
+    for title, items in groups:
+        if not items:
+            continue
+        body.append(f"{title}:\n")
+        length += len(body[-1])
+        for i, item in enumerate(items):
+            line = f"  {item}\n"
+            more = f"  ... and {len(items) - i} more\n" if i + 1 < len(items) else ""
+            if length + len(line) + len(more) > room:
+                body.append(f"  ... and {len(items) - i} more\n")
+                length += len(body[-1])
+                break
+            body.append(line)
+            length += len(line)
+    total = used + -(-length // CHARS_PER_TOKEN)
+    return head.format(files=files, total=total, budget=token_budget) + "".join(body) + rule, total
+
+
+def _try(func, *args):
+    """(result, None) or (None, error) - lets pool.map carry per-file errors"""
+    try:
+        return func(*args), None
+    except Exception as e:
+        return None, str(e)
+
+
+def collect(source_directory=".", target_folders=None, file_extensions=None, include=None, exclude=None,
+            jobs=DEFAULT_JOBS):
+    """
+    Library API: finds and scans the files without writing any output.
+
+    Returns:
+        dict: {"source", "folders_found", "files", "errors", "seconds"} where every
+        file record has path (absolute), rel_path, folder, type, bytes, chars,
+        sha1 and mtime_ns, and every error record has path, rel_path, folder, error.
+        Content is not included; read it from "path" when needed.
+    """
+    start = time.perf_counter()
+    source_abs = os.path.abspath(source_directory)
+    folders_found = []
+    candidates = []
+    for folder_name, file_path in _iter_candidate_files(source_directory, target_folders or TARGET_FOLDERS,
+                                                        file_extensions or FILE_EXTENSIONS, verbose=False,
+                                                        include=include, exclude=exclude):
+        if file_path is None:
+            folders_found.append(folder_name)
+        else:
+            candidates.append((folder_name, os.path.abspath(file_path)))
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        scanned = list(pool.map(lambda c: _try(_scan_file, c[1]), candidates))
+
+    files, errors = [], []
+    for (folder_name, abs_path), (info, error) in zip(candidates, scanned):
+        record = {
+            "path": abs_path,
+            "rel_path": os.path.relpath(abs_path, source_abs).replace(os.sep, '/'),
+            "folder": folder_name,
+        }
+        if error:
+            record["error"] = error
+            errors.append(record)
+            continue
+        record.update({
+            "type": Path(abs_path).suffix,
+            "bytes": info["size"],
+            "chars": info["chars"],
+            "sha1": info["sha1"],
+            "mtime_ns": info["mtime_ns"],
+        })
+        files.append(record)
+
+    return {
+        "source": source_abs,
+        "folders_found": folders_found,
+        "files": files,
+        "errors": errors,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def write_jsonl(result, output_file):
+    """One JSON record per line: the collect() record plus "content" (errors keep "error")"""
+    with open(output_file, 'w', encoding='utf-8') as outfile:
+        for record in result["files"]:
+            try:
+                with open(record["path"], 'r', encoding='utf-8') as infile:
+                    content = infile.read()
+                line = dict(record, content=content)
+            except Exception as e:
+                line = dict(record, error=str(e))
+            outfile.write(json.dumps(line, ensure_ascii=False) + "\n")
+        for record in result["errors"]:
+            outfile.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def write_bundle(result, output_file, fmt):
+    """
+    Writes a tar (gzip-compressed for .tar.gz/.tgz) or zip bundle of the collected files.
+
+    Files are stored under their relative paths, next to a MANIFEST.jsonl with
+    the collect() records (no content).
+    """
+    manifest = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in result["files"] + result["errors"])
+    manifest = manifest.encode('utf-8')
+    if fmt == "zip":
+        with zipfile.ZipFile(output_file, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+            for record in result["files"]:
+                bundle.write(record["path"], record["rel_path"])
+            bundle.writestr("MANIFEST.jsonl", manifest)
+    else:
+        mode = "w:gz" if output_file.endswith((".tar.gz", ".tgz")) else "w"
+        with tarfile.open(output_file, mode) as bundle:
+            for record in result["files"]:
+                bundle.add(record["path"], record["rel_path"], recursive=False)
+            info = tarfile.TarInfo("MANIFEST.jsonl")
+            info.size = len(manifest)
+            info.mtime = int(time.time())
+            bundle.addfile(info, io.BytesIO(manifest))
+
+
+def _tree_signature(source_directory, target_folders=None, file_extensions=None, include=None, exclude=None):
+    """Cheap change detector for --watch: (path, mtime, size) of every candidate file"""
+    signature = []
+    for _, file_path in _iter_candidate_files(source_directory, target_folders or TARGET_FOLDERS,
+                                              file_extensions or FILE_EXTENSIONS, verbose=False,
+                                              include=include, exclude=exclude):
+        if file_path is None:
+            continue
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            continue
+        signature.append((file_path, st.st_mtime_ns, st.st_size))
+    return signature
+
+
+def watch(source_directory, output_file, interval=1.0, jobs=DEFAULT_JOBS, **selection):
+    """Re-collects incrementally whenever a collected file is added, removed or changed"""
+    print(f"\nWatching {os.path.abspath(source_directory)} (Ctrl+C to stop)...")
+    last = None
+    try:
+        while True:
+            signature = _tree_signature(source_directory, **selection)
+            if signature != last:
+                if last is not None:
+                    start = time.perf_counter()
+                    collect_files_to_txt(source_directory, output_file, jobs=jobs, **selection)
+                    print(f"Updated {output_file} in {time.perf_counter() - start:.2f}s")
+                last = signature
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+DEFAULT_OUTPUTS = {
+    "txt": "collected_files.txt",
+    "jsonl": "collected_files.jsonl",
+    "tar": "collected_files.tar.gz",
+    "zip": "collected_files.zip",
+}
+
+
+def _split_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()] if value else None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Collect project files into one text file (or a JSONL / tar / zip bundle)",
+        epilog="Without arguments on an interactive terminal, the source directory and output file are prompted for.")
+    parser.add_argument("source", nargs="?", help="source directory (default: current directory)")
+    parser.add_argument("-o", "--output", help="output file (default depends on --format)")
+    parser.add_argument("--folders", help=f"comma-separated folders to search (default: {','.join(TARGET_FOLDERS)})")
+    parser.add_argument("--ext", help="comma-separated extensions (default: html,js,json,md)")
+    parser.add_argument("--include", action="append", metavar="GLOB",
+                        help="only collect matching relative paths (repeatable)")
+    parser.add_argument("--exclude", action="append", metavar="GLOB",
+                        help="skip matching relative paths (repeatable)")
+    parser.add_argument("--format", choices=sorted(DEFAULT_OUTPUTS), default="txt", help="output format")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_JOBS, help="reader threads")
+    parser.add_argument("--watch", action="store_true", help="keep running and update the output on change")
+    parser.add_argument("--interval", type=float, default=1.0, help="--watch polling interval in seconds")
+    parser.add_argument("--no-cache", action="store_true", help="ignore the manifest and rebuild everything")
+    parser.add_argument("--pack", action="store_true", help="LLM-ready output that fits in --budget tokens")
+    parser.add_argument("--budget", type=int, default=DEFAULT_TOKEN_BUDGET, help="token budget for --pack")
+    parser.add_argument("--strip", action="store_true", help="with --pack: drop comments and redundant whitespace")
+    args = parser.parse_args(argv)
+    if args.format != "txt" and (args.watch or args.pack):
+        parser.error("--watch and --pack only support --format txt")
+    return args
+
+
+def main(argv=None):
     """Main function to run the script"""
-    
-    # Set source directory (current directory as default)
-    source_dir = input("Enter directory path (or Enter for current directory): ").strip()
-    if not source_dir:
-        source_dir = "."
-    
+
+    interactive = (argv is None and len(sys.argv) == 1) and sys.stdin.isatty()
+    args = parse_args(argv)
+
+    source_dir = args.source
+    output_filename = args.output
+    if interactive:
+        # Set source directory (current directory as default)
+        source_dir = input("Enter directory path (or Enter for current directory): ").strip()
+        # Set output filename
+        output_filename = input("Enter output filename (or Enter for default 'collected_files.txt'): ").strip()
+    source_dir = source_dir or "."
+    output_filename = output_filename or DEFAULT_OUTPUTS[args.format]
+
     # Check if directory exists
     if not os.path.exists(source_dir):
         print(f"Error: Directory {source_dir} does not exist")
-        return
-    
-    # Set output filename
-    output_filename = input("Enter output filename (or Enter for default 'collected_files.txt'): ").strip()
-    if not output_filename:
-        output_filename = "collected_files.txt"
-    
+        return 1
+
+    selection = {
+        "target_folders": _split_list(args.folders),
+        "file_extensions": [f"*.{ext.lstrip('*.')}" for ext in _split_list(args.ext) or []] or None,
+        "include": args.include,
+        "exclude": args.exclude,
+    }
+
     print(f"\nStarting file collection from: {os.path.abspath(source_dir)}")
-    print("Looking for files: .html, .js, .json, .md")
+    print(f"Looking for files: {', '.join(p.lstrip('*') for p in selection['file_extensions'] or FILE_EXTENSIONS)}")
     print("-" * 50)
-    
+
     # Run the function
-    collect_files_to_txt(source_dir, output_filename)
+    if args.format in ("jsonl", "tar", "zip"):
+        result = collect(source_dir, jobs=args.jobs, **selection)
+        if args.format == "jsonl":
+            write_jsonl(result, output_filename)
+        else:
+            write_bundle(result, output_filename, args.format)
+        print(f"Completed! Created file: {output_filename}")
+        print(f"Total files: {len(result['files'])} ({len(result['errors'])} errors) "
+              f"in {result['seconds']:.2f}s")
+        return 1 if result["errors"] else 0
+
+    if args.pack:
+        stats = pack_files_to_txt(source_dir, output_filename, args.budget, strip=args.strip,
+                                  jobs=args.jobs, **selection)
+        return 1 if stats["errors"] else 0
+
+    stats = collect_files_to_txt(source_dir, output_filename, use_cache=not args.no_cache,
+                                 jobs=args.jobs, **selection)
+
+    if args.watch:
+        watch(source_dir, output_filename, args.interval, jobs=args.jobs, **selection)
+    return 1 if stats["errors"] else 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""
+Minimal asyncio client for the Firestore emulator's REST API (stdlib only).
+
+Shared by seed_firestore.py and firestore_snapshot.py: value encoding to
+Firestore's typed JSON, a keep-alive JSON-over-HTTP connection, batched commits
+and paged reads. load_test.py reuses the project lookup and response reader.
+"""
+import os
+import json
+import base64
+import asyncio
+import datetime
+import urllib.error
+import urllib.request
+
+FIRESTORE_PORT = 8080
+HUB_PORT = 4400
+DATABASE = "(default)"
+# Largest write batch the commit endpoint takes
+MAX_BATCH = 500
+# Emulator-only credential that bypasses security rules
+OWNER_AUTH = "Bearer owner"
+
+
+def project_id(project_dir="."):
+    """Default project from .firebaserc (the emulators keep data and serve callables per project)"""
+    try:
+        with open(os.path.join(project_dir, ".firebaserc"), 'r', encoding='utf-8') as f:
+            return json.load(f)["projects"]["default"]
+    except (OSError, ValueError, KeyError):
+        return "demo-project"
+
+
+def encode_value(value):
+    """Python value -> Firestore REST Value"""
+    if value is None:
+        return {"nullValue": None}
+    if isinstance(value, bool):
+        return {"booleanValue": value}
+    if isinstance(value, int):
+        return {"integerValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return {"timestampValue": value.astimezone(datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")}
+    if isinstance(value, bytes):
+        return {"bytesValue": base64.b64encode(value).decode('ascii')}
+    if isinstance(value, dict):
+        return {"mapValue": {"fields": {k: encode_value(v) for k, v in value.items()}}}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [encode_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+def encode_fields(doc):
+    return {k: encode_value(v) for k, v in doc.items()}
+
+
+async def read_response(reader):
+    """
+    Reads one HTTP/1.1 response (content-length or chunked body) from a keep-alive stream.
+
+    Returns:
+        tuple: (HTTP status, body bytes, True if the server is closing the connection)
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed by the emulator")
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode('latin-1').partition(":")
+        headers[key.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        payload = b"".join(chunks)
+    else:
+        payload = await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, payload, headers.get("connection", "").lower() == "close"
+
+
+class EmulatorClient:
+    """One keep-alive HTTP/1.1 connection to the Firestore emulator, speaking JSON"""
+
+    def __init__(self, project, port=FIRESTORE_PORT, host="localhost", database=DATABASE):
+        self.project, self.port, self.host = project, port, host
+        self.root = f"projects/{project}/databases/{database}"
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None, timeout=120.0):
+        """
+        Sends one request on the connection, reconnecting if the emulator closed it.
+
+        Returns:
+            tuple: (HTTP status, decoded JSON body or None)
+        """
+        for attempt in (1, 2):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), timeout)
+            data = b"" if body is None else json.dumps(body, separators=(',', ':')).encode('utf-8')
+            head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                    f"Authorization: {OWNER_AUTH}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\nConnection: keep-alive\r\n\r\n")
+            try:
+                self.writer.write(head.encode('latin-1') + data)
+                status, payload = await asyncio.wait_for(self._response(), timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # stale keep-alive connection: retry once on a fresh one
+                await self.close()
+                if attempt == 2:
+                    raise
+                continue
+            except BaseException:
+                await self.close()
+                raise
+            return status, json.loads(payload) if payload.strip() else None
+
+    async def _response(self):
+        status, payload, closing = await read_response(self.reader)
+        if closing:
+            await self.close()
+        return status, payload
+
+    async def commit(self, writes):
+        """Applies up to MAX_BATCH writes atomically; raises RuntimeError on failure"""
+        status, body = await self.request("POST", f"/v1/{self.root}/documents:commit", {"writes": writes})
+        if status != 200:
+            raise RuntimeError(f"commit failed ({status}): {(body or {}).get('error', {}).get('message', body)}")
+        return body
+
+    async def set_documents(self, collection, docs):
+        """Writes [(doc id, python dict)] into collection in one commit"""
+        return await self.commit([
+            {"update": {"name": f"{self.root}/documents/{collection}/{doc_id}", "fields": encode_fields(doc)}}
+            for doc_id, doc in docs])
+
+    async def query_after(self, collection, after=None, limit=300):
+        """
+        Documents of collection ordered by name, starting after the document named `after`.
+
+        Unlike page tokens, the cursor (a document name) stays valid across runs and restarts.
+        """
+        query = {"from": [{"collectionId": collection}],
+                 "orderBy": [{"field": {"fieldPath": "__name__"}, "direction": "ASCENDING"}],
+                 "limit": limit}
+        if after:
+            query["startAt"] = {"values": [{"referenceValue": after}], "before": False}
+        status, body = await self.request("POST", f"/v1/{self.root}/documents:runQuery", {"structuredQuery": query})
+        if status != 200:
+            raise RuntimeError(f"querying {collection} failed ({status}): {body}")
+        return [row["document"] for row in body or [] if "document" in row]
+
+    async def collection_ids(self):
+        """Names of the top-level collections"""
+        ids, token = [], None
+        while True:
+            body = {"pageSize": 300, **({"pageToken": token} if token else {})}
+            status, body = await self.request("POST", f"/v1/{self.root}/documents:listCollectionIds", body)
+            if status != 200:
+                raise RuntimeError(f"listing collections failed ({status}): {body}")
+            ids += (body or {}).get("collectionIds", [])
+            token = (body or {}).get("nextPageToken")
+            if not token:
+                return sorted(ids)
+
+
+def clear_database(project, port=FIRESTORE_PORT, database=DATABASE):
+    """Deletes every document in the emulator's database for project"""
+    url = f"http://localhost:{port}/emulator/v1/projects/{project}/databases/{database}/documents"
+    req = urllib.request.Request(url, method="DELETE")
+    with urllib.request.urlopen(req, timeout=120):
+        pass
+
+
+def export_snapshot(path, hub_port=HUB_PORT):
+    """
+    Asks the emulator hub to write a regular emulator export (usable with
+    `firebase emulators:start --import <path>`) of everything that is running.
+    """
+    body = json.dumps({"path": os.path.abspath(path), "initiatedBy": "firestore_emulator.py"}).encode('utf-8')
+    req = urllib.request.Request(f"http://localhost:{hub_port}/_admin/export", data=body,
+                                 headers={"Content-Type": "application/json"}, method="POST")
+    try:
+        with urllib.request.urlopen(req, timeout=600):
+            pass
+    except urllib.error.HTTPError as e:
+        raise RuntimeError(f"emulator export failed ({e.code}): {e.read()[:200]!r}")
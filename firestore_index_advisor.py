@@ -0,0 +1,321 @@
+import os
+import re
+import sys
+import json
+import argparse
+
+FUNCTIONS_SOURCE = os.path.join("functions", "index.js")
+INDEXES_FILE = os.path.join("config", "firestore.indexes.json")
+
+# Expressions that mean "this project's database"; variables assigned from them are learned
+DEFAULT_DB_EXPRESSIONS = ("admin.firestore()", "getFirestore()")
+
+EQUALITY_OPS = ("==", "in")
+ARRAY_OPS = ("array-contains", "array-contains-any")
+RANGE_OPS = ("<", "<=", ">", ">=", "!=", "not-in")
+
+_STRING_RE = re.compile(r"""^\s*(['"`])((?:\\.|(?!\1).)*)\1\s*$""", re.S)
+_COLLECTION_RE = re.compile(r"\.(collection|collectionGroup)\s*\(")
+_ASSIGN_RE = re.compile(r"\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:await\s+)?$")
+_DB_VAR_RE = re.compile(r"\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*([\w$.]+\(\))\s*;")
+
+
+def _blank_comments(src):
+    """Replaces comments with spaces (newlines kept) so offsets and line numbers stay valid"""
+    out = []
+    i, n = 0, len(src)
+    while i < n:
+        c = src[i]
+        if c in "'\"`":
+            j = i + 1
+            while j < n and src[j] != c:
+                j += 2 if src[j] == "\\" else 1
+            out.append(src[i:j + 1])
+            i = j + 1
+        elif src.startswith("//", i):
+            j = src.find("\n", i)
+            j = n if j < 0 else j
+            out.append(" " * (j - i))
+            i = j
+        elif src.startswith("/*", i):
+            j = src.find("*/", i + 2)
+            j = n if j < 0 else j + 2
+            out.append(re.sub(r"[^\n]", " ", src[i:j]))
+            i = j
+        else:
+            out.append(c)
+            i += 1
+    return "".join(out)
+
+
+def _call_args(src, i):
+    """src[i] is '('; returns (list of raw argument strings, index past the ')')"""
+    depth, start, args = 0, i + 1, []
+    j = i
+    while j < len(src):
+        c = src[j]
+        if c in "'\"`":
+            k = j + 1
+            while k < len(src) and src[k] != c:
+                k += 2 if src[k] == "\\" else 1
+            j = k
+        elif c in "([{":
+            depth += 1
+        elif c in ")]}":
+            depth -= 1
+            if depth == 0:
+                args.append(src[start:j])
+                return [a for a in args if a.strip()], j + 1
+        elif c == "," and depth == 1:
+            args.append(src[start:j])
+            start = j + 1
+        j += 1
+    return args, j
+
+
+def _literal(arg):
+    m = _STRING_RE.match(arg)
+    return m.group(2) if m and (m.group(1) != "`" or "${" not in m.group(2)) else None
+
+
+def _method_chain(src, i):
+    """[(method, args)] for a `.a(...).b(...)` chain starting at src[i]"""
+    chain = []
+    while True:
+        m = re.compile(r"\s*\.\s*([A-Za-z_$][\w$]*)\s*\(").match(src, i)
+        if not m:
+            return chain
+        args, i = _call_args(src, m.end() - 1)
+        chain.append((m.group(1), args))
+
+
+def _receiver(src, dot):
+    """The expression just before `.collection(` (e.g. "admin.firestore()", "fireClassDb")"""
+    m = re.search(r"([\w$]+(?:\s*\.\s*[\w$]+)*(?:\(\))?)\s*$", src[:dot])
+    return re.sub(r"\s+", "", m.group(1)) if m else ""
+
+
+def extract_queries(source):
+    """
+    Statically finds Firestore queries in a JS source.
+
+    Follows `<db>.collection("x")` / `.collectionGroup("x")` chains, including ones
+    reached through a variable holding the collection reference. Only string-literal
+    collection names, fields and operators are understood.
+
+    Returns:
+        list: dicts with collection, scope, database ("default" or the receiver
+              expression), line, filters [(field, op)], order [(field, direction)]
+    """
+    src = _blank_comments(source)
+    default_dbs = set(DEFAULT_DB_EXPRESSIONS)
+    for m in _DB_VAR_RE.finditer(src):
+        if m.group(2) in default_dbs:
+            default_dbs.add(m.group(1))
+
+    queries = []
+    ref_vars = {}  # variable -> (collection, scope, database)
+    for m in _COLLECTION_RE.finditer(src):
+        args, end = _call_args(src, m.end() - 1)
+        name = _literal(args[0]) if args else None
+        if name is None:
+            continue
+        receiver = _receiver(src, m.start())
+        database = "default" if receiver in default_dbs else receiver
+        scope = "COLLECTION_GROUP" if m.group(1) == "collectionGroup" else "COLLECTION"
+        line = src.count("\n", 0, m.start()) + 1
+        chain = _method_chain(src, end)
+        if not chain:
+            # `const ref = db.collection("x");` - queries may hang off ref later
+            statement_start = src.rfind(";", 0, m.start()) + 1
+            head = src[statement_start:m.start() - len(receiver)]
+            a = _ASSIGN_RE.search(head.replace("\n", " ").rstrip())
+            if a:
+                ref_vars[a.group(1)] = (name, scope, database)
+            continue
+        queries.append(_query(name, scope, database, line, chain))
+
+    for var, (name, scope, database) in ref_vars.items():
+        for m in re.finditer(r"(?<![\w$.])" + re.escape(var) + r"(?=\s*\.\s*(?:where|orderBy)\b)", src):
+            line = src.count("\n", 0, m.start()) + 1
+            queries.append(_query(name, scope, database, line, _method_chain(src, m.end())))
+
+    return [q for q in sorted(queries, key=lambda q: q["line"]) if q["filters"] or q["order"]]
+
+
+def _query(name, scope, database, line, chain):
+    filters, order = [], []
+    for method, args in chain:
+        if method == "where" and len(args) >= 2:
+            field, op = _literal(args[0]), _literal(args[1])
+            if field and op:
+                filters.append((field, op))
+        elif method == "orderBy" and args:
+            field = _literal(args[0])
+            direction = (_literal(args[1]) if len(args) > 1 else None) or "asc"
+            if field:
+                order.append((field, "DESCENDING" if direction.lower() == "desc" else "ASCENDING"))
+    return {"collection": name, "scope": scope, "database": database, "line": line,
+            "filters": filters, "order": order}
+
+
+def required_index(query):
+    """
+    The composite index a query needs, or None when single-field indexes serve it.
+
+    Equality-only filters are served by merging single-field indexes; anything that
+    combines a range / array filter or a sort with another field needs a composite.
+
+    Returns:
+        dict: firestore.indexes.json style index, or None
+    """
+    equality = [f for f, op in query["filters"] if op in EQUALITY_OPS]
+    arrays = [f for f, op in query["filters"] if op in ARRAY_OPS]
+    ranges = [f for f, op in query["filters"] if op in RANGE_OPS]
+    order = list(query["order"])
+    # Firestore sorts by the inequality field first (implicitly when not given)
+    for field in ranges:
+        if field not in [f for f, _ in order]:
+            order.insert(0, (field, "ASCENDING"))
+
+    fields = []
+    for field in equality:
+        if field not in [f["fieldPath"] for f in fields] and field not in [f for f, _ in order]:
+            fields.append({"fieldPath": field, "order": "ASCENDING"})
+    for field in arrays:
+        fields.append({"fieldPath": field, "arrayConfig": "CONTAINS"})
+    for field, direction in order:
+        if field not in [f["fieldPath"] for f in fields]:
+            fields.append({"fieldPath": field, "order": direction})
+
+    if len(fields) < 2 or not (arrays or order):
+        return None
+    return {"collectionGroup": query["collection"], "queryScope": query["scope"], "fields": fields}
+
+
+def required_overrides(query):
+    """Collection group queries on a single field need that field indexed at group scope"""
+    if query["scope"] != "COLLECTION_GROUP" or required_index(query):
+        return []
+    overrides = []
+    for field, op in query["filters"] + [(f, None) for f, _ in query["order"]]:
+        config = ({"arrayConfig": "CONTAINS", "queryScope": "COLLECTION_GROUP"} if op in ARRAY_OPS else
+                  {"order": "ASCENDING", "queryScope": "COLLECTION_GROUP"})
+        overrides.append({"collectionGroup": query["collection"], "fieldPath": field, "indexes": [config]})
+    return overrides
+
+
+def _index_key(index):
+    return (index["collectionGroup"], index.get("queryScope", "COLLECTION"),
+            tuple((f["fieldPath"], f.get("order"), f.get("arrayConfig")) for f in index["fields"]))
+
+
+def advise(functions_source=FUNCTIONS_SOURCE, indexes_file=INDEXES_FILE):
+    """
+    Compares what the queries in functions_source need against indexes_file.
+
+    Returns:
+        dict: "queries", "missing" (indexes), "unused" (existing indexes no query needs),
+              "overrides" (missing field overrides), "other_databases" (queries not on
+              this project's database) and "merged" (indexes file content with the additions)
+    """
+    with open(functions_source, 'r', encoding='utf-8') as f:
+        queries = extract_queries(f.read())
+    try:
+        with open(indexes_file, 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+    except OSError:
+        existing = {}
+    existing.setdefault("indexes", [])
+    existing.setdefault("fieldOverrides", [])
+
+    have = {_index_key(index) for index in existing["indexes"]}
+    have_overrides = {(o["collectionGroup"], o["fieldPath"]) for o in existing["fieldOverrides"]}
+    missing, overrides, needed, other = [], [], set(), []
+    for query in queries:
+        if query["database"] != "default":
+            other.append(query)
+            continue
+        index = required_index(query)
+        query["index"] = index
+        if index:
+            key = _index_key(index)
+            if key not in have and key not in needed:
+                missing.append(index)
+            needed.add(key)
+        for override in required_overrides(query):
+            key = (override["collectionGroup"], override["fieldPath"])
+            if key not in have_overrides:
+                have_overrides.add(key)
+                overrides.append(override)
+
+    merged = dict(existing)
+    merged["indexes"] = existing["indexes"] + missing
+    merged["fieldOverrides"] = existing["fieldOverrides"] + overrides
+    return {
+        "queries": queries,
+        "missing": missing,
+        "unused": [index for index in existing["indexes"] if _index_key(index) not in needed],
+        "overrides": overrides,
+        "other_databases": other,
+        "merged": merged,
+    }
+
+
+def _describe(query):
+    parts = [f"{field} {op}" for field, op in query["filters"]]
+    parts += [f"orderBy {field} {'desc' if direction == 'DESCENDING' else 'asc'}" for field, direction in query["order"]]
+    return f"{query['collection']} [{', '.join(parts)}]"
+
+
+def _describe_index(index):
+    fields = ", ".join(f"{f['fieldPath']} {f.get('order') or f.get('arrayConfig')}" for f in index["fields"])
+    return f"{index['collectionGroup']} ({fields})"
+
+
+def main(argv=None):
+    """Main function to run the script"""
+    parser = argparse.ArgumentParser(
+        description="Derive the Firestore composite indexes the queries in functions/index.js need")
+    parser.add_argument("--source", default=FUNCTIONS_SOURCE, help=f"default: {FUNCTIONS_SOURCE}")
+    parser.add_argument("--indexes", default=INDEXES_FILE, help=f"default: {INDEXES_FILE}")
+    parser.add_argument("--write", action="store_true", help="add the missing indexes / overrides to the indexes file")
+    parser.add_argument("--check", action="store_true", help="exit with an error when indexes are missing")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        print(f"Error: {args.source} not found")
+        return 1
+
+    result = advise(args.source, args.indexes)
+    print(f"{len(result['queries'])} queries in {args.source}:")
+    for query in result["queries"]:
+        if query["database"] != "default":
+            need = f"other database ({query['database']}) - index it in that project"
+        elif query["index"]:
+            need = _describe_index(query["index"])
+        elif query["scope"] == "COLLECTION_GROUP":
+            need = "collection group field overrides"
+        else:
+            need = "single-field indexes"
+        print(f"  line {query['line']}: {_describe(query)} -> {need}")
+
+    for index in result["missing"]:
+        print(f"Missing index: {_describe_index(index)}")
+    for override in result["overrides"]:
+        print(f"Missing field override: {override['collectionGroup']}.{override['fieldPath']}")
+    for index in result["unused"]:
+        print(f"Unused index (no query in {args.source} needs it): {_describe_index(index)}")
+    if not result["missing"] and not result["overrides"]:
+        print(f"{args.indexes} covers every query")
+    elif args.write:
+        with open(args.indexes, 'w', encoding='utf-8') as f:
+            json.dump(result["merged"], f, indent=2)
+            f.write("\n")
+        print(f"Wrote {len(result['missing'])} index(es) and {len(result['overrides'])} override(s) "
+              f"to {args.indexes} - deploy with: firebase deploy --only firestore:indexes")
+    return 1 if args.check and (result["missing"] or result["overrides"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,410 @@
+import io
+import os
+import sys
+import gzip
+import json
+import time
+import asyncio
+import argparse
+import datetime
+
+import firestore_emulator as fe
+
+# Where the GUI keeps JSONL snapshots (one sub folder per snapshot name)
+SNAPSHOTS_DIR = ".emulator_snapshots"
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+EXTENSIONS = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+LEVELS = {"gzip": 6, "zstd": 3}
+
+
+def _zstd():
+    """(flavour, module) of the available zstd implementation, or (None, None)"""
+    try:
+        from compression import zstd  # Python 3.14+
+        return "stdlib", zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        return "zstandard", zstandard
+    except ImportError:
+        return None, None
+
+
+def _require_zstd():
+    flavour, module = _zstd()
+    if module is None:
+        raise RuntimeError("zstd needs Python 3.14+ or 'pip install zstandard' (or use --compression gzip)")
+    return flavour, module
+
+
+def encode_line(doc):
+    """Emulator document -> one JSONL line, keyed by its path relative to the database"""
+    # path first and sorted fields: the decompressed files diff cleanly with text tools too
+    path = doc["name"].split("/documents/", 1)[1]
+    fields = json.dumps(doc.get("fields", {}), ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return f'{{"path":{json.dumps(path, ensure_ascii=False)},"fields":{fields}}}\n'.encode('utf-8')
+
+
+class _MemberWriter:
+    """
+    Appends compressed data to a file as a series of independent gzip members / zstd frames.
+
+    checkpoint() ends the current member and returns the file size: everything up to
+    that offset is a complete, readable stream, so an interrupted export is resumed by
+    truncating back to the last checkpoint and appending new members.
+    """
+
+    def __init__(self, path, compression, offset=0):
+        self.compression = compression
+        self.raw = open(path, 'r+b' if offset and os.path.exists(path) else 'wb')
+        self.raw.truncate(offset)
+        self.raw.seek(offset)
+        self.stream = None
+
+    def _open_member(self):
+        level = LEVELS[self.compression]
+        if self.compression == "gzip":
+            return gzip.GzipFile(fileobj=self.raw, mode='wb', compresslevel=level, mtime=0)
+        flavour, zstd = _require_zstd()
+        if flavour == "stdlib":
+            return zstd.ZstdFile(self.raw, 'wb', level=level)
+        return zstd.ZstdCompressor(level=level).stream_writer(self.raw, closefd=False)
+
+    def write(self, lines):
+        if self.stream is None:
+            self.stream = self._open_member()
+        for line in lines:
+            self.stream.write(line)
+
+    def checkpoint(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        self.raw.flush()
+        os.fsync(self.raw.fileno())
+        return self.raw.tell()
+
+    def close(self):
+        # anything after the last checkpoint is dropped on resume, so no need to finish the member
+        self.raw.close()
+
+
+def read_lines(path, compression):
+    """Yields the JSONL lines of a snapshot file (all members / frames), one at a time"""
+    if compression == "gzip":
+        with gzip.open(path, 'rb') as f:
+            yield from f
+        return
+    flavour, zstd = _require_zstd()
+    if flavour == "stdlib":
+        with zstd.open(path, 'rb') as f:
+            yield from f
+        return
+    with open(path, 'rb') as raw:
+        reader = zstd.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+        yield from io.BufferedReader(reader, 1 << 20)
+
+
+def load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(directory, manifest):
+    # written via a temp file so a crash never leaves a half-written cursor behind
+    path = os.path.join(directory, MANIFEST)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+async def export_snapshot(directory, project, collections=None, port=fe.FIRESTORE_PORT, compression="gzip",
+                          page_size=300, concurrency=4, checkpoint_docs=5000, progress_every=2.0):
+    """
+    Streams collections out of the emulator into <directory>/<collection>.jsonl.gz|.zst.
+
+    Documents are read page by page in name order (the next page is fetched while the
+    current one is compressed) and only one page per collection is held in memory.
+    Every `checkpoint_docs` documents the cursor, count and file offset are saved to
+    manifest.json; running the export again on the same directory resumes from there.
+
+    Returns:
+        dict: the final manifest
+    """
+    if compression == "zstd":
+        _require_zstd()
+    os.makedirs(directory, exist_ok=True)
+    manifest = load_manifest(directory)
+    if manifest is None:
+        manifest = {"format": FORMAT_VERSION, "project": project, "compression": compression,
+                    "started": datetime.datetime.now().isoformat(timespec='seconds'),
+                    "complete": False, "collections": {}}
+    elif manifest.get("compression") != compression:
+        raise RuntimeError(f"{directory} holds a {manifest.get('compression')} export; "
+                           f"resume it with --compression {manifest.get('compression')}")
+    if collections is None:
+        client = fe.EmulatorClient(project, port)
+        try:
+            collections = await client.collection_ids()
+        finally:
+            await client.close()
+    for name in collections:
+        manifest["collections"].setdefault(name, {"file": name + EXTENSIONS[compression], "documents": 0,
+                                                  "bytes": 0, "after": None, "done": False})
+    save_manifest(directory, manifest)
+
+    start = time.perf_counter()
+    last_report = [start]
+    exported = {name: 0 for name in collections}
+    limit = asyncio.Semaphore(concurrency)
+
+    async def export_collection(name):
+        state = manifest["collections"][name]
+        if state["done"]:
+            return
+        async with limit:
+            client = fe.EmulatorClient(project, port)
+            out = _MemberWriter(os.path.join(directory, state["file"]), compression, state["bytes"])
+            pending = asyncio.ensure_future(client.query_after(name, state["after"], page_size))
+            documents, after, since = state["documents"], state["after"], 0
+            try:
+                while pending is not None:
+                    docs = await pending
+                    pending = None
+                    if len(docs) == page_size:
+                        pending = asyncio.ensure_future(client.query_after(name, docs[-1]["name"], page_size))
+                    if docs:
+                        await asyncio.to_thread(out.write, [encode_line(doc) for doc in docs])
+                        documents, after, since = documents + len(docs), docs[-1]["name"], since + len(docs)
+                        exported[name] += len(docs)
+                    if pending is None or since >= checkpoint_docs:
+                        state["bytes"] = await asyncio.to_thread(out.checkpoint)
+                        state.update(documents=documents, after=after, done=pending is None)
+                        save_manifest(directory, manifest)
+                        since = 0
+                    now = time.perf_counter()
+                    if now - last_report[0] >= progress_every:
+                        last_report[0] = now
+                        done = sum(exported.values())
+                        print(f"  {done:,} docs exported, {done / (now - start):,.0f} docs/s", flush=True)
+            finally:
+                if pending is not None:
+                    pending.cancel()
+                out.close()
+                await client.close()
+
+    await asyncio.gather(*(export_collection(name) for name in collections))
+    manifest["complete"] = all(state["done"] for state in manifest["collections"].values())
+    manifest["finished"] = datetime.datetime.now().isoformat(timespec='seconds')
+    save_manifest(directory, manifest)
+    return manifest
+
+
+async def import_snapshot(directory, project, collections=None, port=fe.FIRESTORE_PORT, concurrency=8,
+                          batch_size=fe.MAX_BATCH, progress_every=2.0):
+    """
+    Streams a snapshot back into the emulator through batched commits.
+
+    Lines are decoded lazily into a bounded queue of batches drained by `concurrency`
+    connections, so memory stays flat whatever the snapshot size. Writes are upserts,
+    so an interrupted import can simply be run again. Documents keep their paths but
+    move to `project`.
+
+    Returns:
+        dict: documents written per collection, total, seconds, docs_per_s
+    """
+    manifest = load_manifest(directory)
+    if manifest is None:
+        raise RuntimeError(f"{directory} has no {MANIFEST} (not a snapshot?)")
+    if not manifest.get("complete"):
+        raise RuntimeError(f"{directory} is an unfinished export; run the export again to resume it")
+    names = [name for name in manifest["collections"] if collections is None or name in collections]
+    root = f"projects/{project}/databases/{fe.DATABASE}/documents/"
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    written = {name: 0 for name in names}
+    total = sum(manifest["collections"][name]["documents"] for name in names)
+    start = time.perf_counter()
+    last_report = [start]
+
+    async def produce():
+        for name in names:
+            batch = []
+            path = os.path.join(directory, manifest["collections"][name]["file"])
+            for line in read_lines(path, manifest["compression"]):
+                record = json.loads(line)
+                batch.append({"update": {"name": root + record["path"], "fields": record["fields"]}})
+                if len(batch) == batch_size:
+                    await queue.put((name, batch))
+                    batch = []
+            if batch:
+                await queue.put((name, batch))
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def consume():
+        client = fe.EmulatorClient(project, port)
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                name, writes = item
+                await client.commit(writes)
+                written[name] += len(writes)
+                now = time.perf_counter()
+                if now - last_report[0] >= progress_every:
+                    last_report[0] = now
+                    done = sum(written.values())
+                    print(f"  {done:,}/{total:,} docs ({100 * done / max(total, 1):.0f}%), "
+                          f"{done / (now - start):,.0f} docs/s", flush=True)
+        finally:
+            await client.close()
+
+    tasks = [asyncio.ensure_future(produce())] + [asyncio.ensure_future(consume()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    elapsed = time.perf_counter() - start
+    done = sum(written.values())
+    return {"written": written, "total": done, "seconds": elapsed, "docs_per_s": done / elapsed if elapsed else 0.0}
+
+
+def _records(directory, manifest, name):
+    state = manifest["collections"].get(name)
+    if state is None:
+        return
+    previous = None
+    for line in read_lines(os.path.join(directory, state["file"]), manifest["compression"]):
+        record = json.loads(line)
+        if previous is not None and record["path"] <= previous:
+            raise RuntimeError(f"{state['file']} in {directory} is not in document order")
+        previous = record["path"]
+        yield record
+
+
+def diff_snapshots(dir_a, dir_b, show=10):
+    """
+    Compares two snapshots collection by collection with a streaming merge of the
+    (name-ordered) files, so neither is loaded into memory.
+
+    Returns:
+        dict: {collection: {"added": n, "removed": n, "changed": n, "same": n, "examples": [...]}}
+    """
+    manifests = []
+    for directory in (dir_a, dir_b):
+        manifest = load_manifest(directory)
+        if manifest is None or not manifest.get("complete"):
+            raise RuntimeError(f"{directory} is not a complete snapshot")
+        manifests.append(manifest)
+    report = {}
+    for name in sorted(set(manifests[0]["collections"]) | set(manifests[1]["collections"])):
+        counts = {"added": 0, "removed": 0, "changed": 0, "same": 0, "examples": []}
+        left, right = _records(dir_a, manifests[0], name), _records(dir_b, manifests[1], name)
+        a, b = next(left, None), next(right, None)
+        while a is not None or b is not None:
+            if b is None or (a is not None and a["path"] < b["path"]):
+                kind, path, a = "removed", a["path"], next(left, None)
+            elif a is None or b["path"] < a["path"]:
+                kind, path, b = "added", b["path"], next(right, None)
+            else:
+                kind, path = ("same" if a["fields"] == b["fields"] else "changed"), a["path"]
+                a, b = next(left, None), next(right, None)
+            counts[kind] += 1
+            if kind != "same" and len(counts["examples"]) < show:
+                counts["examples"].append(f"{kind[0].upper()} {path}")
+        report[name] = counts
+    return report
+
+
+def main(argv=None):
+    """Main function to run the script"""
+    parser = argparse.ArgumentParser(
+        description="Stream Firestore emulator collections to / from compressed JSONL snapshots")
+    sub = parser.add_subparsers(dest="command", required=True)
+    exp = sub.add_parser("export", help="emulator -> snapshot directory (run again to resume)")
+    exp.add_argument("directory")
+    exp.add_argument("--collections", help="comma separated (default: every top-level collection)")
+    exp.add_argument("--compression", choices=sorted(EXTENSIONS), default="gzip",
+                     help="zstd needs Python 3.14+ or the zstandard package")
+    exp.add_argument("--page-size", type=int, default=300, help="documents per read")
+    exp.add_argument("-c", "--concurrency", type=int, default=4, help="collections exported in parallel")
+    exp.add_argument("--checkpoint", type=int, default=5000, help="documents between resumable checkpoints")
+    exp.add_argument("--overwrite", action="store_true", help="replace a finished snapshot in the directory")
+    imp = sub.add_parser("import", help="snapshot directory -> emulator")
+    imp.add_argument("directory")
+    imp.add_argument("--collections", help="comma separated (default: all in the snapshot)")
+    imp.add_argument("-c", "--concurrency", type=int, default=8, help="parallel commit connections")
+    imp.add_argument("--batch-size", type=int, default=fe.MAX_BATCH, help=f"writes per commit (max {fe.MAX_BATCH})")
+    imp.add_argument("--clear", action="store_true", help="delete all emulator documents first")
+    dif = sub.add_parser("diff", help="compare two snapshots")
+    dif.add_argument("a")
+    dif.add_argument("b")
+    dif.add_argument("--show", type=int, default=10, help="differing paths listed per collection")
+    for p in (exp, imp):
+        p.add_argument("--port", type=int, default=fe.FIRESTORE_PORT, help="Firestore emulator port")
+        p.add_argument("--project", help="project id (default: from .firebaserc)")
+    args = parser.parse_args(argv)
+
+    if args.command == "diff":
+        try:
+            report = diff_snapshots(args.a, args.b, args.show)
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"Error: {e}")
+            return 1
+        for name, counts in report.items():
+            print(f"{name}: +{counts['added']:,} -{counts['removed']:,} ~{counts['changed']:,} "
+                  f"(={counts['same']:,})")
+            for example in counts["examples"]:
+                print(f"    {example}")
+        return 1 if any(c["added"] or c["removed"] or c["changed"] for c in report.values()) else 0
+
+    project = args.project or fe.project_id()
+    collections = [c.strip() for c in args.collections.split(",") if c.strip()] if args.collections else None
+    try:
+        if args.command == "export":
+            manifest = load_manifest(args.directory)
+            if manifest and manifest.get("complete"):
+                if not args.overwrite:
+                    print(f"Error: {args.directory} already holds a snapshot (use --overwrite to replace it)")
+                    return 1
+                for state in manifest["collections"].values():
+                    try:
+                        os.remove(os.path.join(args.directory, state["file"]))
+                    except OSError:
+                        pass
+                os.remove(os.path.join(args.directory, MANIFEST))
+            elif manifest:
+                print(f"Resuming the unfinished export in {args.directory}")
+            print(f"Exporting '{project}' on port {args.port} to {args.directory} ({args.compression})", flush=True)
+            start = time.perf_counter()
+            manifest = asyncio.run(export_snapshot(args.directory, project, collections, args.port,
+                                                   args.compression, max(1, args.page_size),
+                                                   max(1, args.concurrency), max(1, args.checkpoint)))
+            for name, state in sorted(manifest["collections"].items()):
+                print(f"  {name}: {state['documents']:,} docs, {state['bytes'] / 1e6:,.1f} MB")
+            print(f"Exported in {time.perf_counter() - start:.1f}s")
+        else:
+            if args.clear:
+                fe.clear_database(project, args.port)
+                print(f"Cleared the emulator database of '{project}'")
+            print(f"Importing {args.directory} into '{project}' on port {args.port}", flush=True)
+            result = asyncio.run(import_snapshot(args.directory, project, collections, args.port,
+                                                 max(1, args.concurrency),
+                                                 max(1, min(args.batch_size, fe.MAX_BATCH))))
+            print(f"Wrote {result['total']:,} documents in {result['seconds']:.1f}s "
+                  f"({result['docs_per_s']:,.0f} docs/s)")
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Error: {e} (is the Firestore emulator running on port {args.port}?)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
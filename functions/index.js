@@ -11,6 +11,18 @@ const { GoogleGenerativeAI } = require("@google/generative-ai");
 const { BitlyClient } = require('bitly');
 const qrcode = require('qrcode');
 
+// Persona / prompt catalog generated by build_catalog.py (optional - clients also send the texts)
+let promptCatalog = null;
+try {
+    promptCatalog = require("./prompt_catalog.json");
+} catch (e) {
+    console.warn("prompt_catalog.json not found; using the persona/template texts sent by the client");
+}
+
+// Emulator only: gemini_standin.py writes GEMINI_BASE_URL to .env.local to serve generations offline
+const geminiRequestOptions = process.env.FUNCTIONS_EMULATOR === "true" && process.env.GEMINI_BASE_URL ?
+    {baseUrl: process.env.GEMINI_BASE_URL} : undefined;
+
 // Define secrets
 const geminiApiKey = defineSecret("GEMINI_API_KEY");
 const bitlyAccessToken = defineSecret("BITLY_ACCESS_TOKEN");
@@ -91,6 +103,27 @@ async function saveMetadata(appData, urls, authContext, teacherDetails) {
     return docRef;
 }
 
+/**
+ * Resolves persona / template texts from the catalog by id, falling back to the texts sent by the client.
+ * The catalog is only used when the client loaded the same one (catalogHash), so a stale
+ * prompt_catalog.json never overrides what the teacher picked.
+ */
+function resolveCatalogTexts(promptData, lang) {
+    if (!promptCatalog) {
+        return {persona: promptData.persona, template: promptData.template};
+    }
+    if (promptData.catalogHash !== promptCatalog.hash) {
+        console.warn(`prompt_catalog.json is ${promptCatalog.hash} but the client sent ` +
+            `${promptData.catalogHash || "no catalog"}; using the persona/template texts sent by the client`);
+        return {persona: promptData.persona, template: promptData.template};
+    }
+    const personaIdx = promptCatalog.personas_index[promptData.personaId];
+    const templateIdx = promptCatalog.prompts_index[promptData.templateId];
+    const persona = personaIdx === undefined ? null : promptCatalog.personas[personaIdx].system_prompt[lang];
+    const template = templateIdx === undefined ? null : promptCatalog.prompts[templateIdx].base_prompt[lang];
+    return {persona: persona || promptData.persona, template: template || promptData.template};
+}
+
 /**
  * Constructs initial Mega-Prompt from persona, template, and content
  */
@@ -227,9 +260,10 @@ exports.askVibeAI = onCall({ secrets: [geminiApiKey] }, async (request) => {
         megaPrompt = constructRefinementPrompt(currentApp, promptData.content || promptData, language);
     } else {
         // INITIAL CREATION MODE: Create new app from scratch
+        const texts = resolveCatalogTexts(promptData, request.data.language === 'en' ? 'en' : 'he');
         megaPrompt = constructMegaPrompt(
-            promptData.persona,
-            promptData.template, 
+            texts.persona,
+            texts.template, 
             promptData.content,
             language
         );
@@ -278,7 +312,7 @@ exports.askVibeAI = onCall({ secrets: [geminiApiKey] }, async (request) => {
             responseMimeType: "application/json",
             responseSchema: jsonSchema,
         },
-    });
+    }, geminiRequestOptions);
 
     try {
         const result = await model.generateContent(megaPrompt);
@@ -0,0 +1,291 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+DEFAULT_PORT = 8787
+# Functions emulator env files: askVibeAI points its Gemini client at GEMINI_BASE_URL when it is set
+FUNCTIONS_ENV_LOCAL = os.path.join("functions", ".env.local")
+FUNCTIONS_SECRET_LOCAL = os.path.join("functions", ".secret.local")
+# Written on the line above the placeholder key, so turning the stand-in off removes exactly that line
+PLACEHOLDER_MARKER = "# added by gemini_standin.py (removed when the stand-in is turned off)"
+PLACEHOLDER_KEY = "GEMINI_API_KEY=stand-in"
+
+_MODEL_PATH_RE = re.compile(r"^/(v1beta|v1)/models/([^/:]+):(generateContent|streamGenerateContent)")
+
+
+def parse_latency(spec):
+    """
+    Latency spec -> sampling function returning seconds.
+
+    "fixed:S", "uniform:A,B", "normal:MEAN,SD" or "lognormal:MEDIAN,SIGMA" (seconds).
+    """
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v.strip()]
+    samplers = {
+        "fixed": (1, lambda rng, s: s),
+        "uniform": (2, lambda rng, a, b: rng.uniform(a, b)),
+        "normal": (2, lambda rng, mean, sd: max(0.0, rng.gauss(mean, sd))),
+        "lognormal": (2, lambda rng, median, sigma: median * rng.lognormvariate(0.0, sigma)),
+    }
+    if kind not in samplers or len(values) != samplers[kind][0]:
+        raise ValueError(f"Bad latency spec '{spec}' (fixed:S, uniform:A,B, normal:MEAN,SD, lognormal:MEDIAN,SIGMA)")
+    sampler = samplers[kind][1]
+    return lambda rng: sampler(rng, *values)
+
+
+def fake_generation(prompt, response_bytes):
+    """Deterministic applet JSON for a prompt, with htmlCode padded to about response_bytes"""
+    digest = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+    body = f"<!DOCTYPE html><html><head><title>Stand-in {digest[:8]}</title></head><body><main>"
+    filler = f"<p>Stand-in applet {digest[:16]} - lorem ipsum dolor sit amet.</p>"
+    body += filler * max(1, (response_bytes - len(body)) // len(filler)) + "</main></body></html>"
+    return {
+        "htmlCode": body,
+        "metadata": {
+            "appName": f"Stand-in app {digest[:6]}",
+            "gradeLevel": "Grade 5",
+            "domain": "Math",
+            "subDomain": "Fractions",
+            "pedagogicalExplanation": "Generated by the local Gemini stand-in.",
+        },
+    }
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Mimics models/{model}:generateContent (and the SSE streaming variant) of the Gemini API"""
+
+    server_version = "GeminiStandin/1"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        pass  # one summary line per request is printed in _log instead
+
+    def _log(self, status, started, size, note=""):
+        stats = self.server.stats
+        with stats["lock"]:
+            stats["requests"] += 1
+            stats["by_status"][status] = stats["by_status"].get(status, 0) + 1
+            n = stats["requests"]
+        print(f"#{n} {self.command} {self.path.split('?')[0]} -> {status} "
+              f"{time.perf_counter() - started:.2f}s {size}B{note}", flush=True)
+
+    def _send_json(self, status, payload, started, note=""):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self._log(status, started, len(data), note)
+
+    def do_GET(self):
+        started = time.perf_counter()
+        if self.path.split("?")[0] in ("/", "/health"):
+            stats = self.server.stats
+            self._send_json(200, {"ok": True, "requests": stats["requests"], "by_status": stats["by_status"]}, started)
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}}, started)
+
+    def do_POST(self):
+        started = time.perf_counter()
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        m = _MODEL_PATH_RE.match(self.path)
+        if not m:
+            self._send_json(404, {"error": {"code": 404, "message": "Not found", "status": "NOT_FOUND"}}, started)
+            return
+        cfg = self.server.config
+        with self.server.rng_lock:
+            rng = self.server.rng
+            latency = cfg["latency"](rng)
+            roll = rng.random()
+
+        # Error injection, in order: hang (client timeout), 429, 500
+        if roll < cfg["timeout_rate"]:
+            time.sleep(cfg["hang"])
+            self.close_connection = True
+            self._log(0, started, 0, " (injected timeout, connection dropped)")
+            return
+        roll -= cfg["timeout_rate"]
+        time.sleep(latency)
+        if roll < cfg["rate_limit_rate"]:
+            self._send_json(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED",
+                                            "message": "Resource has been exhausted (e.g. check quota)."}},
+                            started, " (injected)")
+            return
+        roll -= cfg["rate_limit_rate"]
+        if roll < cfg["error_rate"]:
+            self._send_json(500, {"error": {"code": 500, "status": "INTERNAL",
+                                            "message": "An internal error has occurred."}}, started, " (injected)")
+            return
+
+        try:
+            request = json.loads(raw or b"{}")
+            prompt = "".join(part.get("text", "") for content in request.get("contents", [])
+                             for part in content.get("parts", []))
+        except (ValueError, AttributeError):
+            self._send_json(400, {"error": {"code": 400, "message": "Invalid JSON payload",
+                                            "status": "INVALID_ARGUMENT"}}, started)
+            return
+
+        text = json.dumps(fake_generation(prompt, cfg["response_bytes"]), ensure_ascii=False)
+        response = {
+            "candidates": [{"content": {"parts": [{"text": text}], "role": "model"},
+                            "finishReason": "STOP", "index": 0}],
+            "usageMetadata": {"promptTokenCount": len(prompt) // 4, "candidatesTokenCount": len(text) // 4,
+                              "totalTokenCount": (len(prompt) + len(text)) // 4},
+            "modelVersion": m.group(2),
+        }
+        if m.group(3) == "streamGenerateContent":
+            data = f"data: {json.dumps(response)}\r\n\r\n".encode('utf-8')
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            self._log(200, started, len(data), " (stream)")
+        else:
+            self._send_json(200, response, started)
+
+
+def make_server(port=DEFAULT_PORT, latency="lognormal:2.0,0.5", response_bytes=12000,
+                rate_limit_rate=0.0, error_rate=0.0, timeout_rate=0.0, hang=120.0, seed=None):
+    """Builds (but does not start) the stand-in server; see main() for the parameters"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandinHandler)
+    server.daemon_threads = True
+    server.config = {
+        "latency": parse_latency(latency),
+        "response_bytes": response_bytes,
+        "rate_limit_rate": rate_limit_rate,
+        "error_rate": error_rate,
+        "timeout_rate": timeout_rate,
+        "hang": hang,
+    }
+    server.rng = random.Random(seed)
+    server.rng_lock = threading.Lock()
+    server.stats = {"lock": threading.Lock(), "requests": 0, "by_status": {}}
+    return server
+
+
+def _set_env_line(path, key, value):
+    """Sets (value) or removes (None) KEY=value in a dotenv file, keeping the other lines"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = [line for line in f.read().splitlines() if not line.startswith(f"{key}=")]
+    except OSError:
+        lines = []
+    if value is not None:
+        lines.append(f"{key}={value}")
+    if lines:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def _remove_placeholder_key(path=FUNCTIONS_SECRET_LOCAL):
+    """Drops the placeholder GEMINI_API_KEY (and its marker) written by configure_functions"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return
+    kept, i = [], 0
+    while i < len(lines):
+        if lines[i] == PLACEHOLDER_MARKER and i + 1 < len(lines) and lines[i + 1] == PLACEHOLDER_KEY:
+            i += 2
+            continue
+        if lines[i] != PLACEHOLDER_KEY:
+            kept.append(lines[i])
+        i += 1
+    if kept == lines:
+        return
+    if kept:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(kept) + "\n")
+    else:
+        os.remove(path)
+
+
+def configure_functions(port=DEFAULT_PORT, enabled=True):
+    """
+    Points the functions emulator at the stand-in (or back at the real API).
+
+    Writes GEMINI_BASE_URL to functions/.env.local, which only the emulator reads,
+    and gives GEMINI_API_KEY a marked placeholder in functions/.secret.local if it
+    has none. Disabling removes both again, so the emulator goes back to the real key.
+    Takes effect the next time the functions emulator starts.
+    """
+    _set_env_line(FUNCTIONS_ENV_LOCAL, "GEMINI_BASE_URL", f"http://127.0.0.1:{port}" if enabled else None)
+    if not enabled:
+        _remove_placeholder_key()
+        return
+    try:
+        with open(FUNCTIONS_SECRET_LOCAL, 'r', encoding='utf-8') as f:
+            has_key = any(line.startswith("GEMINI_API_KEY=") for line in f)
+    except OSError:
+        has_key = False
+    if not has_key:
+        with open(FUNCTIONS_SECRET_LOCAL, 'a', encoding='utf-8') as f:
+            f.write(f"{PLACEHOLDER_MARKER}\n{PLACEHOLDER_KEY}\n")
+
+
+def main(argv=None):
+    """Main function to run the script"""
+    parser = argparse.ArgumentParser(description="Local stand-in for the Gemini generateContent API")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"default: {DEFAULT_PORT}")
+    parser.add_argument("--latency", default="lognormal:2.0,0.5",
+                        help="fixed:S | uniform:A,B | normal:MEAN,SD | lognormal:MEDIAN,SIGMA (seconds)")
+    parser.add_argument("--response-bytes", type=int, default=12000, help="approximate htmlCode size")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 500")
+    parser.add_argument("--timeout-rate", type=float, default=0.0,
+                        help="fraction of requests that hang for --hang seconds and drop the connection")
+    parser.add_argument("--hang", type=float, default=120.0, help="seconds an injected timeout hangs")
+    parser.add_argument("--seed", type=int, help="random seed, for repeatable latency / error sequences")
+    parser.add_argument("--configure-functions", action="store_true",
+                        help=f"point the functions emulator at this server (via {FUNCTIONS_ENV_LOCAL})")
+    parser.add_argument("--unconfigure-functions", action="store_true",
+                        help=f"remove GEMINI_BASE_URL from {FUNCTIONS_ENV_LOCAL} (and the placeholder key) and exit")
+    args = parser.parse_args(argv)
+
+    if args.unconfigure_functions:
+        configure_functions(enabled=False)
+        print(f"Removed GEMINI_BASE_URL from {FUNCTIONS_ENV_LOCAL} and the placeholder key from "
+              f"{FUNCTIONS_SECRET_LOCAL}")
+        return 0
+    try:
+        server = make_server(args.port, args.latency, args.response_bytes, args.rate_limit_rate,
+                             args.error_rate, args.timeout_rate, args.hang, args.seed)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    except OSError as e:
+        print(f"Error: cannot listen on port {args.port} ({e})")
+        return 1
+    if args.configure_functions:
+        configure_functions(args.port)
+        print(f"GEMINI_BASE_URL=http://127.0.0.1:{args.port} written to {FUNCTIONS_ENV_LOCAL} "
+              "(restart the functions emulator to pick it up)")
+
+    print(f"Gemini stand-in on http://127.0.0.1:{args.port} - latency {args.latency}, "
+          f"~{args.response_bytes}B responses, 429 {args.rate_limit_rate:.0%}, 500 {args.error_rate:.0%}, "
+          f"timeouts {args.timeout_rate:.0%}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
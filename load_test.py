@@ -0,0 +1,322 @@
+import os
+import sys
+import glob
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import urllib.error
+import urllib.request
+
+from firestore_emulator import project_id, read_response
+
+FUNCTIONS_PORT = 5001
+AUTH_PORT = 9099
+REGION = "us-central1"
+RESULTS_DIR = os.path.join(".dev_logs", "loadtest")
+# Auth emulator account the load is generated as (publishHtml needs a user with an email)
+TEST_EMAIL = "loadtest@example.com"
+TEST_PASSWORD = "loadtest-password"
+
+DEFAULT_MIX = "saveWorkSession=3,loadWorkSession=3,getUserWorkSessions=3,askVibeAI=1"
+
+_SAMPLE_APP = {
+    "htmlCode": "<!DOCTYPE html><html><body><h1>Load test</h1>" + "<p>lorem ipsum</p>" * 50 + "</body></html>",
+    "metadata": {"appName": "Load test app", "gradeLevel": "5", "domain": "Math", "subDomain": "Fractions"},
+}
+
+
+def _payloads(state):
+    """Callable name -> payload factory; state carries ids returned by earlier calls"""
+    return {
+        "askVibeAI": lambda: {
+            "prompt": {"personaId": "coach", "templateId": "quiz",
+                       "content": f"Fractions for grade 5 (load test {random.randrange(10 ** 6)})"},
+            "language": random.choice(("en", "he")),
+        },
+        "publishHtml": lambda: dict(_SAMPLE_APP["metadata"], htmlContent=_SAMPLE_APP["htmlCode"]),
+        "saveWorkSession": lambda: {
+            "sessionName": f"load test {random.randrange(10 ** 6)}",
+            "currentApp": _SAMPLE_APP,
+            "originalPrompt": "load test",
+            "sessionHistory": [],
+        },
+        "loadWorkSession": lambda: {"sessionId": random.choice(state["session_ids"])},
+        "getUserWorkSessions": lambda: {},
+    }
+
+
+def emulator_token(auth_port=AUTH_PORT, email=TEST_EMAIL, password=TEST_PASSWORD):
+    """ID token for a test user on the auth emulator (created on first use)"""
+    base = f"http://localhost:{auth_port}/identitytoolkit.googleapis.com/v1/accounts"
+    body = json.dumps({"email": email, "password": password, "returnSecureToken": True}).encode('utf-8')
+    for action in ("signInWithPassword", "signUp"):
+        req = urllib.request.Request(f"{base}:{action}?key=fake-api-key", data=body,
+                                     headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(req, timeout=10) as resp:
+                return json.load(resp)["idToken"]
+        except urllib.error.HTTPError:
+            continue
+    raise RuntimeError(f"Could not sign in {email} on the auth emulator (port {auth_port})")
+
+
+class CallableClient:
+    """One keep-alive HTTP/1.1 connection to the functions emulator"""
+
+    def __init__(self, port, project, region, token):
+        self.port, self.project, self.region, self.token = port, project, region, token
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def call(self, name, data, timeout):
+        """
+        Invokes a callable function.
+
+        Returns:
+            tuple: (HTTP status, callable error status or None, decoded result or None)
+        """
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.wait_for(
+                asyncio.open_connection("localhost", self.port), timeout)
+        body = json.dumps({"data": data}).encode('utf-8')
+        head = (f"POST /{self.project}/{self.region}/{name} HTTP/1.1\r\n"
+                f"Host: localhost:{self.port}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                + (f"Authorization: Bearer {self.token}\r\n" if self.token else "")
+                + "Connection: keep-alive\r\n\r\n")
+        try:
+            self.writer.write(head.encode('latin-1') + body)
+            status, payload = await asyncio.wait_for(self._response(), timeout)
+        except BaseException:
+            # A half-read response leaves the connection unusable
+            await self.close()
+            raise
+        try:
+            decoded = json.loads(payload)
+        except ValueError:
+            return status, "INVALID_RESPONSE", None
+        if "error" in decoded:
+            return status, decoded["error"].get("status", "UNKNOWN"), None
+        return status, None if status == 200 else f"HTTP_{status}", decoded.get("result")
+
+    async def _response(self):
+        status, payload, closing = await read_response(self.reader)
+        if closing:
+            await self.close()
+        return status, payload
+
+
+def parse_mix(spec):
+    """"a=3,b=1" -> {"a": 3.0, "b": 1.0}"""
+    mix = {}
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name:
+            mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def run_load(mix, concurrency=10, duration=30.0, ramp=5.0, requests=None, timeout=60.0,
+                   port=FUNCTIONS_PORT, project=None, region=REGION, token=None):
+    """
+    Drives the callable functions with `concurrency` workers.
+
+    Workers start evenly spread over `ramp` seconds, then each loops picking a
+    callable by weight from mix, until `duration` seconds passed or `requests`
+    calls were made in total.
+
+    Returns:
+        dict: run settings plus per-function and overall latency / error / throughput stats
+    """
+    project = project or project_id()
+    state = {"session_ids": []}
+    payloads = _payloads(state)
+    unknown = [name for name in mix if name not in payloads]
+    if unknown:
+        raise ValueError(f"Unknown callable(s): {', '.join(unknown)} (known: {', '.join(payloads)})")
+
+    if "loadWorkSession" in mix:
+        # Seed a session to load; more ids come from saveWorkSession calls during the run
+        seed = CallableClient(port, project, region, token)
+        _, error, result = await seed.call("saveWorkSession", payloads["saveWorkSession"](), timeout)
+        await seed.close()
+        if error or not result:
+            raise RuntimeError(f"Could not seed a work session for loadWorkSession ({error})")
+        state["session_ids"].append(result["sessionId"])
+
+    names, weights = list(mix), list(mix.values())
+    samples = {name: [] for name in names}  # name -> [(latency seconds, error or None)]
+    issued = 0
+    start = time.perf_counter()
+    deadline = start + duration
+
+    async def worker(index):
+        nonlocal issued
+        await asyncio.sleep(ramp * index / max(1, concurrency))
+        client = CallableClient(port, project, region, token)
+        try:
+            while time.perf_counter() < deadline and (requests is None or issued < requests):
+                issued += 1
+                name = random.choices(names, weights)[0]
+                t0 = time.perf_counter()
+                try:
+                    _, error, result = await client.call(name, payloads[name](), timeout)
+                except asyncio.TimeoutError:
+                    error, result = "TIMEOUT", None
+                except (OSError, ConnectionError, ValueError, asyncio.IncompleteReadError) as e:
+                    error, result = type(e).__name__, None
+                samples[name].append((time.perf_counter() - t0, error))
+                if name == "saveWorkSession" and result and result.get("sessionId"):
+                    state["session_ids"].append(result["sessionId"])
+        finally:
+            await client.close()
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    def summarize(rows):
+        latencies = sorted(latency for latency, _ in rows)
+        errors = {}
+        for _, error in rows:
+            if error:
+                errors[error] = errors.get(error, 0) + 1
+        ok = len(rows) - sum(errors.values())
+        return {
+            "requests": len(rows),
+            "ok": ok,
+            "error_rate": (len(rows) - ok) / len(rows) if rows else 0.0,
+            "errors": errors,
+            "throughput_rps": ok / elapsed if elapsed else 0.0,
+            "latency_ms": {
+                "mean": 1000 * sum(latencies) / len(latencies) if latencies else None,
+                "p50": _ms(percentile(latencies, 50)),
+                "p95": _ms(percentile(latencies, 95)),
+                "p99": _ms(percentile(latencies, 99)),
+                "max": _ms(latencies[-1] if latencies else None),
+            },
+        }
+
+    return {
+        "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() - elapsed)),
+        "settings": {"mix": mix, "concurrency": concurrency, "duration": duration, "ramp": ramp,
+                     "requests": requests, "timeout": timeout, "project": project, "region": region},
+        "elapsed_s": elapsed,
+        "functions": {name: summarize(rows) for name, rows in samples.items() if rows},
+        "total": summarize([row for rows in samples.values() for row in rows]),
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else 1000 * seconds
+
+
+def _fmt(value, unit=""):
+    return "-" if value is None else f"{value:.1f}{unit}"
+
+
+def print_report(result, previous=None):
+    """Table of per-function stats; with previous, p95 / throughput deltas against it"""
+    print(f"{'function':<22}{'reqs':>7}{'err%':>7}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    rows = list(result["functions"].items()) + [("TOTAL", result["total"])]
+    for name, s in rows:
+        lat = s["latency_ms"]
+        print(f"{name:<22}{s['requests']:>7}{100 * s['error_rate']:>6.1f}%{s['throughput_rps']:>8.1f}"
+              f"{_fmt(lat['p50']):>9}{_fmt(lat['p95']):>9}{_fmt(lat['p99']):>9}{_fmt(lat['max']):>9}")
+        if s["errors"]:
+            print(f"{'':<22}errors: " + ", ".join(f"{k} x{v}" for k, v in sorted(s["errors"].items())))
+    if previous:
+        print(f"\nCompared with the run of {previous.get('started', '?')}:")
+        before = dict(previous.get("functions", {}), TOTAL=previous.get("total", {}))
+        for name, s in rows:
+            old = before.get(name)
+            if not old or old["latency_ms"]["p95"] is None or s["latency_ms"]["p95"] is None:
+                continue
+            d_p95 = s["latency_ms"]["p95"] - old["latency_ms"]["p95"]
+            d_rps = s["throughput_rps"] - old["throughput_rps"]
+            print(f"  {name:<20} p95 {d_p95:+.1f} ms, throughput {d_rps:+.1f} rps, "
+                  f"error rate {100 * (s['error_rate'] - old['error_rate']):+.1f} pts")
+
+
+def latest_result(results_dir=RESULTS_DIR):
+    runs = sorted(glob.glob(os.path.join(results_dir, "loadtest-*.json")))
+    return runs[-1] if runs else None
+
+
+def main(argv=None):
+    """Main function to run the script"""
+    parser = argparse.ArgumentParser(
+        description="Load-test the callable functions on the local functions emulator")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"callable=weight list (default: {DEFAULT_MIX})")
+    parser.add_argument("-c", "--concurrency", type=int, default=10, help="concurrent workers (default: 10)")
+    parser.add_argument("-d", "--duration", type=float, default=30.0, help="seconds to run (default: 30)")
+    parser.add_argument("--ramp", type=float, default=5.0, help="seconds over which workers start (default: 5)")
+    parser.add_argument("-n", "--requests", type=int, help="stop after this many requests in total")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-request timeout in seconds")
+    parser.add_argument("--port", type=int, default=FUNCTIONS_PORT, help="functions emulator port")
+    parser.add_argument("--auth-port", type=int, default=AUTH_PORT, help="auth emulator port (for the test user)")
+    parser.add_argument("--token", help="ID token to send instead of signing in on the auth emulator")
+    parser.add_argument("--project", help="project id (default: from .firebaserc)")
+    parser.add_argument("--region", default=REGION)
+    parser.add_argument("-o", "--output", help=f"results JSON (default: {RESULTS_DIR}/loadtest-<time>.json)")
+    parser.add_argument("--compare", help="results JSON to compare with, or 'latest'")
+    parser.add_argument("--seed", type=int, help="random seed, for repeatable payload sequences")
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    previous = None
+    compare = latest_result() if args.compare == "latest" else args.compare
+    if compare:
+        try:
+            with open(compare, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: cannot read {compare} ({e})")
+
+    try:
+        token = args.token or emulator_token(args.auth_port)
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e}. Start the auth emulator or pass --token.")
+        return 1
+
+    mix = parse_mix(args.mix)
+    limit = f"up to {args.requests} requests / " if args.requests else ""
+    print(f"Load test: {args.concurrency} workers, {limit}{args.duration:g}s (ramp {args.ramp:g}s), mix {args.mix}")
+    try:
+        result = asyncio.run(run_load(mix, args.concurrency, args.duration, args.ramp, args.requests,
+                                      args.timeout, args.port, args.project, args.region, token))
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    print_report(result, previous)
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("loadtest-%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+    print(f"\nResults saved to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
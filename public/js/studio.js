@@ -139,6 +139,7 @@ let currentLanguage = 'he';
 let generatedHtmlContent = '';
 let personasData = [];
 let promptsData = [];
+let catalogHash = null;
 let selectedPersonaId = null;
 let selectedPromptId = null;
 let conversationHistory = [];
@@ -366,6 +367,19 @@ function setLanguage(lang) {
 }
 
 async function loadDynamicContent() {
+    try {
+        // Prebuilt catalog (build_catalog.py): one request, already validated and indexed
+        // no-cache: revalidate every load, so a rebuilt catalog is picked up right away
+        const catalogRes = await fetch('./data/catalog.json', {cache: 'no-cache'});
+        if (catalogRes.ok) {
+            const catalog = await catalogRes.json();
+            personasData = catalog.personas;
+            promptsData = catalog.prompts;
+            catalogHash = catalog.hash;
+            renderCards();
+            return;
+        }
+    } catch (error) { console.warn("Catalog not available, loading raw data:", error); }
     try {
         const [personasRes, promptsRes] = await Promise.all([
             fetch('./data/personas.json'),
@@ -448,9 +462,12 @@ async function generateAiApp() {
     const promptTemplate = promptsData.find(p => p.id === selectedPromptId);
     
     const promptData = {
+        personaId: persona.id,
+        templateId: promptTemplate.id,
         persona: persona.system_prompt[currentLanguage],
         template: promptTemplate.base_prompt[currentLanguage], 
-        content: aiPromptInput.value.trim()
+        content: aiPromptInput.value.trim(),
+        catalogHash: catalogHash
     };
     
     const loadingMessage = document.querySelector('#loading-spinner p');
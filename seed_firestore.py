@@ -0,0 +1,221 @@
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import datetime
+
+import firestore_emulator as fe
+
+# Where --snapshot exports go by default (one sub folder per snapshot name)
+SEEDS_DIR = ".emulator_seeds"
+COLLECTIONS = ("teachers", "work_sessions", "community_apps", "generations")
+
+_SUBJECTS = [("Math", "Fractions"), ("Math", "Geometry"), ("Science", "Ecosystems"), ("Science", "Magnets"),
+             ("English", "Phonics"), ("History", "Ancient Egypt"), ("Hebrew", "Reading comprehension"),
+             ("Geography", "Rivers"), ("Art", "Colour mixing"), ("Music", "Rhythm")]
+_GRADES = ["Grade 1", "Grade 2", "Grade 3", "Grade 4", "Grade 5", "Grade 6", "כיתה ג'", "כיתה ה'"]
+_PERSONAS = ["socratic_teacher", "coach", "demonstrator", "storyteller"]
+_TEMPLATES = ["quiz", "drag-and-drop", "story", "simulation"]
+_ID_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def _auto_id(rng):
+    """20-char id shaped like Firestore's auto ids"""
+    return "".join(rng.choice(_ID_CHARS) for _ in range(20))
+
+
+def _html(rng, size):
+    filler = "<p>" + " ".join(rng.choice(("lorem", "ipsum", "dolor", "sit", "amet", "quiz", "answer"))
+                               for _ in range(12)) + "</p>"
+    return "<!DOCTYPE html><html><body>" + filler * max(1, size // len(filler)) + "</body></html>"
+
+
+class Generator:
+    """
+    Deterministic synthetic documents: the same seed and counts always give the same data.
+
+    Users are shared across collections so per-user queries (getUserWorkSessions)
+    see realistic fan-out; timestamps spread over the last `days` days.
+    """
+
+    def __init__(self, seed=0, users=1000, html_bytes=4000, days=365):
+        self.seed, self.html_bytes, self.days = seed, html_bytes, days
+        rng = random.Random(f"{seed}:users")
+        self.users = [(f"uid-{_auto_id(rng)[:12]}", f"teacher{i}@example.com") for i in range(users)]
+        self.now = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+    def _rng(self, collection, i):
+        # per-document RNG: any range of documents can be regenerated independently
+        return random.Random(f"{self.seed}:{collection}:{i}")
+
+    def _when(self, rng):
+        return self.now - datetime.timedelta(seconds=rng.randrange(self.days * 86400))
+
+    def teachers(self, i):
+        rng = self._rng("teachers", i)
+        uid, email = self.users[i % len(self.users)]
+        return _auto_id(rng), {
+            "profile": {"email": email, "name": f"Teacher {i}", "schoolCode": f"{rng.randrange(10 ** 9):09d}"},
+            "uid": uid,
+            "createdAt": self._when(rng),
+        }
+
+    def _app(self, rng):
+        domain, sub = rng.choice(_SUBJECTS)
+        return {"htmlCode": _html(rng, self.html_bytes),
+                "metadata": {"appName": f"{sub} {rng.choice(_TEMPLATES)}", "gradeLevel": rng.choice(_GRADES),
+                             "domain": domain, "subDomain": sub,
+                             "pedagogicalExplanation": f"Practice {sub.lower()} through play."}}
+
+    def work_sessions(self, i):
+        rng = self._rng("work_sessions", i)
+        uid, _ = rng.choice(self.users)
+        created = self._when(rng)
+        return _auto_id(rng), {
+            "uid": uid,
+            "sessionName": f"Session {i}",
+            "currentApp": self._app(rng),
+            "originalPrompt": f"Make a {rng.choice(_TEMPLATES)} about {rng.choice(_SUBJECTS)[1]}",
+            "sessionHistory": [{"type": rng.choice(("user", "ai")), "message": f"step {n}"}
+                               for n in range(rng.randrange(6))],
+            "createdAt": created,
+            "lastUpdated": created + datetime.timedelta(seconds=rng.randrange(7 * 86400)),
+            "status": "active",
+        }
+
+    def community_apps(self, i):
+        rng = self._rng("community_apps", i)
+        uid, email = rng.choice(self.users)
+        app = self._app(rng)["metadata"]
+        return _auto_id(rng), {
+            "appName": app["appName"], "gradeLevel": app["gradeLevel"], "domain": app["domain"],
+            "subDomain": app["subDomain"], "pedagogicalExplanation": app["pedagogicalExplanation"],
+            "app_url": f"https://firebasestorage.googleapis.com/v0/b/demo/o/apps%2F{uid}%2F{i}%2Findex.html",
+            "teacher_uid": uid,
+            "teacher_name": email,
+            "createdAt": self._when(rng),
+            "schoolCode": f"{rng.randrange(10 ** 9):09d}",
+        }
+
+    def generations(self, i):
+        rng = self._rng("generations", i)
+        uid, _ = rng.choice(self.users)
+        return _auto_id(rng), {
+            "uid": uid,
+            "prompt": {"personaId": rng.choice(_PERSONAS), "templateId": rng.choice(_TEMPLATES),
+                       "content": f"Topic {rng.choice(_SUBJECTS)[1]}"},
+            "currentApp": None,
+            "isRefinement": rng.random() < 0.3,
+            "language": rng.choice(("English", "Hebrew")),
+            "response": self._app(rng),
+            "createdAt": self._when(rng),
+            "model": "gemini-2.5-flash",
+        }
+
+
+async def seed(counts, project, port=fe.FIRESTORE_PORT, concurrency=8, batch_size=fe.MAX_BATCH,
+               generator=None, progress_every=2.0):
+    """
+    Writes counts[collection] generated documents per collection through batched commits.
+
+    Batches are produced lazily into a bounded queue drained by `concurrency`
+    connections, so memory stays flat however many documents are asked for.
+
+    Returns:
+        dict: documents written per collection, total, seconds, docs_per_s
+    """
+    generator = generator or Generator()
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    written = {name: 0 for name in counts}
+    start = time.perf_counter()
+    last_report = [start]
+    total = sum(counts.values())
+
+    async def produce():
+        for collection, count in counts.items():
+            make = getattr(generator, collection)
+            for first in range(0, count, batch_size):
+                docs = [make(i) for i in range(first, min(first + batch_size, count))]
+                await queue.put((collection, docs))
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def consume():
+        client = fe.EmulatorClient(project, port)
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                collection, docs = item
+                await client.set_documents(collection, docs)
+                written[collection] += len(docs)
+                now = time.perf_counter()
+                if now - last_report[0] >= progress_every:
+                    last_report[0] = now
+                    done = sum(written.values())
+                    print(f"  {done:,}/{total:,} docs ({100 * done / total:.0f}%), "
+                          f"{done / (now - start):,.0f} docs/s", flush=True)
+        finally:
+            await client.close()
+
+    await asyncio.gather(produce(), *(consume() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    done = sum(written.values())
+    return {"written": written, "total": done, "seconds": elapsed, "docs_per_s": done / elapsed if elapsed else 0.0}
+
+
+def main(argv=None):
+    """Main function to run the script"""
+    parser = argparse.ArgumentParser(description="Seed the Firestore emulator with synthetic, deterministic data")
+    parser.add_argument("--work-sessions", type=int, default=10000)
+    parser.add_argument("--community-apps", type=int, default=2000)
+    parser.add_argument("--generations", type=int, default=10000)
+    parser.add_argument("--teachers", type=int, default=500)
+    parser.add_argument("--users", type=int, default=1000, help="distinct users the documents belong to")
+    parser.add_argument("--html-bytes", type=int, default=4000, help="approximate size of each generated app")
+    parser.add_argument("--seed", type=int, default=0, help="same seed + counts = same documents")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="parallel commit connections")
+    parser.add_argument("--batch-size", type=int, default=fe.MAX_BATCH, help=f"writes per commit (max {fe.MAX_BATCH})")
+    parser.add_argument("--port", type=int, default=fe.FIRESTORE_PORT, help="Firestore emulator port")
+    parser.add_argument("--project", help="project id (default: from .firebaserc)")
+    parser.add_argument("--clear", action="store_true", help="delete all emulator documents first")
+    parser.add_argument("--snapshot", metavar="NAME",
+                        help=f"afterwards, export the emulators to {SEEDS_DIR}/NAME (for --import)")
+    parser.add_argument("--hub-port", type=int, default=fe.HUB_PORT, help="emulator hub port (for --snapshot)")
+    args = parser.parse_args(argv)
+
+    project = args.project or fe.project_id()
+    counts = {"teachers": args.teachers, "work_sessions": args.work_sessions,
+              "community_apps": args.community_apps, "generations": args.generations}
+    counts = {name: n for name, n in counts.items() if n > 0}
+    batch_size = max(1, min(args.batch_size, fe.MAX_BATCH))
+
+    try:
+        if args.clear:
+            fe.clear_database(project, args.port)
+            print(f"Cleared the emulator database of '{project}'")
+        print(f"Seeding '{project}' on port {args.port}: " + ", ".join(f"{n:,} {c}" for c, n in counts.items())
+              + f" (seed {args.seed}, {args.concurrency} connections, {batch_size} per batch)", flush=True)
+        result = asyncio.run(seed(counts, project, args.port, args.concurrency, batch_size,
+                                  Generator(args.seed, args.users, args.html_bytes)))
+    except (OSError, RuntimeError) as e:
+        print(f"Error: {e} (is the Firestore emulator running on port {args.port}?)")
+        return 1
+    print(f"Wrote {result['total']:,} documents in {result['seconds']:.1f}s ({result['docs_per_s']:,.0f} docs/s)")
+
+    if args.snapshot:
+        path = os.path.join(SEEDS_DIR, args.snapshot)
+        try:
+            fe.export_snapshot(path, args.hub_port)
+        except (OSError, RuntimeError) as e:
+            print(f"Error: snapshot failed: {e}")
+            return 1
+        print(f"Snapshot saved - start with: firebase emulators:start --import={path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,10 +5,21 @@ startDev.py — GUI לניהול פיתוח/דיפלוי של Firebase + אינ
 
 יכולות:
 - אמולטורים מקומיים: Hosting / Functions / Firestore / Auth (חלון אחד)
+  * זיהוי מתי כל אמולטור באמת עונה (זמן עלייה לכל שירות נשמר בין ריצות), ופתיחת הדפדפן רק אז
+  * יצירת נתוני Firestore סינתטיים בהיקף גדול (seed קבוע) ושמירתם כ-snapshot לטעינה חוזרת
+  * ייצוא/ייבוא collections של Firestore כ-JSONL דחוס (gzip/zstd), בהזרמה ועם המשך מנקודת עצירה
+  * שרת סטטי מהיר ל-public (לפי firebase.json) עם cache בזיכרון ו-live reload, בלי לחכות לאמולטור ה-hosting
+  * Gemini stand-in מקומי (latency / 429 / timeouts) כדי למדוד את askVibeAI בלי רשת
 - Deploy: hosting בלבד, functions בלבד, או שניהם יחד
+  * build של ה-hosting (קטלוג personas/prompts, bundles של locales + בדיקת מפתחות חסרים, מיניפיקציה + fingerprint + cache headers) לפני deploy
+  * deploy רק של מה שהשתנה מאז ה-deploy האחרון ל-alias (כולל functions בודדות)
 - בחירת alias של פרויקט (מתוך .firebaserc אם קיים)
 - לוג חי + פתיחת קישורי localhost/UI ו-production
+- טבלת מדדים חיה לכל function מתוך לוג האמולטור (count, p50/p95, שגיאות) עם ייצוא ל-CSV
+- Load test ל-callable functions על האמולטור (p50/p95/p99, שגיאות, throughput, השוואה לריצה קודמת)
+- הרצת כמה jobs במקביל (אמולטורים / deploy / git), עם עצירה/הפעלה מחדש וסינון לוג לכל job
 - אינטגרציית Git:
+  * סטטוס חי (staged / unstaged / untracked, ahead/behind) שמתעדכן אוטומטית
   * git status / pull / add-commit-push (בחירת branch + הודעת קומיט)
   * Trigger CI: יצירת empty commit + push
   * פתיחת דף ה-Actions של הרפו (נשלף אוטומטית מ-remote.origin.url)
@@ -22,15 +33,35 @@ startDev.py — GUI לניהול פיתוח/דיפלוי של Firebase + אינ
   python startDev.py
 """
 
+import asyncio
+import codecs
 import json
+import locale
+import logging
 import os
 import re
+import signal
+import socket
 import subprocess
+import sys
 import threading
+import time
 import queue
 import webbrowser
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+
+import build_catalog
+import deploy_planner
+import emulator_metrics
+import seed_firestore
+import firestore_snapshot
+import gemini_standin
+import load_test
+import dev_server
 
 APP_TITLE = "Vibe Studio — Dev & Deploy (with Git)"
 DEFAULT_PORTS = {
@@ -39,7 +70,87 @@ DEFAULT_PORTS = {
     "firestore": 8080,
     "auth": 9099,
     "ui": 4000,
+    "gemini": gemini_standin.DEFAULT_PORT,
+    "devserver": dev_server.DEFAULT_PORT,
+}
+
+# Log view limits: the Text widget keeps at most LOG_MAX_LINES lines and is
+# trimmed in one bulk delete once it overshoots by LOG_TRIM_SLACK lines.
+LOG_MAX_LINES = 5000
+LOG_MIN_LINES = 100  # smallest "Max lines" setting
+LOG_TRIM_SLACK = 500
+LOG_SPILL_PATH = os.path.join(".dev_logs", "startDev.log")
+LOG_SPILL_BYTES = 5 * 1024 * 1024
+LOG_SPILL_BACKUPS = 5
+
+# Output draining: the reader thread hands over whatever the pipe has ready
+# (up to READ_CHUNK_BYTES) as one chunk; each GUI tick applies at most
+# POLL_MAX_LINES lines / POLL_BUDGET_S seconds of work in a single insert.
+READ_CHUNK_BYTES = 64 * 1024
+POLL_MAX_LINES = 2000
+POLL_BUDGET_S = 0.015
+TICK_MIN_MS = 20
+TICK_MAX_MS = 250
+LOG_FILTER_ALL = "All jobs"
+
+# Stopping a job: interrupt its whole process group, give it STOP_GRACE_S to
+# exit (the emulators export their data on the way out), then kill the tree
+# and wait up to PORT_RELEASE_TIMEOUT_S for its ports to be released.
+STOP_GRACE_S = 15
+PORT_RELEASE_TIMEOUT_S = 10
+EMULATOR_DATA_DIR = ".emulator_data"
+
+# Project metadata: each value is cached (in memory and in METADATA_CACHE_PATH)
+# together with the mtime/size of the files it is derived from, and reloaded in
+# the background only when one of those files changes.
+METADATA_CACHE_PATH = ".dev_cache.json"
+METADATA_SOURCES = {
+    "aliases": (".firebaserc",),
+    "public_dir": ("firebase.json",),
+    "repo_web": (os.path.join(".git", "config"),),
+    "branch": (os.path.join(".git", "HEAD"),),
 }
+METADATA_CHECK_MS = 2000
+
+# Live git status: .git metadata is polled cheaply every GIT_WATCH_MS and a
+# change triggers `git status` after GIT_STATUS_DEBOUNCE_S of quiet. Work-tree
+# edits are picked up by a periodic status whose interval scales with its cost
+# (GIT_STATUS_COST_FACTOR x last run time), so big repos are polled less often.
+GIT_WATCH_MS = 500
+GIT_WATCH_FILES = ("index", "HEAD", "ORIG_HEAD", "FETCH_HEAD", "MERGE_HEAD", "packed-refs",
+                   os.path.join("refs", "heads"), os.path.join("refs", "remotes"))
+GIT_STATUS_DEBOUNCE_S = 0.3
+GIT_STATUS_COST_FACTOR = 20
+GIT_STATUS_MIN_INTERVAL_S = 5
+GIT_STATUS_MAX_INTERVAL_S = 120
+GIT_STATUS_TIMEOUT_S = 60
+GIT_STATUS_MAX_ROWS = 500
+
+# Emulator readiness: after a start each selected emulator's port is probed with a
+# plain HTTP request (bound is not enough - it has to answer) until it responds or
+# EMULATOR_READY_TIMEOUT_S passes. Time-to-ready per service is appended to
+# EMULATOR_TIMINGS_PATH (last EMULATOR_TIMINGS_KEEP runs) to spot boot regressions.
+EMULATOR_READY_MS = 250
+EMULATOR_READY_TIMEOUT_S = 180
+EMULATOR_PROBE_INTERVAL_S = (0.1, 1.0)  # first / longest gap between probes of one port
+EMULATOR_TIMINGS_PATH = os.path.join(".dev_logs", "emulator_startup.json")
+EMULATOR_TIMINGS_KEEP = 50
+# Functions metrics table (parsed from the emulator output) is redrawn at most this often
+METRICS_REFRESH_MS = 1000
+_EMULATOR_ALL_READY_RE = re.compile(r"All emulators ready", re.IGNORECASE)
+_EMULATOR_FAILED_RE = re.compile(r"\b(hosting|functions|firestore|auth|ui)\b.*"
+                                 r"(could not start|port \d+ is not open|is taken|already in use)", re.IGNORECASE)
+
+if os.name == "nt":
+    _NEW_GROUP_KWARGS = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    _NEW_GROUP_KWARGS = {"start_new_session": True}
+
+_LOG_TAG_PATTERNS = (
+    ("error", re.compile(r"error|failed|fatal", re.IGNORECASE)),
+    ("warning", re.compile(r"warn", re.IGNORECASE)),
+    ("success", re.compile(r"success|completed|deployed", re.IGNORECASE)),
+)
 
 # ------------------------- helpers -------------------------
 
@@ -91,6 +202,14 @@ def detect_repo_web_url() -> str:
 
 def get_current_branch():
     """זיהוי אוטומטי של Branch נוכחי"""
+    # fast path: read .git/HEAD directly instead of spawning git
+    try:
+        with open(os.path.join(".git", "HEAD"), "r", encoding="utf-8") as f:
+            head = f.read().strip()
+        if head.startswith("ref: refs/heads/"):
+            return head[len("ref: refs/heads/"):]
+    except OSError:
+        pass  # worktree / submodule: .git is a file
     try:
         branch = run_capture("git branch --show-current").strip()
         return branch or "main"
@@ -98,6 +217,304 @@ def get_current_branch():
         return "main"
 
 
+class ProjectMetadata:
+    """Aliases / public dir / repo URL / branch, loaded concurrently off the Tk thread.
+
+    Values from the previous run are available immediately when their source
+    files are unchanged; ``refresh`` reloads only the stale ones in the background
+    and ``collect`` returns the keys whose loads have finished since.
+    """
+
+    LOADERS = {
+        "aliases": find_project_aliases,
+        "public_dir": detect_public_dir,
+        "repo_web": detect_repo_web_url,
+        "branch": get_current_branch,
+    }
+
+    def __init__(self, cache_path=METADATA_CACHE_PATH):
+        self.cache_path = cache_path
+        self.values = {}
+        self._stamps = {}
+        self._pending = {}
+        self._pool = ThreadPoolExecutor(max_workers=len(self.LOADERS), thread_name_prefix="metadata")
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            for key, entry in cached.items():
+                if key in self.LOADERS and entry.get("stamp") == self._stamp(key):
+                    self.values[key] = entry["value"]
+                    self._stamps[key] = entry["stamp"]
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    @staticmethod
+    def _stamp(key):
+        stamp = []
+        for path in METADATA_SOURCES[key]:
+            try:
+                st = os.stat(path)
+                stamp.append([st.st_mtime_ns, st.st_size])
+            except OSError:
+                stamp.append(None)
+        return stamp
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    @property
+    def loading(self):
+        return bool(self._pending)
+
+    def refresh(self):
+        """Start background loads for values whose source files changed"""
+        for key, loader in self.LOADERS.items():
+            if key in self._pending:
+                continue
+            stamp = self._stamp(key)
+            if stamp != self._stamps.get(key):
+                self._pending[key] = (stamp, self._pool.submit(loader))
+
+    def collect(self):
+        """Apply finished loads; returns the keys whose value changed"""
+        changed = []
+        for key, (stamp, future) in list(self._pending.items()):
+            if not future.done():
+                continue
+            del self._pending[key]
+            try:
+                value = future.result()
+            except Exception:
+                continue
+            self._stamps[key] = stamp
+            if self.values.get(key) != value:
+                self.values[key] = value
+                changed.append(key)
+        if changed:
+            self._save()
+        return changed
+
+    def _save(self):
+        try:
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump({key: {"value": value, "stamp": self._stamps.get(key)}
+                           for key, value in self.values.items()}, f, indent=2)
+        except OSError:
+            pass
+
+
+def parse_git_status_v2(out: str) -> dict:
+    """פענוח הפלט של git status --porcelain=v2 -z --branch"""
+    status = {"branch": None, "oid": None, "upstream": None, "ahead": 0, "behind": 0,
+              "staged": [], "unstaged": [], "untracked": [], "conflicts": []}
+    records = out.split("\0")
+    i = 0
+    while i < len(records):
+        rec = records[i]
+        i += 1
+        if not rec:
+            continue
+        kind = rec[0]
+        if rec.startswith("# "):
+            key, _, value = rec[2:].partition(" ")
+            if key == "branch.head":
+                status["branch"] = value
+            elif key == "branch.oid":
+                status["oid"] = value
+            elif key == "branch.upstream":
+                status["upstream"] = value
+            elif key == "branch.ab":
+                ahead, behind = value.split()
+                status["ahead"], status["behind"] = int(ahead), abs(int(behind))
+        elif kind in "12":
+            # 1 XY sub mH mI mW hH hI path / 2 XY sub mH mI mW hH hI Xscore path\0origPath
+            fields = rec.split(" ", 8 if kind == "1" else 9)
+            xy, path = fields[1], fields[-1]
+            if kind == "2" and i < len(records):
+                path = f"{records[i]} -> {path}"
+                i += 1
+            if xy[0] != ".":
+                status["staged"].append((xy[0], path))
+            if xy[1] != ".":
+                status["unstaged"].append((xy[1], path))
+        elif kind == "u":
+            fields = rec.split(" ", 10)
+            status["conflicts"].append((fields[1], fields[-1]))
+        elif kind == "?":
+            status["untracked"].append(("?", rec[2:]))
+    return status
+
+
+class GitStatusWatcher:
+    """Keeps a parsed `git status` up to date without running it more than needed.
+
+    ``poll`` is cheap (a few stats) and is meant to be called from the Tk loop;
+    git itself runs on a background thread, one run at a time.
+    """
+
+    def __init__(self, git_dir=".git"):
+        self.git_dir = git_dir
+        self.status = None
+        self.error = None
+        self.cost = 0.0
+        self._stamp = None
+        self._changed_at = None
+        self._last_run = 0.0
+        self._thread = None
+        self._result = None
+
+    @property
+    def interval(self):
+        return min(max(self.cost * GIT_STATUS_COST_FACTOR, GIT_STATUS_MIN_INTERVAL_S), GIT_STATUS_MAX_INTERVAL_S)
+
+    def _git_stamp(self):
+        stamp = []
+        for name in GIT_WATCH_FILES:
+            try:
+                st = os.stat(os.path.join(self.git_dir, name))
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append(None)
+        return stamp
+
+    def request(self):
+        """Refresh as soon as possible (e.g. after a git job finished)"""
+        self._changed_at = time.monotonic() - GIT_STATUS_DEBOUNCE_S
+
+    def poll(self):
+        """Returns True when a new status (or error) is available"""
+        now = time.monotonic()
+        if self._thread is not None:
+            if self._thread.is_alive():
+                return False
+            self._thread = None
+            self.status, self.error, self.cost = self._result
+            return True
+
+        stamp = self._git_stamp()
+        if stamp != self._stamp:
+            self._stamp = stamp
+            self._changed_at = now
+        debounced = self._changed_at is not None and now - self._changed_at >= GIT_STATUS_DEBOUNCE_S
+        if debounced or now - self._last_run >= self.interval:
+            self._changed_at = None
+            self._last_run = now
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return False
+
+    def _run(self):
+        t0 = time.perf_counter()
+        try:
+            proc = subprocess.run(["git", "status", "--porcelain=v2", "-z", "--branch"],
+                                  stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=GIT_STATUS_TIMEOUT_S)
+            if proc.returncode != 0:
+                raise RuntimeError(proc.stderr.decode("utf-8", "replace").strip() or "git status failed")
+            result = (parse_git_status_v2(proc.stdout.decode("utf-8", "replace")), None)
+        except Exception as e:
+            result = (None, str(e))
+        self._result = result + (time.perf_counter() - t0,)
+
+
+class EmulatorReadiness:
+    """Probes the emulators' ports (asyncio, on a background thread) until each one answers.
+
+    ``feed`` takes emulator log lines (for the CLI's own "all ready" line and
+    start failures); ``snapshot`` is cheap and meant for the Tk loop.
+    """
+
+    def __init__(self, services, run, wait_release=False):
+        self.services = dict(services)  # name -> port
+        self.run = run  # the emulators job's run (ProcRunner.runs) being timed
+        self.releasing = wait_release
+        self.started = time.monotonic()
+        self.ready = {}    # name -> seconds to ready
+        self.failed = {}   # name -> reason
+        self.log_ready = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._probe_all()), daemon=True)
+        self._thread.start()
+
+    @property
+    def done(self):
+        return len(self.ready) + len(self.failed) >= len(self.services)
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def cancelled(self):
+        return self._stop.is_set()
+
+    def cancel(self):
+        self._stop.set()
+
+    def feed(self, text):
+        if self.log_ready is None and _EMULATOR_ALL_READY_RE.search(text):
+            self.log_ready = self.elapsed()
+        m = _EMULATOR_FAILED_RE.search(text)
+        if m and m.group(1).lower() in self.services and m.group(1).lower() not in self.ready:
+            self.failed.setdefault(m.group(1).lower(), text.strip()[:120])
+
+    def snapshot(self):
+        """name -> ("ready", seconds) / ("failed", reason) / ("waiting", seconds so far)"""
+        now = self.elapsed()
+        return {name: ("ready", self.ready[name]) if name in self.ready else
+                      ("failed", self.failed[name]) if name in self.failed else ("waiting", now)
+                for name in self.services}
+
+    async def _answers(self, port):
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection("localhost", port), 1.0)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        try:
+            writer.write(b"GET / HTTP/1.0\r\nHost: localhost\r\n\r\n")
+            return (await asyncio.wait_for(reader.readline(), 2.0)).startswith(b"HTTP/")
+        except (OSError, asyncio.TimeoutError):
+            return False
+        finally:
+            writer.close()
+
+    async def _probe_all(self):
+        if self.releasing:
+            # Restart: the old emulators still answer until they exit; time from their release
+            while not self._stop.is_set() and any(port_in_use(p) for p in self.services.values()):
+                await asyncio.sleep(EMULATOR_PROBE_INTERVAL_S[0])
+            self.started = time.monotonic()
+            self.releasing = False
+        await asyncio.gather(*(self._probe(name, port) for name, port in self.services.items()))
+
+    async def _probe(self, name, port):
+        delay = EMULATOR_PROBE_INTERVAL_S[0]
+        while not self._stop.is_set() and name not in self.failed:
+            if await self._answers(port):
+                self.ready[name] = self.elapsed()
+                return
+            if self.elapsed() > EMULATOR_READY_TIMEOUT_S:
+                self.failed[name] = f"no answer on port {port} after {EMULATOR_READY_TIMEOUT_S}s"
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, EMULATOR_PROBE_INTERVAL_S[1])
+
+
+def load_emulator_timings():
+    try:
+        with open(EMULATOR_TIMINGS_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def save_emulator_timings(runs):
+    try:
+        os.makedirs(os.path.dirname(EMULATOR_TIMINGS_PATH), exist_ok=True)
+        with open(EMULATOR_TIMINGS_PATH, "w", encoding="utf-8") as f:
+            json.dump(runs[-EMULATOR_TIMINGS_KEEP:], f, indent=2)
+    except OSError:
+        pass
+
+
 def load_preferences():
     """טען העדפות שמורות"""
     try:
@@ -116,65 +533,360 @@ def save_preferences(prefs):
         print(f"Failed to save preferences: {e}")
 
 
+def port_in_use(port, host="localhost"):
+    try:
+        with socket.create_connection((host, port), timeout=0.2):
+            return True
+    except OSError:
+        return False
+
+
+def wait_ports_free(ports, timeout=PORT_RELEASE_TIMEOUT_S):
+    """המתנה לשחרור פורטים; מחזיר את הפורטים שעדיין תפוסים"""
+    deadline = time.monotonic() + timeout
+    while True:
+        busy = [p for p in ports if port_in_use(p)]
+        if not busy or time.monotonic() > deadline:
+            return busy
+        time.sleep(0.2)
+
+
+def signal_process_tree(proc, force=False):
+    """שליחת סיגנל לכל עץ התהליכים של job (ולא רק ל-shell)"""
+    try:
+        if os.name == "nt":
+            if force:
+                subprocess.run(f"taskkill /T /F /PID {proc.pid}", shell=True,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            else:
+                proc.send_signal(signal.CTRL_BREAK_EVENT)
+        else:
+            os.killpg(proc.pid, signal.SIGKILL if force else signal.SIGINT)
+    except OSError:
+        pass  # group already gone
+
+
+def classify_log_line(s: str):
+    """צביעה לפי תוכן: error > warning > success"""
+    for tag, pattern in _LOG_TAG_PATTERNS:
+        if pattern.search(s):
+            return tag
+    return None
+
+
+class LogModel:
+    """Ring buffer of (text, tag, job) log entries, optionally spilled to a rotating file.
+
+    Memory stays bounded by ``max_lines`` no matter how long a process runs;
+    the full history, when wanted, lives on disk in ``LOG_SPILL_PATH``.
+    """
+
+    def __init__(self, max_lines=LOG_MAX_LINES):
+        self.entries = deque(maxlen=max_lines)
+        self.total = 0
+        self._spill = None
+
+    @property
+    def max_lines(self):
+        return self.entries.maxlen
+
+    def set_max_lines(self, max_lines):
+        self.entries = deque(self.entries, maxlen=max(LOG_MIN_LINES, int(max_lines)))
+
+    def append(self, text, tag=None, job=None):
+        self.extend([(text, tag)], job)
+
+    def extend(self, entries, job=None):
+        self.entries.extend((text, tag, job) for text, tag in entries)
+        self.total += len(entries)
+        if self._spill:
+            prefix = f"[{job}] " if job else ""
+            self._spill.emit(logging.makeLogRecord({"msg": "".join(prefix + text for text, _ in entries)}))
+
+    def clear(self):
+        self.entries.clear()
+
+    @property
+    def spilling(self):
+        return self._spill is not None
+
+    def enable_spill(self, path=LOG_SPILL_PATH):
+        if self._spill:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        handler = RotatingFileHandler(path, maxBytes=LOG_SPILL_BYTES,
+                                      backupCount=LOG_SPILL_BACKUPS, encoding="utf-8")
+        handler.terminator = ""
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self._spill = handler
+
+    def disable_spill(self):
+        if self._spill:
+            self._spill.close()
+            self._spill = None
+
+
 class ProcRunner:
-    def __init__(self, append_log_cb, status_cb):
+    """A single named subprocess job: reader thread, output queue and exit code"""
+
+    def __init__(self, name, append_batch_cb, status_cb, exit_cb=None, restart_failed_cb=None):
+        self.name = name
         self.proc = None
-        self.append = append_log_cb
+        self.cmd = None
+        self.cwd = None
+        self.ports = ()
+        self.exit_code = None
+        self.runs = 0  # processes started so far; tells one run's exit from the next one's
+        self._stopping = False
+        self._then_restart = False
+        self._restart_cmd = None
+        self._restart_due = False
+        self._exited = None
+        self.append_batch = append_batch_cb
         self.set_status = status_cb
+        self.on_exit = exit_cb or (lambda job: None)
+        self.on_restart_failed = restart_failed_cb or (lambda job, reason: None)
         self.q = queue.Queue()
         self.reader_thread = None
+        self._backlog = deque()
 
-    def run(self, cmd, cwd=None, timeout=300):
-        if self.proc and self.proc.poll() is None:
-            self.append("Another process is running. Stop it first.\n", "warning")
-            return
-        
+    @property
+    def running(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    @property
+    def pending(self):
+        """Chunks waiting in the queue + lines already split but not yet shown"""
+        return self.q.qsize() + len(self._backlog)
+
+    def append(self, text, tag=None):
+        self.append_batch(self.name, [(text, tag)])
+
+    def run(self, cmd, cwd=None, timeout=300, ports=None):
+        if self.running:
+            self.append(f"Job '{self.name}' is already running. Stop it first.\n", "warning")
+            return False
+
+        self.cmd, self.cwd, self.exit_code = cmd, cwd, None
+        if ports is not None:
+            self.ports = tuple(ports)
         self.append(f"$ {cmd}\n", "command")
-        self.set_status(f"Running: {cmd[:50]}...")
-        
+        self.set_status(f"[{self.name}] Running: {cmd[:50]}...")
+
         self.proc = subprocess.Popen(
             cmd,
             cwd=cwd,
             shell=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            bufsize=1,
-            universal_newlines=True,
+            **_NEW_GROUP_KWARGS,
         )
-        self.reader_thread = threading.Thread(target=self._pump, daemon=True)
+        self.runs += 1
+        self.reader_thread = threading.Thread(target=self._pump, args=(self.proc,), daemon=True)
         self.reader_thread.start()
+        return True
 
-    def _pump(self):
+    def _pump(self, proc):
+        """Read whatever the pipe has ready and queue it as whole-line chunks"""
+        decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))(errors="replace")
+        carry = ""
         try:
-            for line in self.proc.stdout:
-                self.q.put(("output", line))
-            self.q.put(("status", "Process completed"))
+            while True:
+                data = proc.stdout.read1(READ_CHUNK_BYTES)
+                if not data:
+                    break
+                text = carry + decoder.decode(data)
+                # a trailing \r may be the first half of \r\n - keep it for the next read
+                hold = "\r" if text.endswith("\r") else ""
+                text = text[:len(text) - len(hold)].replace("\r\n", "\n").replace("\r", "\n")
+                cut = text.rfind("\n") + 1
+                carry = text[cut:] + hold
+                if cut:
+                    self.q.put(("output", text[:cut]))
+            tail = (carry + decoder.decode(b"", final=True)).replace("\r", "\n")
+            if tail:
+                self.q.put(("output", tail))
         except Exception as e:
             self.q.put(("error", f"[reader error] {e}\n"))
         finally:
-            self.q.put(("status", "Ready"))
+            self.q.put(("exit", (proc, proc.wait())))
+
+    def poll_log(self, max_lines=POLL_MAX_LINES, deadline=None):
+        """Apply queued output as one batch, within the per-tick budget.
 
-    def poll_log(self):
+        Returns the number of lines applied; anything over budget stays in
+        the backlog for the next tick.
+        """
+        exited, self._exited = self._exited, None
         try:
-            while True:
+            # stop at a restart: the old run's exit and output go out before the new run starts
+            while not self._restart_due:
                 msg_type, content = self.q.get_nowait()
                 if msg_type == "output":
-                    self.append(content)
+                    self._backlog.extend((line, None) for line in content.splitlines(True))
                 elif msg_type == "status":
                     self.set_status(content)
                 elif msg_type == "error":
-                    self.append(content, "error")
+                    self._backlog.append((content, "error"))
+                elif msg_type == "exit" and content[0] is self.proc:
+                    exited = content[1]
+                elif msg_type == "restart":
+                    self._restart_due = True
+                elif msg_type == "restart_failed":
+                    self._restart_failed(content)
         except queue.Empty:
             pass
 
-    def stop(self):
-        if self.proc and self.proc.poll() is None:
+        batch = []
+        deadline = deadline or time.perf_counter() + POLL_BUDGET_S
+        while self._backlog and len(batch) < max_lines:
+            batch.append(self._backlog.popleft())
+            if len(batch) % 256 == 0 and time.perf_counter() > deadline:
+                break
+        if batch:
+            self.append_batch(self.name, batch)
+        if exited is not None:
+            # report the exit only after the job's remaining output is shown
+            if self._backlog:
+                self._exited = exited
+            else:
+                self.exit_code = exited
+                self.on_exit(self)
+        if self._restart_due and self._exited is None and not self._backlog:
+            self._restart_due = False
+            self._start_again()
+        return len(batch)
+
+    def _start_again(self):
+        cmd, self._restart_cmd = self._restart_cmd, None
+        # a callable is only evaluated now, so it sees whatever the stop left behind (e.g. exported data)
+        cmd = cmd() if callable(cmd) else cmd or self.cmd
+        if not cmd:
+            self._restart_failed("no command to start")
+        elif not self.run(cmd, self.cwd):
+            self._restart_failed("the job is already running")
+
+    def _restart_failed(self, reason):
+        self._restart_cmd = None
+        self._backlog.append((f"[restart cancelled: {reason}]\n", "error"))
+        self.set_status(f"[{self.name}] Restart cancelled: {reason}")
+        self.on_restart_failed(self, reason)
+
+    def stop(self, then_restart=False):
+        """Stop the job's whole process tree in the background.
+
+        With ``then_restart`` the job is started again as soon as its ports
+        are free, instead of the user waiting and clicking Start again.
+        """
+        if not self.running:
+            if then_restart:
+                self.q.put(("restart", None))
+            return
+        if self._stopping:
+            # a stop is already on its way - restart once it is done instead of dropping the request
+            self._then_restart = self._then_restart or then_restart
+            return
+        self._stopping = True
+        self._then_restart = then_restart
+        self.set_status(f"[{self.name}] Stopping...")
+        threading.Thread(target=self._stop_tree, args=(self.proc,), daemon=True).start()
+
+    def _stop_tree(self, proc):
+        try:
+            t0 = time.monotonic()
+            signal_process_tree(proc)
             try:
-                self.proc.terminate()
-                self.set_status("Process terminated")
-            except Exception:
-                pass
-        self.proc = None
+                proc.wait(timeout=STOP_GRACE_S)
+            except subprocess.TimeoutExpired:
+                self.q.put(("error", f"[{self.name}] still running after {STOP_GRACE_S}s - killing process tree\n"))
+            # the shell may be gone while java/node children linger - always reap the group
+            signal_process_tree(proc, force=True)
+            busy = wait_ports_free(self.ports)
+            if busy:
+                self.q.put(("error", f"[{self.name}] ports still in use: {', '.join(map(str, busy))}\n"))
+                if self._then_restart:
+                    self.q.put(("restart_failed", f"ports still in use: {', '.join(map(str, busy))}"))
+                return
+            self.q.put(("status", f"[{self.name}] Process terminated ({time.monotonic() - t0:.1f}s)"))
+            if self._then_restart:
+                self.q.put(("restart", None))
+        finally:
+            self._stopping = self._then_restart = False
+
+    def restart(self, cmd=None, ports=None):
+        """Stop the job and start it again once its ports are free.
+
+        Args:
+            cmd: New command, or a callable returning it that is only called when
+                the job starts again (None = the last command).
+            ports: Ports the job listens on (None = unchanged).
+
+        Returns:
+            bool: False when there is nothing to restart.
+        """
+        if not (cmd or self.cmd):
+            return False
+        self._restart_cmd = cmd
+        if ports is not None:
+            self.ports = tuple(ports)
+        self.stop(then_restart=True)
+        return True
+
+
+class JobManager:
+    """Owns N named ProcRunner jobs and shares the per-tick drain budget between them"""
+
+    def __init__(self, append_batch_cb, status_cb, exit_cb=None, restart_failed_cb=None):
+        self.append_batch = append_batch_cb
+        self.set_status = status_cb
+        self.on_exit = exit_cb
+        self.on_restart_failed = restart_failed_cb
+        self.jobs = {}
+        self._rr = 0
+
+    def job(self, name):
+        if name not in self.jobs:
+            self.jobs[name] = ProcRunner(name, self.append_batch, self.set_status, self.on_exit,
+                                         self.on_restart_failed)
+        return self.jobs[name]
+
+    def is_running(self, name):
+        """Like job(name).running, without creating a job that was never started"""
+        return name in self.jobs and self.jobs[name].running
+
+    def run(self, name, cmd, cwd=None, ports=None):
+        return self.job(name).run(cmd, cwd, ports=ports)
+
+    def stop(self, name):
+        if name in self.jobs:
+            self.jobs[name].stop()
+
+    def stop_all(self):
+        for job in self.jobs.values():
+            job.stop()
+
+    def restart(self, name, cmd=None, ports=None):
+        return self.job(name).restart(cmd, ports)
+
+    @property
+    def running(self):
+        return [job for job in self.jobs.values() if job.running]
+
+    @property
+    def pending(self):
+        return sum(job.pending for job in self.jobs.values())
+
+    def poll(self):
+        """Poll every job round-robin so one chatty job can't starve the others"""
+        jobs = list(self.jobs.values())
+        if not jobs:
+            return 0
+        self._rr = (self._rr + 1) % len(jobs)
+        budget = POLL_MAX_LINES
+        deadline = time.perf_counter() + POLL_BUDGET_S
+        for job in jobs[self._rr:] + jobs[:self._rr]:
+            budget -= job.poll_log(max(budget, 0), deadline)
+        return POLL_MAX_LINES - budget
 
 # ------------------------- GUI -------------------------
 
@@ -184,20 +896,44 @@ class App(tk.Tk):
         self.title(APP_TITLE)
         self.geometry("1000x720")
 
-        self.aliases = find_project_aliases()
-        self.public_dir = detect_public_dir()
-        self.repo_web = detect_repo_web_url()
+        # cached metadata shows instantly; stale values are reloaded in the background
+        self.meta = ProjectMetadata()
+        self.aliases = self.meta.get("aliases", [])
+        self.public_dir = self.meta.get("public_dir", "...")
+        self.repo_web = self.meta.get("repo_web", "")
+        self.current_branch = self.meta.get("branch", "")
         self.prefs = load_preferences()
 
-        self.runner = ProcRunner(self._append_log, self._set_status)
+        self.log_model = LogModel(self.prefs.get("log_max_lines", LOG_MAX_LINES))
+        if self.prefs.get("log_spill"):
+            self.log_model.enable_spill()
+
+        self.jobs = JobManager(self._append_log_batch, self._set_status, self._on_job_exit,
+                               self._on_job_restart_failed)
         self.last_cmd = ""
 
         self._build_ui()
-        self.after(50, self._tick)  # Faster polling
+        self._tick_ms = TICK_MIN_MS
+        self._rate_lines = 0
+        self._rate_t0 = time.monotonic()
+        self.after(self._tick_ms, self._tick)  # Adaptive polling
         
         # Load saved preferences
         self._load_saved_prefs()
 
+        self._watch_metadata()
+
+        self.git_watch = GitStatusWatcher()
+        self._watch_git()
+
+        self.emu_ready = None
+        self.emu_timings = load_emulator_timings()
+
+        self.metrics = emulator_metrics.EmulatorMetrics()
+        self._metrics_shown = -1
+        self._watch_metrics()
+        self.open_when_ready = False
+
     def _set_status(self, text):
         """Update status bar"""
         self.status_bar.config(text=text)
@@ -214,6 +950,10 @@ class App(tk.Tk):
             self.var_functions.set(emu_prefs.get("functions", True))
             self.var_firestore.set(emu_prefs.get("firestore", False))
             self.var_auth.set(emu_prefs.get("auth", False))
+            self.var_persist.set(emu_prefs.get("persist_data", True))
+            self.var_gemini.set(emu_prefs.get("gemini_standin", False))
+        self.var_build.set(self.prefs.get("build_assets", True))
+        self.var_changed.set(self.prefs.get("deploy_changed_only", True))
 
     def _save_current_prefs(self):
         """Save current UI state to preferences"""
@@ -225,10 +965,56 @@ class App(tk.Tk):
                 "functions": self.var_functions.get(),
                 "firestore": self.var_firestore.get(),
                 "auth": self.var_auth.get(),
-            }
+                "persist_data": self.var_persist.get(),
+                "gemini_standin": self.var_gemini.get(),
+            },
+            "build_assets": self.var_build.get(),
+            "deploy_changed_only": self.var_changed.get(),
+        })
+        save_preferences(self.prefs)
+
+    def _apply_log_settings(self):
+        """Apply max-lines / spill settings from the log controls"""
+        try:
+            self.log_model.set_max_lines(self.log_max_var.get())
+        except (tk.TclError, ValueError):
+            self.log_max_var.set(self.log_model.max_lines)
+        if self.log_spill_var.get():
+            self.log_model.enable_spill()
+        else:
+            self.log_model.disable_spill()
+        self._trim_log_view(force=True)
+        self.prefs.update({
+            "log_max_lines": self.log_model.max_lines,
+            "log_spill": self.log_model.spilling,
         })
         save_preferences(self.prefs)
 
+    def _run_job(self, name, cmd, cwd=None, ports=None):
+        """Start a named job; other jobs keep running alongside it"""
+        started = self.jobs.run(name, cmd, cwd, ports)
+        self._refresh_jobs()
+        return started
+
+    def _on_job_exit(self, job):
+        ok = job.exit_code == 0
+        self._append_log_batch(job.name, [(f"[exited with code {job.exit_code}]\n", "success" if ok else "error")])
+        running = self.jobs.running
+        self._set_status(f"{len(running)} job(s) running" if running else "Ready")
+        self._refresh_jobs()
+        if job.name == "git":
+            self.git_watch.request()
+        # (on a restart the probe times the next run - the old run's exit is expected)
+        if job.name == "emulators" and self.emu_ready and not self.emu_ready.done and self.emu_ready.run == job.runs:
+            self.emu_ready.cancel()
+            self.emu_ready_label.config(text=f"Emulators: exited (code {job.exit_code}) before ready")
+
+    def _on_job_restart_failed(self, job, reason):
+        self._refresh_jobs()
+        if job.name == "emulators" and self.emu_ready and not self.emu_ready.done:
+            self.emu_ready.cancel()
+            self.emu_ready_label.config(text=f"Emulators: restart cancelled ({reason})")
+
     # UI construction
     def _build_ui(self):
         nb = ttk.Notebook(self)
@@ -254,6 +1040,33 @@ class App(tk.Tk):
         nb.add(self.tab_health, text="System Health")
         self._build_health_tab(self.tab_health)
 
+        # Tab 5: Function metrics
+        self.tab_metrics = ttk.Frame(nb)
+        nb.add(self.tab_metrics, text="Function Metrics")
+        self._build_metrics_tab(self.tab_metrics)
+
+        # Tab 6: Load Test
+        self.tab_load = ttk.Frame(nb)
+        nb.add(self.tab_load, text="Load Test")
+        self._build_load_tab(self.tab_load)
+
+        # Jobs (common)
+        jobsf = ttk.LabelFrame(self, text="Jobs")
+        jobsf.pack(fill="x", padx=10, pady=(8, 0))
+        self.jobs_tree = ttk.Treeview(jobsf, columns=("status", "command"), height=3)
+        self.jobs_tree.heading("#0", text="Job")
+        self.jobs_tree.heading("status", text="Status")
+        self.jobs_tree.heading("command", text="Command")
+        self.jobs_tree.column("#0", width=110, stretch=False)
+        self.jobs_tree.column("status", width=130, stretch=False)
+        self.jobs_tree.pack(side="left", fill="x", expand=True, padx=(6, 0), pady=4)
+        self.jobs_tree.bind("<Double-1>", lambda e: self._show_selected_job_log())
+        job_btns = ttk.Frame(jobsf)
+        job_btns.pack(side="left", padx=6)
+        ttk.Button(job_btns, text="Stop", command=self.stop_selected_job).pack(fill="x")
+        ttk.Button(job_btns, text="Restart", command=self.restart_selected_job).pack(fill="x")
+        ttk.Button(job_btns, text="Show log", command=self._show_selected_job_log).pack(fill="x")
+
         # Log area (common)
         logf = ttk.LabelFrame(self, text="Log")
         logf.pack(fill="both", expand=True, padx=10, pady=8)
@@ -262,6 +1075,19 @@ class App(tk.Tk):
         log_controls = ttk.Frame(logf)
         log_controls.pack(fill="x")
         ttk.Button(log_controls, text="Clear Log", command=self.clear_log).pack(side="right", padx=5, pady=2)
+        ttk.Label(log_controls, text="Show:").pack(side="left", padx=(5, 2))
+        self.log_filter_var = tk.StringVar(value=LOG_FILTER_ALL)
+        self.log_filter_cb = ttk.Combobox(log_controls, textvariable=self.log_filter_var,
+                                          values=[LOG_FILTER_ALL], width=16, state="readonly")
+        self.log_filter_cb.pack(side="left")
+        self.log_filter_cb.bind("<<ComboboxSelected>>", lambda e: self._rerender_log())
+        self.log_spill_var = tk.BooleanVar(value=self.log_model.spilling)
+        ttk.Checkbutton(log_controls, text=f"Save full log to {LOG_SPILL_PATH}", variable=self.log_spill_var,
+                        command=self._apply_log_settings).pack(side="right", padx=5)
+        self.log_max_var = tk.IntVar(value=self.log_model.max_lines)
+        ttk.Spinbox(log_controls, from_=LOG_MIN_LINES, to=200000, increment=1000, width=8,
+                    textvariable=self.log_max_var, command=self._apply_log_settings).pack(side="right")
+        ttk.Label(log_controls, text="Max lines:").pack(side="right", padx=(5, 2))
         
         self.log = tk.Text(logf, wrap="word", height=18)
         self.log.pack(fill="both", expand=True)
@@ -274,8 +1100,12 @@ class App(tk.Tk):
         self.log.tag_config("command", foreground="blue", font=("Consolas", 10, "bold"))
 
         # Status bar
-        self.status_bar = ttk.Label(self, text="Ready", relief="sunken")
-        self.status_bar.pack(side="bottom", fill="x")
+        status = ttk.Frame(self)
+        status.pack(side="bottom", fill="x")
+        self.status_bar = ttk.Label(status, text="Ready", relief="sunken")
+        self.status_bar.pack(side="left", fill="x", expand=True)
+        self.stats_label = ttk.Label(status, text="0 lines/s | queue: 0", relief="sunken", width=28)
+        self.stats_label.pack(side="right")
 
     def _build_emus_tab(self, root):
         top = ttk.LabelFrame(root, text="Local Emulators")
@@ -290,14 +1120,121 @@ class App(tk.Tk):
         ttk.Checkbutton(top, text="Functions (5001)", variable=self.var_functions).pack(side="left", padx=6, pady=6)
         ttk.Checkbutton(top, text="Firestore (8080)", variable=self.var_firestore).pack(side="left", padx=6, pady=6)
         ttk.Checkbutton(top, text="Auth (9099)", variable=self.var_auth).pack(side="left", padx=6, pady=6)
+        self.var_gemini = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top, text=f"Gemini stand-in ({DEFAULT_PORTS['gemini']})",
+                        variable=self.var_gemini).pack(side="left", padx=6, pady=6)
 
         ttk.Button(top, text="Start Selected", command=self.start_emus).pack(side="left", padx=8)
         ttk.Button(top, text="Stop", command=self.stop_current).pack(side="left", padx=8)
+        ttk.Button(top, text="Restart", command=self.restart_emus).pack(side="left", padx=8)
         ttk.Button(top, text="Open Emulator UI (4000)", command=self.open_ui).pack(side="left", padx=8)
         ttk.Button(top, text="Open Local Sites", command=self.open_local_sites).pack(side="left", padx=8)
 
-        info = ttk.Label(root, text=f"Detected hosting public dir: {self.public_dir}")
-        info.pack(anchor="w", padx=12)
+        self.var_persist = tk.BooleanVar(value=True)
+        ttk.Checkbutton(root, text=f"Keep emulator data between runs (--import/--export-on-exit {EMULATOR_DATA_DIR})",
+                        variable=self.var_persist).pack(anchor="w", padx=12)
+        self.var_open_ready = tk.BooleanVar(value=False)
+        ttk.Checkbutton(root, text="Open local sites once the emulators are ready",
+                        variable=self.var_open_ready).pack(anchor="w", padx=12)
+        self.emu_ready_label = ttk.Label(root, text="Emulators: not started")
+        self.emu_ready_label.pack(anchor="w", padx=12, pady=(4, 0))
+
+        devf = ttk.LabelFrame(root, text="Front-end dev server (dev_server.py)")
+        devf.pack(fill="x", padx=10, pady=(8, 0))
+        ttk.Button(devf, text=f"Start + open (localhost:{DEFAULT_PORTS['devserver']})",
+                   command=self.start_dev_server).pack(side="left", padx=6, pady=6)
+        ttk.Button(devf, text="Stop", command=lambda: self.jobs.stop("devserver")).pack(side="left", padx=6)
+        ttk.Label(devf, text="public/ from memory with live reload; /__/ and function rewrites go to the "
+                             "emulators above").pack(side="left", padx=6)
+
+        seedf = ttk.LabelFrame(root, text="Synthetic Firestore data")
+        seedf.pack(fill="x", padx=10, pady=8)
+        row = ttk.Frame(seedf); row.pack(fill="x", padx=6, pady=4)
+        self.seed_counts = {}
+        for name, default in (("work_sessions", 10000), ("community_apps", 2000),
+                              ("generations", 10000), ("teachers", 500)):
+            ttk.Label(row, text=f"{name}:").pack(side="left", padx=(6, 2))
+            self.seed_counts[name] = tk.IntVar(value=default)
+            ttk.Spinbox(row, from_=0, to=10_000_000, increment=1000, width=9,
+                        textvariable=self.seed_counts[name]).pack(side="left")
+        row = ttk.Frame(seedf); row.pack(fill="x", padx=6, pady=4)
+        ttk.Label(row, text="Seed:").pack(side="left", padx=(6, 2))
+        self.seed_value_var = tk.IntVar(value=0)
+        ttk.Spinbox(row, from_=0, to=10 ** 6, width=6, textvariable=self.seed_value_var).pack(side="left")
+        self.seed_clear_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(row, text="Clear first", variable=self.seed_clear_var).pack(side="left", padx=8)
+        ttk.Label(row, text="Save snapshot as:").pack(side="left", padx=(6, 2))
+        self.seed_snapshot_var = tk.StringVar(value="")
+        ttk.Entry(row, textvariable=self.seed_snapshot_var, width=14).pack(side="left")
+        ttk.Button(row, text="Seed", command=self.seed_firestore).pack(side="left", padx=8)
+        row = ttk.Frame(seedf); row.pack(fill="x", padx=6, pady=4)
+        ttk.Label(row, text=f"Start from snapshot ({seed_firestore.SEEDS_DIR}):").pack(side="left", padx=(6, 2))
+        self.seed_import_var = tk.StringVar(value="")
+        self.seed_import_cb = ttk.Combobox(row, textvariable=self.seed_import_var, width=20,
+                                           postcommand=self._list_seed_snapshots)
+        self.seed_import_cb.pack(side="left")
+        ttk.Label(row, text="(empty = the persisted emulator data)").pack(side="left", padx=6)
+
+        snapf = ttk.LabelFrame(root, text=f"Firestore JSONL snapshots ({firestore_snapshot.SNAPSHOTS_DIR})")
+        snapf.pack(fill="x", padx=10, pady=(0, 8))
+        row = ttk.Frame(snapf); row.pack(fill="x", padx=6, pady=4)
+        ttk.Label(row, text="Name:").pack(side="left", padx=(6, 2))
+        self.jsonl_name_var = tk.StringVar(value="")
+        self.jsonl_name_cb = ttk.Combobox(row, textvariable=self.jsonl_name_var, width=20,
+                                          postcommand=self._list_jsonl_snapshots)
+        self.jsonl_name_cb.pack(side="left")
+        ttk.Label(row, text="Collections:").pack(side="left", padx=(8, 2))
+        self.jsonl_collections_var = tk.StringVar(value="")
+        ttk.Entry(row, textvariable=self.jsonl_collections_var, width=28).pack(side="left")
+        ttk.Label(row, text="(empty = all)").pack(side="left", padx=4)
+        ttk.Button(row, text="Export", command=lambda: self.firestore_jsonl("export")).pack(side="left", padx=(8, 2))
+        ttk.Button(row, text="Import", command=lambda: self.firestore_jsonl("import")).pack(side="left", padx=2)
+
+        self.public_dir_label = ttk.Label(root, text=f"Detected hosting public dir: {self.public_dir}")
+        self.public_dir_label.pack(anchor="w", padx=12)
+
+    def _build_metrics_tab(self, root):
+        mf = ttk.LabelFrame(root, text="Functions emulator invocations (parsed from the emulator log)")
+        mf.pack(fill="both", expand=True, padx=10, pady=8)
+        cols = ("count", "errors", "error_rate", "p50", "p95", "p99", "max", "running")
+        self.metrics_tree = ttk.Treeview(mf, columns=cols, height=6)
+        self.metrics_tree.heading("#0", text="Function")
+        self.metrics_tree.column("#0", width=180)
+        for col, title in zip(cols, ("Count", "Errors", "Error %", "p50 ms", "p95 ms", "p99 ms", "Max ms", "Running")):
+            self.metrics_tree.heading(col, text=title)
+            self.metrics_tree.column(col, width=80, anchor="e")
+        self.metrics_tree.pack(fill="both", expand=True, padx=6, pady=4)
+        btns = ttk.Frame(mf); btns.pack(fill="x", padx=6, pady=4)
+        ttk.Button(btns, text="Export CSV", command=self.export_metrics).pack(side="left", padx=6)
+        ttk.Button(btns, text="Reset", command=self.reset_metrics).pack(side="left", padx=6)
+        self.metrics_note = ttk.Label(btns, text=f"p50/p95/p99 over the last {emulator_metrics.WINDOW} calls per function")
+        self.metrics_note.pack(side="left", padx=6)
+
+    def _build_load_tab(self, root):
+        lt = ttk.LabelFrame(root, text=f"Load-test callable functions on the emulator ({DEFAULT_PORTS['functions']})")
+        lt.pack(fill="x", padx=10, pady=8)
+
+        row = ttk.Frame(lt); row.pack(fill="x", padx=6, pady=4)
+        ttk.Label(row, text="Mix (function=weight):").pack(side="left")
+        self.load_mix_var = tk.StringVar(value=load_test.DEFAULT_MIX)
+        ttk.Entry(row, textvariable=self.load_mix_var, width=70).pack(side="left", padx=6, fill="x", expand=True)
+
+        row = ttk.Frame(lt); row.pack(fill="x", padx=6, pady=4)
+        self.load_concurrency_var = tk.IntVar(value=10)
+        self.load_duration_var = tk.IntVar(value=30)
+        self.load_ramp_var = tk.IntVar(value=5)
+        for label, var, top in (("Concurrency:", self.load_concurrency_var, 500),
+                                ("Duration (s):", self.load_duration_var, 3600),
+                                ("Ramp (s):", self.load_ramp_var, 600)):
+            ttk.Label(row, text=label).pack(side="left", padx=(6, 2))
+            ttk.Spinbox(row, from_=0 if var is self.load_ramp_var else 1, to=top, width=6,
+                        textvariable=var).pack(side="left")
+        self.load_compare_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(row, text="Compare with the previous run", variable=self.load_compare_var).pack(side="left", padx=12)
+
+        btns = ttk.Frame(lt); btns.pack(fill="x", padx=6, pady=4)
+        ttk.Button(btns, text="Run Load Test", command=self.run_load_test).pack(side="left", padx=6)
+        ttk.Label(btns, text=f"Results: {load_test.RESULTS_DIR} (needs the functions and auth emulators)").pack(side="left", padx=6)
 
     def _build_deploy_tab(self, root):
         dep = ttk.LabelFrame(root, text="Deploy to Firebase Hosting / Functions")
@@ -316,12 +1253,32 @@ class App(tk.Tk):
         ttk.Radiobutton(modes, text="Server only (functions)", value="functions", variable=self.dep_mode).pack(side="left", padx=6)
         ttk.Radiobutton(modes, text="Both", value="both", variable=self.dep_mode).pack(side="left", padx=6)
 
+        self.var_build = tk.BooleanVar(value=True)
+        ttk.Checkbutton(dep, text="Build first (prompt catalog, locale bundles, minify + fingerprint + cache headers)",
+                        variable=self.var_build).pack(anchor="w", padx=12)
+        self.var_changed = tk.BooleanVar(value=True)
+        ttk.Checkbutton(dep, text="Only deploy what changed since the last deploy to this alias",
+                        variable=self.var_changed).pack(anchor="w", padx=12)
+
         btns = ttk.Frame(dep); btns.pack(fill="x", padx=6, pady=4)
         ttk.Button(btns, text="Deploy", command=self.deploy).pack(side="left", padx=6)
         ttk.Button(btns, text="Copy last command", command=self.copy_last_cmd).pack(side="left", padx=6)
         ttk.Button(btns, text="Open Live (web.app)", command=self.open_live).pack(side="left", padx=6)
 
     def _build_git_tab(self, root):
+        g0 = ttk.LabelFrame(root, text="Status")
+        g0.pack(fill="both", expand=True, padx=10, pady=(8, 0))
+        top = ttk.Frame(g0)
+        top.pack(fill="x")
+        self.git_summary = ttk.Label(top, text="Loading git status...")
+        self.git_summary.pack(side="left", padx=6, pady=4)
+        ttk.Button(top, text="Refresh", command=lambda: self.git_watch.request()).pack(side="right", padx=6)
+        self.git_tree = ttk.Treeview(g0, columns=("state",), height=6)
+        self.git_tree.heading("#0", text="Path")
+        self.git_tree.heading("state", text="State")
+        self.git_tree.column("state", width=60, stretch=False, anchor="center")
+        self.git_tree.pack(fill="both", expand=True, padx=6, pady=(0, 6))
+
         g1 = ttk.LabelFrame(root, text="Basic")
         g1.pack(fill="x", padx=10, pady=8)
 
@@ -332,7 +1289,7 @@ class App(tk.Tk):
         g2.pack(fill="x", padx=10, pady=8)
 
         ttk.Label(g2, text="Branch:").pack(side="left")
-        self.branch_var = tk.StringVar(value=get_current_branch())
+        self.branch_var = tk.StringVar(value=self.current_branch)
         ttk.Entry(g2, textvariable=self.branch_var, width=18).pack(side="left", padx=6)
 
         ttk.Label(g2, text="Commit message:").pack(side="left")
@@ -356,74 +1313,359 @@ class App(tk.Tk):
         sys_frame.pack(fill="x", padx=10, pady=8)
         
         ttk.Button(sys_frame, text="Check System Health", 
-                   command=lambda: self.runner.run("./check-system.sh")).pack(side="left", padx=6, pady=6)
+                   command=lambda: self._run_job("system", "./check-system.sh")).pack(side="left", padx=6, pady=6)
         ttk.Button(sys_frame, text="Setup Secrets", 
-                   command=lambda: self.runner.run("./setup-secrets.sh")).pack(side="left", padx=6, pady=6)
+                   command=lambda: self._run_job("system", "./setup-secrets.sh")).pack(side="left", padx=6, pady=6)
         
         info_frame = ttk.LabelFrame(root, text="Project Info")
         info_frame.pack(fill="x", padx=10, pady=8)
         
         # Show current project info
+        self.project_info_label = ttk.Label(info_frame, text=self._project_info_text(), justify="left")
+        self.project_info_label.pack(anchor="w", padx=6, pady=6)
+
+    def _project_info_text(self):
         info_text = f"Public Dir: {self.public_dir}\n"
         info_text += f"Git Repo: {self.repo_web or 'Not detected'}\n"
-        info_text += f"Current Branch: {get_current_branch()}\n"
+        info_text += f"Current Branch: {self.current_branch or '...'}\n"
         info_text += f"Firebase Aliases: {', '.join(self.aliases) if self.aliases else 'None'}"
-        
-        ttk.Label(info_frame, text=info_text, justify="left").pack(anchor="w", padx=6, pady=6)
+        return info_text
+
+    # --------------- git status ---------------
+    def _watch_git(self):
+        if self.git_watch.poll():
+            self._render_git_status()
+        self.after(GIT_WATCH_MS, self._watch_git)
+
+    def _render_git_status(self):
+        st = self.git_watch.status
+        if st is None:
+            self.git_summary.config(text=f"git status unavailable: {self.git_watch.error}")
+            return
+
+        branch = st["branch"] or "?"
+        if st["upstream"]:
+            branch += f" -> {st['upstream']} (ahead {st['ahead']}, behind {st['behind']})"
+        self.git_summary.config(
+            text=f"Branch: {branch} | staged {len(st['staged'])}, unstaged {len(st['unstaged'])}, "
+                 f"untracked {len(st['untracked'])}, conflicts {len(st['conflicts'])} "
+                 f"| {self.git_watch.cost * 1000:.0f} ms, next full check in {self.git_watch.interval:.0f}s")
+
+        open_groups = {iid for iid in self.git_tree.get_children() if self.git_tree.item(iid, "open")}
+        self.git_tree.delete(*self.git_tree.get_children())
+        for group in ("conflicts", "staged", "unstaged", "untracked"):
+            entries = st[group]
+            if not entries:
+                continue
+            self.git_tree.insert("", "end", iid=group, text=f"{group.capitalize()} ({len(entries)})",
+                                 open=(group in open_groups or not open_groups))
+            # cap the rows handed to Tk; the counts above stay exact
+            for state, path in entries[:GIT_STATUS_MAX_ROWS]:
+                self.git_tree.insert(group, "end", text=path, values=(state,))
+            if len(entries) > GIT_STATUS_MAX_ROWS:
+                self.git_tree.insert(group, "end", text=f"... {len(entries) - GIT_STATUS_MAX_ROWS} more",
+                                     values=("",))
+
+    # --------------- project metadata ---------------
+    def _watch_metadata(self):
+        """Apply finished background loads, then re-check the source files' mtimes"""
+        changed = self.meta.collect()
+        if changed:
+            self._apply_metadata(changed)
+        self.meta.refresh()
+        self.after(50 if self.meta.loading else METADATA_CHECK_MS, self._watch_metadata)
+
+    def _apply_metadata(self, changed):
+        if "aliases" in changed:
+            self.aliases = self.meta.get("aliases", [])
+            self.alias_cb["values"] = self.aliases
+            current = self.alias_var.get()
+            if self.aliases and current not in self.aliases:
+                preferred = self.prefs.get("default_alias")
+                self.alias_var.set(preferred if preferred in self.aliases else self.aliases[0])
+        if "public_dir" in changed:
+            self.public_dir = self.meta.get("public_dir")
+            self.public_dir_label.config(text=f"Detected hosting public dir: {self.public_dir}")
+        if "repo_web" in changed:
+            self.repo_web = self.meta.get("repo_web", "")
+        if "branch" in changed:
+            # follow the checked-out branch unless the user typed another one
+            if self.branch_var.get() in ("", self.current_branch):
+                self.branch_var.set(self.meta.get("branch"))
+            self.current_branch = self.meta.get("branch")
+        self.project_info_label.config(text=self._project_info_text())
 
     # --------------- log plumbing ---------------
     def _append_log(self, s: str, tag=None):
+        self._append_log_batch(None, [(s, tag)])
+
+    def _append_log_batch(self, job, entries):
+        """Append many (text, tag) entries of one job with a single Text insert"""
         # Smart coloring based on content
-        if not tag:
-            s_lower = s.lower()
-            if any(word in s_lower for word in ["error", "failed", "fatal"]):
-                tag = "error"
-            elif any(word in s_lower for word in ["warning", "warn"]):
-                tag = "warning"
-            elif any(word in s_lower for word in ["success", "completed", "deployed"]):
-                tag = "success"
-        
-        self.log.insert("end", s, tag)
+        entries = [(text, tag or classify_log_line(text)) for text, tag in entries]
+        self.log_model.extend(entries, job)
+        if job == "emulators":
+            for text, _ in entries:
+                self.metrics.feed(text)
+                if self.emu_ready and not self.emu_ready.done:
+                    self.emu_ready.feed(text)
+        if job and job not in self.log_filter_cb["values"]:
+            self.log_filter_cb["values"] = (*self.log_filter_cb["values"], job)
+        self._render_log([(text, tag, job) for text, tag in entries])
+
+    def _render_log(self, entries):
+        """Insert (text, tag, job) entries that pass the current filter"""
+        shown = self.log_filter_var.get()
+        args, run, run_tag = [], [], None
+        for text, tag, job in entries:
+            if shown != LOG_FILTER_ALL and job not in (None, shown):
+                continue
+            if shown == LOG_FILTER_ALL and job:
+                text = f"[{job}] {text}"
+            # merge consecutive lines with the same tag into one chars/tags pair
+            if run and tag != run_tag:
+                args += ["".join(run), run_tag or ""]
+                run = []
+            run.append(text)
+            run_tag = tag
+        if not run:
+            return
+        args += ["".join(run), run_tag or ""]
+
+        follow = self._log_at_bottom()
+        self.log.insert("end", *args)
+        self._trim_log_view()
+        if follow:
+            self.log.see("end")
+
+    def _rerender_log(self):
+        """Rebuild the view from the ring buffer (e.g. after changing the job filter)"""
+        self.log.delete(1.0, "end")
+        self._render_log(list(self.log_model.entries))
         self.log.see("end")
-        
+
+    def _log_at_bottom(self):
+        """Only auto-scroll when the user hasn't scrolled up to read history"""
+        return self.log.yview()[1] >= 0.999
+
+    def _trim_log_view(self, force=False):
+        """Drop the oldest lines from the Text widget in one bulk delete"""
+        lines = int(self.log.index("end-1c").split(".")[0])
+        limit = self.log_model.max_lines
+        if lines > limit + (0 if force else LOG_TRIM_SLACK):
+            self.log.delete("1.0", f"{lines - limit + 1}.0")
+
     def clear_log(self):
         """Clear the log"""
         self.log.delete(1.0, "end")
+        self.log_model.clear()
         self._append_log("Log cleared.\n", "success")
 
     def _tick(self):
-        self.runner.poll_log()
-        self.after(50, self._tick)
+        applied = self.jobs.poll()
+        self._update_throughput(applied)
+        # fast while output is flowing, back off exponentially when idle
+        if applied or self.jobs.pending:
+            self._tick_ms = TICK_MIN_MS
+        else:
+            self._tick_ms = min(self._tick_ms * 2, TICK_MAX_MS)
+        self.after(self._tick_ms, self._tick)
+
+    def _update_throughput(self, applied):
+        self._rate_lines += applied
+        now = time.monotonic()
+        if now - self._rate_t0 >= 1.0:
+            rate = self._rate_lines / (now - self._rate_t0)
+            self.stats_label.config(text=f"{rate:,.0f} lines/s | queue: {self.jobs.pending}")
+            self._rate_lines = 0
+            self._rate_t0 = now
+
+    # --------------- Jobs ---------------
+    def _refresh_jobs(self):
+        self.jobs_tree.delete(*self.jobs_tree.get_children())
+        for name, job in self.jobs.jobs.items():
+            if job.running:
+                status = f"running (pid {job.proc.pid})"
+            elif job.exit_code is not None:
+                status = f"exited {job.exit_code}"
+            else:
+                status = "stopping"
+            self.jobs_tree.insert("", "end", iid=name, text=name, values=(status, job.cmd or ""))
+
+    def _selected_job(self):
+        sel = self.jobs_tree.selection()
+        return sel[0] if sel else None
+
+    def stop_selected_job(self):
+        name = self._selected_job()
+        if name:
+            self.jobs.stop(name)
+            self._append_log_batch(name, [("[stopping]\n", "warning")])
+            self._refresh_jobs()
+
+    def restart_selected_job(self):
+        name = self._selected_job()
+        if name:
+            self.jobs.restart(name)
+            self._refresh_jobs()
+
+    def _show_selected_job_log(self):
+        name = self._selected_job()
+        if name:
+            self.log_filter_var.set(name)
+            self._rerender_log()
 
     # --------------- Emulators ---------------
-    def compose_emulators_cmd(self):
+    def selected_emulators(self):
         selected = []
         if self.var_hosting.get(): selected.append("hosting")
         if self.var_functions.get(): selected.append("functions")
         if self.var_firestore.get(): selected.append("firestore")
         if self.var_auth.get(): selected.append("auth")
+        return selected
+
+    def emulator_ports(self):
+        return [DEFAULT_PORTS[name] for name in self.selected_emulators()] + [DEFAULT_PORTS["ui"]]
+
+    def compose_emulators_cmd(self):
+        selected = self.selected_emulators()
         if not selected:
             messagebox.showinfo("Nothing selected", "Select at least one emulator.")
             return None
         only = ",".join(selected)
-        return f"firebase emulators:start --only {only}"
+        cmd = f"firebase emulators:start --only {only}"
+        seed_dir = os.path.join(seed_firestore.SEEDS_DIR, self.seed_import_var.get().strip())
+        if self.seed_import_var.get().strip() and os.path.isdir(seed_dir):
+            cmd += f" --import={seed_dir}"
+            if self.var_persist.get():
+                cmd += f" --export-on-exit={EMULATOR_DATA_DIR}"
+        elif self.var_persist.get():
+            # warm start: reload the data exported by the previous run
+            if os.path.isdir(EMULATOR_DATA_DIR):
+                cmd += f" --import={EMULATOR_DATA_DIR}"
+            cmd += f" --export-on-exit={EMULATOR_DATA_DIR}"
+        return cmd
 
     def start_emus(self):
         cmd = self.compose_emulators_cmd()
         if not cmd:
             return
+        busy = [p for p in self.emulator_ports() if port_in_use(p)]
+        if busy and not self.jobs.is_running("emulators"):
+            self._append_log(f"Warning: ports already in use: {', '.join(map(str, busy))} "
+                             "(a previous emulator may still be running)\n", "warning")
         self.last_cmd = cmd
         self._save_current_prefs()  # Save emulator preferences
-        self.runner.run(cmd)
+        self._start_gemini_standin()
+        if self._run_job("emulators", cmd, ports=self.emulator_ports()):
+            self._start_readiness()
+
+    def _start_gemini_standin(self):
+        """Start (or unhook) the offline Gemini stand-in before the functions emulator reads its env"""
+        try:
+            gemini_standin.configure_functions(DEFAULT_PORTS["gemini"], enabled=self.var_gemini.get())
+        except OSError as e:
+            self._append_log(f"Warning: could not update {gemini_standin.FUNCTIONS_ENV_LOCAL}: {e}\n", "warning")
+            return
+        if self.var_gemini.get() and not self.jobs.is_running("gemini"):
+            self._run_job("gemini", f'"{sys.executable}" gemini_standin.py --port {DEFAULT_PORTS["gemini"]}',
+                          ports=[DEFAULT_PORTS["gemini"]])
+
+    def start_dev_server(self):
+        port = DEFAULT_PORTS["devserver"]
+        if not self.jobs.is_running("devserver"):
+            cmd = (f'"{sys.executable}" dev_server.py --port {port} --quiet '
+                   f'--functions-port {DEFAULT_PORTS["functions"]} --hosting-port {DEFAULT_PORTS["hosting"]}')
+            if not self._run_job("devserver", cmd, ports=[port]):
+                return
+        # give the server a moment to bind before the browser asks for the page
+        self.after(800, lambda: webbrowser.open(f"http://localhost:{port}"))
 
     def stop_current(self):
-        self.runner.stop()
-        self._append_log("\n[stopped]\n", "warning")
+        self.jobs.stop("emulators")
+        if self.emu_ready and not self.emu_ready.done:
+            self.emu_ready.cancel()
+            self.emu_ready_label.config(text="Emulators: stopped before ready")
+        if self.jobs.is_running("gemini"):
+            self.jobs.stop("gemini")
+        self._append_log_batch("emulators", [("[stopping]\n", "warning")])
+        self._refresh_jobs()
+
+    def restart_emus(self):
+        """Stop the emulators tree and start again as soon as the ports are free"""
+        if not self.compose_emulators_cmd():
+            return
+        self._save_current_prefs()
+        self._start_gemini_standin()
+        self.jobs.restart("emulators", self._restart_emulators_cmd, self.emulator_ports())
+        self._start_readiness(wait_release=True)
+        self._refresh_jobs()
+
+    def _restart_emulators_cmd(self):
+        # composed when the restart fires: the stop has exported the data by then,
+        # so even the first warm restart gets its --import
+        self.last_cmd = self.compose_emulators_cmd() or ""
+        return self.last_cmd
+
+    def _start_readiness(self, wait_release=False):
+        """Probe the selected emulators (+ UI) until they answer, then record how long it took"""
+        if self.emu_ready:
+            self.emu_ready.cancel()
+        services = {name: DEFAULT_PORTS[name] for name in self.selected_emulators() + ["ui"]}
+        # a restart is timed on the run it is about to start
+        run = self.jobs.job("emulators").runs + (1 if wait_release else 0)
+        self.emu_ready = EmulatorReadiness(services, run, wait_release=wait_release)
+        self.open_when_ready = self.var_open_ready.get()
+        self._watch_emulators(self.emu_ready)
+
+    def _watch_emulators(self, probe):
+        if probe is not self.emu_ready or probe.cancelled:
+            return
+        history = {}
+        for run in self.emu_timings:
+            for name, secs in run["services"].items():
+                if secs is not None:
+                    history.setdefault(name, []).append(secs)
+        parts = []
+        for name, (state, value) in probe.snapshot().items():
+            avg = history.get(name)
+            avg = f" (avg {sum(avg) / len(avg):.1f}s)" if avg else ""
+            if state == "ready":
+                parts.append(f"{name} ✓ {value:.1f}s{avg}")
+            elif state == "failed":
+                parts.append(f"{name} ✗")
+            else:
+                parts.append(f"{name} … {value:.0f}s")
+        self.emu_ready_label.config(text="Emulators: " + " | ".join(parts))
+        if not probe.done:
+            self.after(EMULATOR_READY_MS, self._watch_emulators, probe)
+            return
+
+        self.emu_timings.append({
+            "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() - probe.elapsed())),
+            "services": {name: probe.ready.get(name) for name in probe.services},
+            "all_ready_log": probe.log_ready,
+        })
+        save_emulator_timings(self.emu_timings)
+        for name, reason in probe.failed.items():
+            self._append_log_batch("emulators", [(f"[{name} not ready: {reason}]\n", "error")])
+        ready = ", ".join(f"{name} {secs:.1f}s" for name, secs in sorted(probe.ready.items(), key=lambda kv: kv[1]))
+        self._append_log_batch("emulators", [(f"[ready: {ready or 'none'}]\n", "success" if ready else "error")])
+        if self.open_when_ready and probe.ready:
+            self.open_when_ready = False
+            self._open_local_sites_now()
 
     def open_ui(self):
         webbrowser.open(f"http://localhost:{DEFAULT_PORTS['ui']}")
 
     def open_local_sites(self):
+        if self.emu_ready and not self.emu_ready.done and not self.emu_ready.cancelled:
+            self.open_when_ready = True
+            self._append_log("Local sites will open once the emulators answer.\n", "warning")
+            return
+        self._open_local_sites_now()
+
+    def _open_local_sites_now(self):
         if self.var_hosting.get():
             webbrowser.open(f"http://localhost:{DEFAULT_PORTS['hosting']}")
         if self.var_functions.get():
@@ -458,17 +1700,170 @@ class App(tk.Tk):
             if result == "no":
                 return
         
-        self.ensure_alias()
-        if mode == "hosting":
-            cmd = "firebase deploy --only hosting"
-        elif mode == "functions":
-            cmd = "firebase deploy --only functions"
+        alias = self.ensure_alias()
+        if self.var_build.get():
+            # Built before planning: the catalog ships with both hosting and the functions
+            # source, so a persona/prompt edit shows up as a change to both
+            problems = build_catalog.build_catalog(".")["problems"]
+            if problems:
+                messagebox.showerror("Prompt catalog", "\n".join(problems[:20]))
+                return
+        targets = {"hosting": ["hosting"], "functions": ["functions"]}.get(mode, ["hosting", "functions"])
+        try:
+            # taken now, before anything is deployed: it is what gets recorded once the deploy succeeds
+            snap = deploy_planner.snapshot(".")
+            snapshot_path = deploy_planner.save_snapshot(snap)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Deploy plan failed", str(e))
+            return
+        if self.var_changed.get():
+            try:
+                result = deploy_planner.plan(".", alias or "default", snap)
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Deploy plan failed", str(e))
+                return
+            planned = [(t, reason) for t, reason in zip(result["targets"], result["reasons"])
+                       if t.split(":", 1)[0] in targets]
+            if not planned:
+                messagebox.showinfo("Nothing to deploy",
+                                    f"No {' / '.join(targets)} changes since the last deploy to '{alias}'.")
+                return
+            targets = [t for t, _ in planned]
+            self._append_log_batch("deploy", [("Deploy plan:\n", "command")]
+                                   + [(f"  {reason}\n", None) for _, reason in planned])
+
+        hosting = "hosting" in targets
+        functions = [t for t in targets if t != "hosting"]
+        steps = []
+        if hosting and self.var_build.get():
+            # Hosting goes out from the built dir; its config sits in .build/, so the
+            # project is passed explicitly rather than taken from `firebase use`
+            steps += [f'"{sys.executable}" build_locales.py --strict',
+                      f'"{sys.executable}" build_assets.py',
+                      "firebase deploy --only hosting --config .build/firebase.json"
+                      + (f" --project {alias}" if alias else "")]
+            if functions:
+                steps.append(f"firebase deploy --only {','.join(functions)}")
         else:
-            cmd = "firebase deploy --only hosting,functions"
+            steps.append(f"firebase deploy --only {','.join(targets)}")
+        # Remember what went out, so the next change-aware deploy diffs against it
+        steps.append(f'"{sys.executable}" deploy_planner.py record --alias {alias or "default"} '
+                     f'--only {",".join(targets)} --snapshot "{snapshot_path}"')
+        cmd = " && ".join(steps)
         
         self.last_cmd = cmd
         self._save_current_prefs()  # Save alias preference
-        self.runner.run(cmd)
+        self._run_job("deploy", cmd)
+
+    def _watch_metrics(self):
+        if self.metrics.version != self._metrics_shown:
+            self._metrics_shown = self.metrics.version
+            fmt = lambda v: "" if v is None else f"{v:.0f}"
+            self.metrics_tree.delete(*self.metrics_tree.get_children())
+            for row in self.metrics.rows():
+                self.metrics_tree.insert("", "end", text=row["function"], values=(
+                    row["count"], row["errors"], f"{100 * row['error_rate']:.1f}",
+                    fmt(row["p50_ms"]), fmt(row["p95_ms"]), fmt(row["p99_ms"]), fmt(row["max_ms"]), row["running"]))
+        self.after(METRICS_REFRESH_MS, self._watch_metrics)
+
+    def export_metrics(self):
+        if not self.metrics.functions:
+            messagebox.showinfo("No metrics", "No function invocations seen yet.")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".csv", initialfile="function_metrics.csv",
+                                            filetypes=[("CSV", "*.csv")])
+        if path:
+            self.metrics.write_csv(path)
+            self._set_status(f"Metrics saved to {path}")
+
+    def reset_metrics(self):
+        self.metrics = emulator_metrics.EmulatorMetrics()
+        self._metrics_shown = -1
+
+    def _list_seed_snapshots(self):
+        try:
+            names = sorted(d for d in os.listdir(seed_firestore.SEEDS_DIR)
+                           if os.path.isdir(os.path.join(seed_firestore.SEEDS_DIR, d)))
+        except OSError:
+            names = []
+        self.seed_import_cb["values"] = [""] + names
+
+    def _list_jsonl_snapshots(self):
+        try:
+            names = sorted(d for d in os.listdir(firestore_snapshot.SNAPSHOTS_DIR)
+                           if os.path.isfile(os.path.join(firestore_snapshot.SNAPSHOTS_DIR, d,
+                                                          firestore_snapshot.MANIFEST)))
+        except OSError:
+            names = []
+        self.jsonl_name_cb["values"] = names
+
+    def firestore_jsonl(self, action):
+        """Exports (resuming an unfinished export of the same name) or imports a JSONL snapshot"""
+        if not port_in_use(DEFAULT_PORTS["firestore"]):
+            messagebox.showwarning("Firestore emulator not running",
+                                   f"Nothing is listening on port {DEFAULT_PORTS['firestore']}. Start it first.")
+            return
+        name = re.sub(r"[^\w.-]", "_", self.jsonl_name_var.get().strip())
+        if not name:
+            messagebox.showerror("JSONL snapshot", "Enter a snapshot name.")
+            return
+        path = os.path.join(firestore_snapshot.SNAPSHOTS_DIR, name)
+        collections = re.sub(r"[^\w,]", "", self.jsonl_collections_var.get())
+        cmd = f'"{sys.executable}" firestore_snapshot.py {action} "{path}" --port {DEFAULT_PORTS["firestore"]}'
+        if collections:
+            cmd += f" --collections {collections}"
+        if action == "export":
+            manifest = firestore_snapshot.load_manifest(path)
+            if manifest and manifest.get("complete"):
+                if not messagebox.askyesno("JSONL snapshot", f"Replace the existing snapshot '{name}'?"):
+                    return
+                cmd += " --overwrite"
+        elif not os.path.isdir(path):
+            messagebox.showerror("JSONL snapshot", f"No snapshot named '{name}'.")
+            return
+        self.last_cmd = cmd
+        self._run_job("snapshot", cmd)
+
+    def seed_firestore(self):
+        if not port_in_use(DEFAULT_PORTS["firestore"]):
+            messagebox.showwarning("Firestore emulator not running",
+                                   f"Nothing is listening on port {DEFAULT_PORTS['firestore']}. Start it first.")
+            return
+        try:
+            counts = {name: var.get() for name, var in self.seed_counts.items()}
+            seed = self.seed_value_var.get()
+        except tk.TclError:
+            messagebox.showerror("Seed", "Counts and seed must be numbers.")
+            return
+        cmd = f'"{sys.executable}" seed_firestore.py --seed {seed} --port {DEFAULT_PORTS["firestore"]}'
+        cmd += "".join(f" --{name.replace('_', '-')} {n}" for name, n in counts.items())
+        if self.seed_clear_var.get():
+            cmd += " --clear"
+        snapshot = re.sub(r"[^\w.-]", "_", self.seed_snapshot_var.get().strip())
+        if snapshot:
+            cmd += f" --snapshot {snapshot}"
+        self.last_cmd = cmd
+        self._run_job("seed", cmd)
+
+    def run_load_test(self):
+        if not port_in_use(DEFAULT_PORTS["functions"]):
+            messagebox.showwarning("Functions emulator not running",
+                                   f"Nothing is listening on port {DEFAULT_PORTS['functions']}. Start the emulators first.")
+            return
+        try:
+            concurrency = self.load_concurrency_var.get()
+            duration = self.load_duration_var.get()
+            ramp = self.load_ramp_var.get()
+        except tk.TclError:
+            messagebox.showerror("Load test", "Concurrency, duration and ramp must be numbers.")
+            return
+        cmd = (f'"{sys.executable}" load_test.py --mix "{self.load_mix_var.get().strip()}" '
+               f'-c {concurrency} -d {duration} --ramp {ramp} '
+               f'--port {DEFAULT_PORTS["functions"]} --auth-port {DEFAULT_PORTS["auth"]}')
+        if self.load_compare_var.get() and load_test.latest_result():
+            cmd += " --compare latest"
+        self.last_cmd = cmd
+        self._run_job("loadtest", cmd)
 
     def copy_last_cmd(self):
         if not self.last_cmd:
@@ -485,11 +1880,11 @@ class App(tk.Tk):
     # --------------- Git ---------------
     def git_status(self):
         self.last_cmd = "git status"
-        self.runner.run(self.last_cmd)
+        self._run_job("git", self.last_cmd)
 
     def git_pull(self):
         self.last_cmd = "git pull --rebase"
-        self.runner.run(self.last_cmd)
+        self._run_job("git", self.last_cmd)
 
     def git_acp(self):
         branch = self.branch_var.get().strip() or "main"
@@ -499,13 +1894,13 @@ class App(tk.Tk):
         cmd = f"git add -A && git commit -m {json.dumps(msg)} || echo 'nothing to commit' && git push -u origin {branch}{force}"
         self.last_cmd = cmd
         self._save_current_prefs()  # Save branch preference
-        self.runner.run(cmd)
+        self._run_job("git", cmd)
 
     def git_trigger_ci(self):
         branch = self.branch_var.get().strip() or "main"
         cmd = f"git commit --allow-empty -m 'chore: ci trigger' && git push -u origin {branch}"
         self.last_cmd = cmd
-        self.runner.run(cmd)
+        self._run_job("git", cmd)
 
     def open_repo(self):
         if self.repo_web: